@@ -1,9 +1,9 @@
 from django.contrib import admin
-from .models import Thread, Post
+from .models import Thread, Post, TournamentForumStats
 
 @admin.register(Thread)
 class ThreadAdmin(admin.ModelAdmin):
-    list_display = ['title', 'tournament', 'author', 'created_at', 'is_deleted']
+    list_display = ['title', 'tournament', 'author', 'created_at', 'reply_count', 'last_post_at', 'is_deleted']
     list_filter = ['tournament', 'created_at', 'is_deleted']
     search_fields = ['title', 'author__username']
     raw_id_fields = ['author', 'tournament']
@@ -32,4 +32,10 @@ class PostAdmin(admin.ModelAdmin):
         count = queryset.count()
         queryset.delete()
         self.message_user(request, f'{count} posts permanently deleted.')
-    hard_delete_posts.short_description = "Permanently delete selected posts"
\ No newline at end of file
+    hard_delete_posts.short_description = "Permanently delete selected posts"
+
+@admin.register(TournamentForumStats)
+class TournamentForumStatsAdmin(admin.ModelAdmin):
+    list_display = ['tournament', 'thread_count', 'post_count', 'participant_count', 'updated_at']
+    readonly_fields = ['thread_count', 'post_count', 'participant_count', 'updated_at']
+    raw_id_fields = ['tournament']
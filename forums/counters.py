@@ -0,0 +1,103 @@
+"""
+Counter yang didenormalisasi di Thread (reply_count, last_post_at, last_poster,
+participant_count) dan statistik forum per turnamen (TournamentForumStats).
+Dihitung ulang dengan satu UPDATE berisi subquery setiap kali thread atau post
+dibuat, diedit, atau di-soft-delete.
+"""
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from main.cache import bump_model_version
+
+from .models import Post, Thread, TournamentForumStats
+
+
+def _live_posts():
+    return Post.objects.filter(thread=OuterRef('pk'), is_deleted=False).order_by()
+
+
+def _count_subquery(expression):
+    return Coalesce(
+        Subquery(
+            _live_posts().values('thread').annotate(total=expression).values('total')[:1],
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def counter_updates():
+    """Nilai UPDATE untuk semua counter, relatif ke baris Thread yang sedang diupdate."""
+    last_post = _live_posts().order_by('-created_at', '-pk')
+    return {
+        # Post pertama adalah isi thread, sisanya dihitung sebagai balasan
+        'reply_count': Greatest(_count_subquery(Count('pk')) - 1, Value(0)),
+        'participant_count': _count_subquery(Count('author', distinct=True)),
+        'last_post_at': Subquery(last_post.values('created_at')[:1]),
+        'last_poster': Subquery(last_post.values('author')[:1]),
+    }
+
+
+def _tournament_subquery(queryset, group_by, expression):
+    return Coalesce(
+        Subquery(
+            queryset.order_by().values(group_by).annotate(total=expression).values('total')[:1],
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def stats_updates():
+    """Nilai UPDATE untuk TournamentForumStats, relatif ke baris yang sedang diupdate."""
+    threads = Thread.objects.filter(tournament=OuterRef('pk'), is_deleted=False)
+    posts = Post.objects.filter(thread__tournament=OuterRef('pk'), is_deleted=False)
+    return {
+        'thread_count': _tournament_subquery(threads, 'tournament', Count('pk')),
+        'post_count': _tournament_subquery(posts, 'thread__tournament', Count('pk')),
+        'participant_count': _tournament_subquery(
+            posts.filter(thread__is_deleted=False), 'thread__tournament', Count('author', distinct=True)
+        ),
+        'updated_at': timezone.now(),
+    }
+
+
+def ensure_tournament_stats(tournament_ids):
+    """
+    Buat baris statistik yang belum ada. Dipanggil saat thread disimpan, bukan saat
+    delete, supaya cascade delete turnamen tidak membuat baris baru.
+    """
+    TournamentForumStats.objects.bulk_create(
+        [TournamentForumStats(tournament_id=pk) for pk in set(tournament_ids)],
+        ignore_conflicts=True,
+    )
+
+
+def refresh_tournament_stats(tournament_ids):
+    """Hitung ulang statistik forum turnamen tertentu. Return jumlah baris yang diupdate."""
+    return TournamentForumStats.objects.filter(tournament_id__in=tournament_ids).update(**stats_updates())
+
+
+def refresh_thread_counters(thread_ids):
+    """
+    Hitung ulang counter untuk thread tertentu beserta statistik forum turnamennya.
+    Return jumlah thread yang diupdate.
+    """
+    with transaction.atomic():
+        updated = Thread.objects.filter(pk__in=thread_ids).update(**counter_updates())
+        refresh_tournament_stats(Thread.objects.filter(pk__in=thread_ids).values('tournament_id'))
+    # UPDATE langsung tidak memicu post_save, jadi cache respons diinvalidasi manual
+    bump_model_version(Thread._meta.label)
+    return updated
+
+
+def rebuild_thread_counters():
+    """Hitung ulang counter semua thread dan statistik forum semua turnamen."""
+    with transaction.atomic():
+        updated = Thread.objects.update(**counter_updates())
+        ensure_tournament_stats(Thread.objects.values_list('tournament_id', flat=True).distinct())
+        TournamentForumStats.objects.update(**stats_updates())
+    bump_model_version(Thread._meta.label)
+    return updated
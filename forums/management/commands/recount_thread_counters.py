@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from forums.counters import rebuild_thread_counters, refresh_thread_counters
+
+
+class Command(BaseCommand):
+    help = ('Recounts the denormalized Thread counters (replies, participants, last activity) '
+            'and the per-tournament forum stats from the Post rows.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--thread', type=int, action='append', dest='threads',
+            help='Only recount the given thread ID (can be repeated).'
+        )
+
+    def handle(self, *args, **options):
+        thread_ids = options.get('threads')
+        if thread_ids:
+            updated = refresh_thread_counters(thread_ids)
+        else:
+            updated = rebuild_thread_counters()
+        self.stdout.write(self.style.SUCCESS(f'Recounted counters for {updated} thread(s).'))
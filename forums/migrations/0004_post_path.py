@@ -0,0 +1,57 @@
+# Generated by Django 5.2.7 on 2026-10-17 17:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_post_paths(apps, schema_editor):
+    Post = apps.get_model('forums', 'Post')
+
+    parents = dict(Post.objects.values_list('id', 'parent_id'))
+    paths = {}
+
+    def resolve(post_id):
+        if post_id not in paths:
+            chain = []
+            current = post_id
+            while current is not None and current not in paths:
+                chain.append(current)
+                current = parents.get(current)
+            prefix, depth = paths.get(current, ('', -1))
+            for node in reversed(chain):
+                depth += 1
+                prefix = f"{prefix}{node:010d}/"
+                paths[node] = (prefix, depth)
+        return paths[post_id]
+
+    posts = []
+    for post in Post.objects.only('id'):
+        post.path, post.depth = resolve(post.id)
+        posts.append(post)
+    Post.objects.bulk_update(posts, ['path', 'depth'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forums', '0003_alter_post_image'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='depth',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='path',
+            field=models.CharField(blank=True, default='', editable=False, max_length=900),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['thread', 'path'], name='post_thread_path_idx'),
+        ),
+        migrations.RunPython(backfill_post_paths, migrations.RunPython.noop),
+    ]
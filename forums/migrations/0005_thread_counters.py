@@ -0,0 +1,70 @@
+# Generated by Django 5.2.7 on 2026-10-17 17:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+
+def backfill_thread_counters(apps, schema_editor):
+    Thread = apps.get_model('forums', 'Thread')
+    Post = apps.get_model('forums', 'Post')
+
+    live_posts = Post.objects.filter(thread=OuterRef('pk'), is_deleted=False).order_by()
+    last_post = live_posts.order_by('-created_at', '-pk')
+
+    def count_of(expression):
+        return Coalesce(
+            Subquery(live_posts.values('thread').annotate(total=expression).values('total')[:1],
+                     output_field=IntegerField()),
+            Value(0),
+        )
+
+    Thread.objects.update(
+        reply_count=Greatest(count_of(Count('pk')) - 1, Value(0)),
+        participant_count=count_of(Count('author', distinct=True)),
+        last_post_at=Subquery(last_post.values('created_at')[:1]),
+        last_poster=Subquery(last_post.values('author')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forums', '0004_post_path'),
+        ('tournaments', '0004_standing'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='thread',
+            name='last_post_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='thread',
+            name='last_poster',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='thread',
+            name='participant_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='thread',
+            name='reply_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='thread',
+            index=models.Index(fields=['tournament', 'is_deleted', '-reply_count'], name='thread_popularity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='thread',
+            index=models.Index(fields=['tournament', 'is_deleted', '-last_post_at'], name='thread_activity_idx'),
+        ),
+        migrations.RunPython(backfill_thread_counters, migrations.RunPython.noop),
+    ]
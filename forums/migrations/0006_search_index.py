@@ -0,0 +1,65 @@
+from django.db import migrations
+
+# Salinan skema dari forums.search pada saat migration ini dibuat; sengaja tidak
+# mengimpor kode app supaya migration tetap sama walaupun modul itu berubah.
+INDEX_TABLE = 'forums_search_index'
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {INDEX_TABLE} USING fts5("
+            "title, body, thread_id UNINDEXED, tournament_id UNINDEXED, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        key = 'rowid'
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            f"CREATE TABLE {INDEX_TABLE} ("
+            "doc_id bigint PRIMARY KEY, "
+            "thread_id bigint NOT NULL, "
+            "tournament_id bigint NOT NULL, "
+            "title text NOT NULL DEFAULT '', "
+            "body text NOT NULL DEFAULT '', "
+            "document tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('simple', title), 'A') || "
+            "setweight(to_tsvector('simple', body), 'B')) STORED)"
+        )
+        schema_editor.execute(f"CREATE INDEX {INDEX_TABLE}_document_gin ON {INDEX_TABLE} USING GIN (document)")
+        schema_editor.execute(f"CREATE INDEX {INDEX_TABLE}_tournament ON {INDEX_TABLE} (tournament_id)")
+        key = 'doc_id'
+    else:
+        return
+
+    # Isi awal: thread doc_id = pk * 2 + 1, post doc_id = pk * 2
+    Thread = apps.get_model('forums', 'Thread')
+    Post = apps.get_model('forums', 'Post')
+    quote = schema_editor.quote_name
+    thread_table, post_table = quote(Thread._meta.db_table), quote(Post._meta.db_table)
+    schema_editor.execute(
+        f"INSERT INTO {INDEX_TABLE} ({key}, thread_id, tournament_id, title, body) "
+        f"SELECT id * 2 + 1, id, tournament_id, title, '' FROM {thread_table} WHERE NOT is_deleted"
+    )
+    schema_editor.execute(
+        f"INSERT INTO {INDEX_TABLE} ({key}, thread_id, tournament_id, title, body) "
+        f"SELECT p.id * 2, p.thread_id, t.tournament_id, '', p.body "
+        f"FROM {post_table} p JOIN {thread_table} t ON t.id = p.thread_id "
+        "WHERE NOT p.is_deleted AND NOT t.is_deleted"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute(f"DROP TABLE IF EXISTS {INDEX_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forums', '0005_thread_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
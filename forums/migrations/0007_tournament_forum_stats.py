@@ -0,0 +1,56 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_tournament_stats(apps, schema_editor):
+    Thread = apps.get_model('forums', 'Thread')
+    Post = apps.get_model('forums', 'Post')
+    TournamentForumStats = apps.get_model('forums', 'TournamentForumStats')
+
+    tournament_ids = Thread.objects.values_list('tournament_id', flat=True).distinct()
+    TournamentForumStats.objects.bulk_create(
+        [TournamentForumStats(tournament_id=pk) for pk in tournament_ids]
+    )
+
+    threads = Thread.objects.filter(tournament=OuterRef('pk'), is_deleted=False)
+    posts = Post.objects.filter(thread__tournament=OuterRef('pk'), is_deleted=False)
+
+    def count_of(queryset, group_by, expression):
+        return Coalesce(
+            Subquery(queryset.order_by().values(group_by).annotate(total=expression).values('total')[:1],
+                     output_field=IntegerField()),
+            Value(0),
+        )
+
+    TournamentForumStats.objects.update(
+        thread_count=count_of(threads, 'tournament', Count('pk')),
+        post_count=count_of(posts, 'thread__tournament', Count('pk')),
+        participant_count=count_of(posts.filter(thread__is_deleted=False), 'thread__tournament',
+                                   Count('author', distinct=True)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forums', '0006_search_index'),
+        ('tournaments', '0004_standing'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TournamentForumStats',
+            fields=[
+                ('tournament', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='forum_stats', serialize=False, to='tournaments.tournament')),
+                ('thread_count', models.IntegerField(default=0)),
+                ('post_count', models.IntegerField(default=0)),
+                ('participant_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_tournament_stats, migrations.RunPython.noop),
+    ]
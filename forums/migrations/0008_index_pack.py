@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-17 19:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forums', '0007_tournament_forum_stats'),
+        ('tournaments', '0007_index_pack'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['thread', 'created_at'], name='post_thread_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['parent'], name='post_parent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='thread',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['tournament', '-created_at'], name='thread_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='thread',
+            index=models.Index(fields=['-created_at'], name='thread_created_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-17 20:33
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forums', '0008_index_pack'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_parent_idx',
+        ),
+    ]
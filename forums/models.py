@@ -3,6 +3,16 @@ from django.conf import settings
 from tournaments.models import Tournament
 from datetime import timedelta 
 
+PATH_SEGMENT_WIDTH = 10
+# Post.path maks. 900 karakter = 81 segmen; balasan lebih dalam dari ini dipindah
+# menjadi saudara post terdalam (lihat Post.save)
+MAX_POST_DEPTH = 50
+
+
+def path_segment(pk):
+    return f"{pk:0{PATH_SEGMENT_WIDTH}d}/"
+
+
 class Thread(models.Model):
     tournament = models.ForeignKey(Tournament, related_name='threads', on_delete=models.CASCADE)
     author = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='forum_threads', on_delete=models.CASCADE)
@@ -10,6 +20,28 @@ class Thread(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_deleted = models.BooleanField(default=False)
+    # Counter dari post yang belum dihapus, di-update oleh forums.counters
+    reply_count = models.IntegerField(default=0, editable=False)
+    participant_count = models.IntegerField(default=0, editable=False)
+    last_post_at = models.DateTimeField(null=True, blank=True, editable=False)
+    last_poster = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        editable=False
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['tournament', 'is_deleted', '-reply_count'], name='thread_popularity_idx'),
+            models.Index(fields=['tournament', 'is_deleted', '-last_post_at'], name='thread_activity_idx'),
+            # Partial (is_deleted=False): cocok dengan WHERE NOT is_deleted yang dihasilkan Django
+            models.Index(fields=['tournament', '-created_at'], condition=models.Q(is_deleted=False),
+                         name='thread_recent_idx'),
+            models.Index(fields=['-created_at'], name='thread_created_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -18,10 +50,6 @@ class Thread(models.Model):
     def initial_post(self):
         return self.posts.filter(is_deleted=False).order_by('created_at').first()
 
-    @property
-    def reply_count(self):
-        return max(0, self.posts.filter(is_deleted=False).count() - 1)
-
 class Post(models.Model):
     thread = models.ForeignKey(Thread, related_name='posts', on_delete=models.CASCADE)
     author = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='forum_posts', on_delete=models.CASCADE)
@@ -41,13 +69,68 @@ class Post(models.Model):
         blank=True
     )
     is_deleted = models.BooleanField(default=False)
+    # Materialized path: gabungan pk leluhur sampai post ini, misal "0000000012/0000000034/".
+    # Urut berdasarkan path = urutan depth-first, dan subtree = path__startswith.
+    path = models.CharField(max_length=900, blank=True, default='', editable=False)
+    depth = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['thread', 'path'], name='post_thread_path_idx'),
+            models.Index(fields=['thread', 'created_at'], condition=models.Q(is_deleted=False),
+                         name='post_thread_created_idx'),
+        ]
 
     def __str__(self):
         return f"Post by {self.author.username} in '{self.thread.title}' ({self.pk})"
 
+    def save(self, *args, **kwargs):
+        is_new = self._state.adding
+        if is_new and self.parent is not None and self.parent.depth >= MAX_POST_DEPTH:
+            self.parent = self.parent.parent
+        super().save(*args, **kwargs)
+        if is_new and not self.path:
+            # pk baru ada setelah insert, jadi path diisi dengan satu UPDATE tambahan
+            self.path, self.depth = self.build_path()
+            Post.objects.filter(pk=self.pk).update(path=self.path, depth=self.depth)
+
+    def build_path(self):
+        """
+        (path, depth) dari rantai parent. Parent tanpa path (dibuat lewat bulk_create/loaddata
+        sebelum backfill 0004) dihitung ulang dari leluhurnya, bukan dianggap root.
+        """
+        parent = self.parent
+        if parent is None:
+            return path_segment(self.pk), 0
+        if parent.path:
+            return parent.path + path_segment(self.pk), parent.depth + 1
+        parent_path, parent_depth = parent.build_path()
+        return parent_path + path_segment(self.pk), parent_depth + 1
+
+    def subtree(self):
+        """Post ini beserta semua balasan di bawahnya, berapapun kedalamannya."""
+        if not self.path:
+            # path__startswith='' cocok dengan semua post di thread
+            return Post.objects.filter(pk=self.pk)
+        return Post.objects.filter(thread_id=self.thread_id, path__startswith=self.path)
+
     @property
     def is_edited(self):
-        return self.updated_at > (self.created_at + timedelta(seconds=1))
\ No newline at end of file
+        return self.updated_at > (self.created_at + timedelta(seconds=1))
+
+class TournamentForumStats(models.Model):
+    """Statistik forum per turnamen untuk halaman pencarian forum, di-update oleh forums.counters."""
+    tournament = models.OneToOneField(
+        Tournament,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='forum_stats'
+    )
+    thread_count = models.IntegerField(default=0)
+    post_count = models.IntegerField(default=0)
+    participant_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Forum stats {self.tournament.name}"
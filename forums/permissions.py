@@ -0,0 +1,64 @@
+"""
+Izin edit/hapus thread dan post.
+
+Aturannya sama untuk edit dan hapus: penulis, admin (role ADMIN), superuser,
+atau penyelenggara turnamen tempat thread berada. ForumPermissions membaca
+role, status superuser, dan daftar turnamen yang diselenggarakan user sekali
+saja, lalu mengevaluasi setiap thread/post dari kolom *_id tanpa query baru.
+Pakai forum_permissions(request) supaya konteksnya dipakai ulang dalam satu request.
+"""
+from functools import cached_property
+
+from tournaments.models import Tournament
+
+
+class ForumPermissions:
+    def __init__(self, user):
+        self.user = user
+        self.user_id = user.pk if user.is_authenticated else None
+
+    @cached_property
+    def role(self):
+        try:
+            return self.user.profile.role
+        except Exception:
+            return None
+
+    @cached_property
+    def is_moderator(self):
+        """Admin dan superuser bisa mengelola semua forum."""
+        return self.user_id is not None and (self.user.is_superuser or self.role == 'ADMIN')
+
+    @cached_property
+    def organized_tournament_ids(self):
+        if self.user_id is None:
+            return frozenset()
+        return frozenset(Tournament.objects.filter(organizer_id=self.user_id).values_list('pk', flat=True))
+
+    def can_manage(self, author_id, tournament_id):
+        if self.user_id is None:
+            return False
+        return (author_id == self.user_id or
+                self.is_moderator or
+                tournament_id in self.organized_tournament_ids)
+
+    def can_edit_thread(self, thread):
+        return self.can_manage(thread.author_id, thread.tournament_id)
+
+    def can_delete_thread(self, thread):
+        return self.can_manage(thread.author_id, thread.tournament_id)
+
+    def can_edit_post(self, post):
+        return self.can_manage(post.author_id, post.thread.tournament_id)
+
+    def can_delete_post(self, post):
+        return self.can_manage(post.author_id, post.thread.tournament_id)
+
+
+def forum_permissions(request):
+    """Konteks izin untuk user request ini, dibuat sekali per request."""
+    perms = getattr(request, '_forum_permissions', None)
+    if perms is None or perms.user is not request.user:
+        perms = ForumPermissions(request.user)
+        request._forum_permissions = perms
+    return perms
@@ -0,0 +1,206 @@
+"""
+Full-text search untuk judul thread dan isi post.
+
+Index disimpan di tabel forums_search_index yang dibuat oleh migration
+forums/0006_search_index sesuai database: FTS5 virtual table di SQLite (lokal)
+dan tabel dengan kolom tsvector + GIN index di PostgreSQL (PRODUCTION). Satu
+baris per dokumen dengan doc_id: post = pk * 2, thread = pk * 2 + 1, jadi
+update/hapus selalu lewat primary key.
+Index disinkronkan oleh forums.signals saat thread/post dibuat, diedit, atau
+di-soft-delete.
+"""
+import html
+import re
+
+from django.db import connection, transaction
+
+from .models import Post, Thread
+
+INDEX_TABLE = 'forums_search_index'
+SNIPPET_WORDS = 16
+# Penanda highlight sementara; diganti <mark> setelah snippet di-escape
+MARK_START = '\ue000'
+MARK_END = '\ue001'
+
+
+def post_doc_id(post_id):
+    return post_id * 2
+
+
+def thread_doc_id(thread_id):
+    return thread_id * 2 + 1
+
+
+def is_thread_doc(doc_id):
+    return doc_id % 2 == 1
+
+
+def supports_full_text(conn=None):
+    return (conn or connection).vendor in ('sqlite', 'postgresql')
+
+
+# --- Sinkronisasi ---
+
+def _upsert(rows):
+    """rows: iterable (doc_id, thread_id, tournament_id, title, body)."""
+    rows = list(rows)
+    if not rows or not supports_full_text():
+        return
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.executemany(f"DELETE FROM {INDEX_TABLE} WHERE rowid = %s", [(row[0],) for row in rows])
+            cursor.executemany(
+                f"INSERT INTO {INDEX_TABLE} (rowid, thread_id, tournament_id, title, body) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                rows,
+            )
+        else:
+            cursor.executemany(
+                f"INSERT INTO {INDEX_TABLE} (doc_id, thread_id, tournament_id, title, body) "
+                "VALUES (%s, %s, %s, %s, %s) "
+                "ON CONFLICT (doc_id) DO UPDATE SET title = EXCLUDED.title, body = EXCLUDED.body",
+                rows,
+            )
+
+
+def _delete(doc_ids):
+    doc_ids = list(doc_ids)
+    if not doc_ids or not supports_full_text():
+        return
+    key = 'rowid' if connection.vendor == 'sqlite' else 'doc_id'
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {INDEX_TABLE} WHERE {key} = %s", [(doc_id,) for doc_id in doc_ids])
+
+
+def index_thread(thread):
+    """Index judul thread, atau hapus thread beserta post-nya dari index kalau sudah dihapus."""
+    if thread.is_deleted:
+        remove_thread(thread.pk)
+    else:
+        _upsert([(thread_doc_id(thread.pk), thread.pk, thread.tournament_id, thread.title, '')])
+
+
+def index_post(post):
+    if post.is_deleted or post.thread.is_deleted:
+        remove_posts([post.pk])
+    else:
+        _upsert([(post_doc_id(post.pk), post.thread_id, post.thread.tournament_id, '', post.body)])
+
+
+def remove_posts(post_ids):
+    _delete(post_doc_id(pk) for pk in post_ids)
+
+
+def remove_thread(thread_id):
+    post_ids = Post.objects.filter(thread_id=thread_id).values_list('pk', flat=True)
+    _delete([thread_doc_id(thread_id), *(post_doc_id(pk) for pk in post_ids)])
+
+
+def rebuild_index():
+    """Isi ulang seluruh index dari Thread dan Post yang belum dihapus. Return jumlah dokumen."""
+    threads = Thread.objects.filter(is_deleted=False).values_list('pk', 'tournament_id', 'title')
+    posts = Post.objects.filter(is_deleted=False, thread__is_deleted=False)\
+        .values_list('pk', 'thread_id', 'thread__tournament_id', 'body')
+    rows = [(thread_doc_id(pk), pk, tournament_id, title, '') for pk, tournament_id, title in threads.iterator()]
+    rows += [(post_doc_id(pk), thread_id, tournament_id, '', body) for pk, thread_id, tournament_id, body in posts.iterator()]
+    with transaction.atomic():
+        if supports_full_text():
+            with connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {INDEX_TABLE}")
+        _upsert(rows)
+    return len(rows)
+
+
+# --- Pencarian ---
+
+def _terms(query):
+    return re.findall(r'\w+', query, re.UNICODE)
+
+
+def _highlight(snippet):
+    escaped = html.escape(snippet or '')
+    return escaped.replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+def _search_sqlite(terms, tournament_id, limit):
+    match = ' '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+    sql = (
+        f"SELECT rowid, thread_id, bm25({INDEX_TABLE}, 2.0, 1.0) AS rank, "
+        f"snippet({INDEX_TABLE}, -1, %s, %s, '…', {SNIPPET_WORDS}) "
+        f"FROM {INDEX_TABLE} WHERE {INDEX_TABLE} MATCH %s"
+    )
+    params = [MARK_START, MARK_END, match]
+    if tournament_id:
+        sql += " AND tournament_id = %s"
+        params.append(tournament_id)
+    sql += " ORDER BY rank LIMIT %s"
+    params.append(limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        # bm25 makin kecil makin relevan, dibalik supaya score makin besar makin relevan
+        return [(doc_id, thread_id, -rank, snippet) for doc_id, thread_id, rank, snippet in cursor.fetchall()]
+
+
+def _search_postgresql(terms, tournament_id, limit):
+    options = f'StartSel={MARK_START}, StopSel={MARK_END}, MaxWords={SNIPPET_WORDS}, MinWords=5'
+    sql = (
+        "SELECT doc_id, thread_id, ts_rank(document, query) AS score, "
+        "ts_headline('simple', CASE WHEN title <> '' THEN title ELSE body END, query, %s) "
+        f"FROM {INDEX_TABLE}, plainto_tsquery('simple', %s) query "
+        "WHERE document @@ query"
+    )
+    params = [options, ' '.join(terms)]
+    if tournament_id:
+        sql += " AND tournament_id = %s"
+        params.append(tournament_id)
+    sql += " ORDER BY score DESC LIMIT %s"
+    params.append(limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def _search_fallback(terms, tournament_id, limit):
+    """Database lain: tanpa index, cocokkan semua kata dengan icontains."""
+    threads = Thread.objects.filter(is_deleted=False)
+    posts = Post.objects.filter(is_deleted=False, thread__is_deleted=False)
+    if tournament_id:
+        threads = threads.filter(tournament_id=tournament_id)
+        posts = posts.filter(thread__tournament_id=tournament_id)
+    for term in terms:
+        threads = threads.filter(title__icontains=term)
+        posts = posts.filter(body__icontains=term)
+    hits = [(thread_doc_id(pk), pk, 1.0, title) for pk, title in threads.values_list('pk', 'title')[:limit]]
+    hits += [(post_doc_id(pk), thread_id, 0.5, body[:200]) for pk, thread_id, body in
+             posts.values_list('pk', 'thread_id', 'body')[:limit]]
+    return hits[:limit]
+
+
+def search_forum(query, tournament_id=None, limit=20):
+    """
+    Cari thread dan post. Return list dict yang sudah diurutkan relevansi:
+    type, thread_id, post_id, title, snippet (HTML dengan <mark>), score.
+    """
+    terms = _terms(query)
+    if not terms:
+        return []
+    if connection.vendor == 'sqlite':
+        hits = _search_sqlite(terms, tournament_id, limit)
+    elif connection.vendor == 'postgresql':
+        hits = _search_postgresql(terms, tournament_id, limit)
+    else:
+        hits = _search_fallback(terms, tournament_id, limit)
+
+    titles = dict(Thread.objects.filter(pk__in={hit[1] for hit in hits}).values_list('pk', 'title'))
+    results = []
+    for doc_id, thread_id, score, snippet in hits:
+        thread_hit = is_thread_doc(doc_id)
+        results.append({
+            'type': 'thread' if thread_hit else 'post',
+            'thread_id': thread_id,
+            'post_id': None if thread_hit else doc_id // 2,
+            'title': titles.get(thread_id, ''),
+            'snippet': _highlight(snippet),
+            'score': round(float(score), 6),
+        })
+    return results
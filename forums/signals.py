@@ -0,0 +1,48 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .counters import ensure_tournament_stats, refresh_thread_counters, refresh_tournament_stats
+from . import search
+from .models import Post, Thread
+
+
+@receiver(post_save, sender=Post)
+def update_thread_counters_after_save(sender, instance, **kwargs):
+    # Create, edit, dan soft-delete semuanya lewat save()
+    refresh_thread_counters([instance.thread_id])
+
+
+@receiver(post_delete, sender=Post)
+def update_thread_counters_after_delete(sender, instance, **kwargs):
+    refresh_thread_counters([instance.thread_id])
+
+
+@receiver(post_save, sender=Thread)
+def update_tournament_stats_after_thread_save(sender, instance, **kwargs):
+    ensure_tournament_stats([instance.tournament_id])
+    refresh_tournament_stats([instance.tournament_id])
+
+
+@receiver(post_delete, sender=Thread)
+def update_tournament_stats_after_thread_delete(sender, instance, **kwargs):
+    refresh_tournament_stats([instance.tournament_id])
+
+
+@receiver(post_save, sender=Post)
+def update_search_index_after_post_save(sender, instance, **kwargs):
+    search.index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_from_search_index(sender, instance, **kwargs):
+    search.remove_posts([instance.pk])
+
+
+@receiver(post_save, sender=Thread)
+def update_search_index_after_thread_save(sender, instance, **kwargs):
+    # Thread yang di-soft-delete ikut menghapus semua post-nya dari index
+    search.index_thread(instance)
+
+
+@receiver(post_delete, sender=Thread)
+def remove_thread_from_search_index(sender, instance, **kwargs):
+    search.remove_thread(instance.pk)
@@ -1,4 +1,6 @@
+from io import StringIO
 from unittest.mock import patch
+from django.core.management import call_command
 from tournaments.models import Tournament
 from django.middleware.csrf import get_token
 from datetime import datetime, timedelta, date
@@ -6,10 +8,15 @@ from forums.forms import ThreadCreateForm, ThreadEditForm, PostEditForm, PostRep
 import json
 from django.contrib.auth import get_user_model
 from django.test import TestCase, Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from django.urls import reverse
 from main.models import Profile  
 from django.utils import timezone
-from forums.models import Thread, Post
+from forums.models import MAX_POST_DEPTH, Thread, Post, TournamentForumStats
+from teams.models import Team
+from forums import search
+from forums.permissions import ForumPermissions
 from django.contrib.auth.models import User, AnonymousUser
 from forums.views import *
 from django.template import Template, Context
@@ -2616,4 +2623,326 @@ class ThreadPostsTemplateTests(TestCase):
         # Authenticated
         self.client.login(username='testuser', password='testpass123')
         response = self.client.get(reverse('forums:thread_posts', args=[self.thread.id]))
-        self.assertContains(response, 'Tinggalkan Balasan untuk Thread')
\ No newline at end of file
+        self.assertContains(response, 'Tinggalkan Balasan untuk Thread')
+
+class PostTreeTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='treeuser', password='testpass123')
+        self.tournament = Tournament.objects.create(
+            name='Tree Tournament',
+            organizer=self.user,
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=7)
+        )
+        self.thread = Thread.objects.create(tournament=self.tournament, title='Tree', author=self.user)
+        self.root = Post.objects.create(thread=self.thread, author=self.user, body='root')
+        self.reply_a = Post.objects.create(thread=self.thread, author=self.user, body='a', parent=self.root)
+        self.reply_b = Post.objects.create(thread=self.thread, author=self.user, body='b', parent=self.root)
+        self.reply_a1 = Post.objects.create(thread=self.thread, author=self.user, body='a1', parent=self.reply_a)
+
+    def test_path_and_depth_stored_on_create(self):
+        self.reply_a1.refresh_from_db()
+        self.assertEqual(self.reply_a1.depth, 2)
+        self.assertEqual(self.reply_a1.path, f"{self.root.pk:010d}/{self.reply_a.pk:010d}/{self.reply_a1.pk:010d}/")
+
+    def test_replies_past_max_depth_are_flattened(self):
+        parent = self.root
+        for i in range(MAX_POST_DEPTH + 5):
+            parent = Post.objects.create(thread=self.thread, author=self.user, body=f'deep {i}', parent=parent)
+
+        deepest = Post.objects.filter(thread=self.thread).order_by('-depth').first()
+        self.assertEqual(deepest.depth, MAX_POST_DEPTH)
+        self.assertLessEqual(len(deepest.path), Post._meta.get_field('path').max_length)
+        # Balasan ke post terdalam menjadi saudaranya, tetap di subtree yang sama
+        last = Post.objects.get(body=f'deep {MAX_POST_DEPTH + 4}')
+        self.assertEqual(last.depth, MAX_POST_DEPTH)
+        self.assertEqual(last.parent.depth, MAX_POST_DEPTH - 1)
+        self.assertTrue(self.root.subtree().filter(pk=last.pk).exists())
+
+    def test_api_thread_posts_returns_depth_first_order(self):
+        response = self.client.get(reverse('forums:api_thread_posts', args=[self.thread.pk]))
+        posts = response.json()['posts']
+        self.assertEqual([p['body'] for p in posts], ['root', 'a', 'a1', 'b'])
+        self.assertEqual([p['depth'] for p in posts], [0, 1, 2, 1])
+
+    def test_api_delete_post_soft_deletes_subtree_in_one_update(self):
+        self.client.login(username='treeuser', password='testpass123')
+        url = reverse('forums:api_delete_post', args=[self.reply_a.pk])
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 200)
+        deleted = set(Post.objects.filter(is_deleted=True).values_list('body', flat=True))
+        self.assertEqual(deleted, {'a', 'a1'})
+
+    def test_post_without_path_does_not_match_whole_thread(self):
+        legacy, = Post.objects.bulk_create([
+            Post(thread=self.thread, author=self.user, body='legacy', parent=self.reply_b)
+        ])
+        self.assertEqual(legacy.path, '')
+        self.assertEqual(list(legacy.subtree()), [legacy])
+
+        self.client.login(username='treeuser', password='testpass123')
+        self.client.post(reverse('forums:api_delete_post', args=[legacy.pk]))
+        deleted = set(Post.objects.filter(is_deleted=True).values_list('body', flat=True))
+        self.assertEqual(deleted, {'legacy'})
+
+    def test_reply_to_post_without_path_uses_ancestor_path(self):
+        legacy, = Post.objects.bulk_create([
+            Post(thread=self.thread, author=self.user, body='legacy', parent=self.reply_b)
+        ])
+        reply = Post.objects.create(thread=self.thread, author=self.user, body='reply', parent=legacy)
+        self.assertEqual(reply.path, self.reply_b.path + f"{legacy.pk:010d}/{reply.pk:010d}/")
+        self.assertEqual(reply.depth, 3)
+        self.assertTrue(self.root.subtree().filter(pk=reply.pk).exists())
+
+
+class ThreadCounterTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.alice = User.objects.create_user(username='alice', password='testpass123')
+        self.bob = User.objects.create_user(username='bob', password='testpass123')
+        self.tournament = Tournament.objects.create(
+            name='Counter Tournament',
+            organizer=self.alice,
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=7)
+        )
+        self.thread = Thread.objects.create(tournament=self.tournament, title='Counters', author=self.alice)
+        self.first = Post.objects.create(thread=self.thread, author=self.alice, body='first')
+
+    def counters(self):
+        self.thread.refresh_from_db()
+        return (self.thread.reply_count, self.thread.participant_count, self.thread.last_poster_id)
+
+    def test_counters_follow_create_and_soft_delete(self):
+        self.assertEqual(self.counters(), (0, 1, self.alice.pk))
+
+        reply = Post.objects.create(thread=self.thread, author=self.bob, body='reply', parent=self.first)
+        self.assertEqual(self.counters(), (1, 2, self.bob.pk))
+        self.assertEqual(self.thread.last_post_at, reply.created_at)
+
+        reply.is_deleted = True
+        reply.save()
+        self.assertEqual(self.counters(), (0, 1, self.alice.pk))
+
+    def test_thread_edit_and_delete_do_not_write_counters(self):
+        self.client.login(username='alice', password='testpass123')
+        requests = [
+            lambda: self.client.post(reverse('forums:edit_thread', args=[self.thread.pk]), {'title': 'Renamed'},
+                                     HTTP_X_REQUESTED_WITH='XMLHttpRequest'),
+            lambda: self.client.post(reverse('forums:delete_thread', args=[self.thread.pk])),
+        ]
+        for send in requests:
+            with CaptureQueriesContext(connection) as queries:
+                send()
+            thread_updates = [q['sql'] for q in queries.captured_queries
+                              if q['sql'].startswith('UPDATE "forums_thread"')]
+            self.assertTrue(thread_updates)
+            # Save penuh akan menimpa counter yang dinaikkan reply lain secara bersamaan
+            self.assertFalse([sql for sql in thread_updates if 'reply_count' in sql.split('WHERE')[0]])
+
+        self.thread.refresh_from_db()
+        self.assertEqual((self.thread.title, self.thread.is_deleted), ('Renamed', True))
+
+    def test_api_delete_post_updates_counters(self):
+        reply = Post.objects.create(thread=self.thread, author=self.bob, body='reply', parent=self.first)
+        Post.objects.create(thread=self.thread, author=self.bob, body='nested', parent=reply)
+        self.assertEqual(self.counters(), (2, 2, self.bob.pk))
+
+        self.client.login(username='bob', password='testpass123')
+        self.client.post(reverse('forums:api_delete_post', args=[reply.pk]))
+        self.assertEqual(self.counters(), (0, 1, self.alice.pk))
+
+    def test_api_delete_thread_rolls_back_when_counters_fail(self):
+        self.client.login(username='alice', password='testpass123')
+        url = reverse('forums:api_delete_thread', args=[self.thread.pk])
+        with patch('forums.views.refresh_thread_counters', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.client.post(url)
+        self.thread.refresh_from_db()
+        self.assertFalse(self.thread.is_deleted)
+        self.assertFalse(Post.objects.filter(thread=self.thread, is_deleted=True).exists())
+
+    def test_popularity_sort_uses_reply_count(self):
+        quiet = Thread.objects.create(tournament=self.tournament, title='Quiet', author=self.bob)
+        Post.objects.create(thread=quiet, author=self.bob, body='only post')
+        Post.objects.create(thread=self.thread, author=self.bob, body='reply', parent=self.first)
+
+        url = reverse('forums:api_get_tournament_threads', args=[self.tournament.pk])
+        threads = self.client.get(url, {'sort': '-popularity'}).json()['threads']
+        self.assertEqual([t['title'] for t in threads], ['Counters', 'Quiet'])
+        self.assertEqual(threads[0]['reply_count'], 1)
+
+    def test_recount_command_repairs_counters(self):
+        Post.objects.create(thread=self.thread, author=self.bob, body='reply', parent=self.first)
+        Thread.objects.update(reply_count=42, participant_count=0, last_poster=None)
+
+        call_command('recount_thread_counters', stdout=StringIO())
+        self.assertEqual(self.counters(), (1, 2, self.bob.pk))
+
+    def test_cursor_mode_pages_threads_by_popularity(self):
+        for i in range(20):
+            thread = Thread.objects.create(tournament=self.tournament, title=f'T{i:02d}', author=self.bob)
+            first = Post.objects.create(thread=thread, author=self.bob, body='first')
+            for _ in range(i % 4):
+                Post.objects.create(thread=thread, author=self.alice, body='reply', parent=first)
+
+        url = reverse('forums:api_get_tournament_threads', args=[self.tournament.pk])
+        first_page = self.client.get(url, {'sort': '-popularity', 'cursor': ''}).json()
+        self.assertEqual(len(first_page['threads']), 15)
+        self.assertNotIn('total_count', first_page['pagination'])
+        second_page = self.client.get(url, {'sort': '-popularity', 'cursor': first_page['pagination']['next_cursor']}).json()
+        self.assertIsNone(second_page['pagination']['next_cursor'])
+
+        titles = [t['title'] for t in first_page['threads'] + second_page['threads']]
+        expected = list(Thread.objects.order_by('-reply_count', '-created_at', '-pk').values_list('title', flat=True))
+        self.assertEqual(titles, expected)
+
+    def forum_stats(self):
+        stats = TournamentForumStats.objects.get(tournament=self.tournament)
+        return (stats.thread_count, stats.post_count, stats.participant_count)
+
+    def test_tournament_stats_follow_threads_and_posts(self):
+        self.assertEqual(self.forum_stats(), (1, 1, 1))
+        other = Thread.objects.create(tournament=self.tournament, title='Other', author=self.bob)
+        Post.objects.create(thread=other, author=self.bob, body='hello')
+        self.assertEqual(self.forum_stats(), (2, 2, 2))
+
+        other.is_deleted = True
+        other.save()
+        # Post di thread yang dihapus tetap dihitung post_count, tapi penulisnya bukan peserta lagi
+        self.assertEqual(self.forum_stats(), (1, 2, 1))
+
+    def test_search_tournaments_reads_stats_and_batches_logos(self):
+        Post.objects.create(thread=self.thread, author=self.bob, body='reply', parent=self.first)
+        for i in range(3):
+            self.tournament.participants.add(Team.objects.create(name=f'Team {i}', captain=self.alice, logo=f'https://logo/{i}.png'))
+        for i in range(4):
+            empty = Tournament.objects.create(name=f'Empty {i}', organizer=self.alice,
+                                              start_date=timezone.now().date(), end_date=timezone.now().date())
+            empty.participants.add(Team.objects.create(name=f'Other {i}', captain=self.bob))
+
+        # 1 query halaman + 1 COUNT paginator + 1 query logo, tidak bergantung jumlah turnamen
+        with self.assertNumQueries(3):
+            data = self.client.get(reverse('forums:search_tournaments'), {'sort': '-participants'}).json()
+        first = data['tournaments'][0]
+        self.assertEqual(first['name'], 'Counter Tournament')
+        self.assertEqual((first['thread_count'], first['post_count'], first['participant_count']), (1, 2, 2))
+        self.assertEqual(len(first['related_images']), 3)
+        self.assertEqual(data['tournaments'][1]['participant_count'], 0)
+
+    def test_participant_logos_are_limited_per_tournament_in_sql(self):
+        other = Tournament.objects.create(name='Other Tournament', organizer=self.alice,
+                                          start_date=timezone.now().date(), end_date=timezone.now().date())
+        for i in range(6):
+            self.tournament.participants.add(Team.objects.create(name=f'Team {i}', captain=self.alice,
+                                                                 logo=f'https://logo/{i}.png'))
+        other.participants.add(Team.objects.create(name='Solo', captain=self.bob, logo='https://logo/solo.png'))
+
+        with CaptureQueriesContext(connection) as queries:
+            logos = participant_logos([self.tournament.pk, other.pk], limit=2)
+        self.assertEqual(logos, {
+            self.tournament.pk: ['https://logo/0.png', 'https://logo/1.png'],
+            other.pk: ['https://logo/solo.png'],
+        })
+        self.assertEqual(len(queries), 1)
+        self.assertIn('ROW_NUMBER', queries[0]['sql'])
+
+
+class ForumSearchTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='searcher', password='testpass123')
+        self.tournament = Tournament.objects.create(
+            name='Search Tournament',
+            organizer=self.user,
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=7)
+        )
+        self.thread = Thread.objects.create(tournament=self.tournament, title='Strategi final piala', author=self.user)
+        self.first = Post.objects.create(thread=self.thread, author=self.user, body='Diskusi strategi tim untuk babak final.')
+        self.other = Thread.objects.create(tournament=self.tournament, title='Jadwal latihan', author=self.user)
+        Post.objects.create(thread=self.other, author=self.user, body='Latihan <b>pagi</b> hari Senin.')
+        self.url = reverse('forums:api_search_forum')
+
+    def search(self, q, **params):
+        return self.client.get(self.url, {'q': q, **params}).json()['results']
+
+    def test_finds_titles_and_post_bodies_with_highlight(self):
+        results = self.search('strategi')
+        self.assertEqual({(r['type'], r['thread_id']) for r in results}, {('thread', self.thread.pk), ('post', self.thread.pk)})
+        self.assertTrue(all('<mark>' in r['snippet'].lower() for r in results))
+        self.assertEqual(results[0]['url'], reverse('forums:thread_posts', args=[self.thread.pk]))
+
+    def test_snippet_is_html_escaped(self):
+        result = self.search('pagi')[0]
+        self.assertIn('&lt;b&gt;', result['snippet'])
+        self.assertIn('<mark>pagi</mark>', result['snippet'])
+
+    def test_index_follows_edit_and_soft_delete(self):
+        self.first.body = 'Isi baru tentang penalti.'
+        self.first.save()
+        self.assertEqual([r['type'] for r in self.search('strategi')], ['thread'])
+        self.assertEqual(self.search('penalti')[0]['post_id'], self.first.pk)
+
+        self.client.login(username='searcher', password='testpass123')
+        self.client.post(reverse('forums:api_delete_thread', args=[self.thread.pk]))
+        self.assertEqual(self.search('strategi'), [])
+        self.assertEqual(self.search('penalti'), [])
+
+    def test_rebuild_command_restores_index(self):
+        search.rebuild_index()
+        self.assertEqual(len(self.search('latihan')), 2)
+        out = StringIO()
+        call_command('rebuild_forum_search_index', stdout=out)
+        self.assertIn('4 documents', out.getvalue())
+
+
+class ForumPermissionTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.organizer = User.objects.create_user(username='organizer', password='testpass123')
+        self.author = User.objects.create_user(username='author', password='testpass123')
+        self.other = User.objects.create_user(username='other', password='testpass123')
+        self.tournament = Tournament.objects.create(
+            name='Permission Tournament',
+            organizer=self.organizer,
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=7)
+        )
+        self.thread = Thread.objects.create(tournament=self.tournament, title='Izin', author=self.author)
+        self.first = Post.objects.create(thread=self.thread, author=self.author, body='first')
+        self.url = reverse('forums:api_thread_posts', args=[self.thread.pk])
+
+    def add_replies(self, count):
+        for i in range(count):
+            Post.objects.create(thread=self.thread, author=self.other, body=f'reply {i}', parent=self.first)
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        return len(queries)
+
+    def test_flags_per_viewer(self):
+        self.add_replies(1)
+        self.client.login(username='organizer', password='testpass123')
+        posts = self.client.get(self.url).json()['posts']
+        self.assertTrue(all(p['can_edit'] and p['can_delete'] for p in posts))
+
+        self.client.login(username='other', password='testpass123')
+        posts = self.client.get(self.url).json()['posts']
+        self.assertEqual([(p['author_username'], p['can_edit']) for p in posts], [('author', False), ('other', True)])
+
+    def test_query_count_does_not_grow_with_posts(self):
+        self.client.login(username='other', password='testpass123')
+        self.add_replies(2)
+        baseline = self.count_queries()
+        self.add_replies(10)
+        self.assertEqual(self.count_queries(), baseline)
+
+    def test_context_resolves_organized_tournaments_once(self):
+        perms = ForumPermissions(User.objects.get(pk=self.organizer.pk))
+        posts = list(self.thread.posts.all())
+        with self.assertNumQueries(2):  # profile + turnamen yang diselenggarakan
+            self.assertTrue(all(perms.can_edit_post(post) for post in posts))
+            self.assertTrue(perms.can_delete_thread(self.thread))
@@ -21,4 +21,5 @@ urlpatterns = [
     path('api/post/<int:post_id>/edit/', views.api_edit_post, name='api_edit_post'),
     path('api/post/<int:post_id>/delete/', views.api_delete_post, name='api_delete_post'),
     path('api/thread/<int:thread_id>/delete/', views.api_delete_thread, name='api_delete_thread'),
+    path('api/search/', views.api_search_forum, name='api_search_forum'),
 ]
\ No newline at end of file
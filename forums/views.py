@@ -1,12 +1,19 @@
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import JsonResponse, HttpResponseForbidden, Http404
+from django.http import HttpResponseForbidden, Http404
+from main.responses import JsonResponse, LocalTimeFormatter
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_POST, require_http_methods
 from django.urls import reverse
 from forums.models import Thread, Post
+from forums import search
+from forums.counters import refresh_thread_counters
+from forums.permissions import ForumPermissions, forum_permissions
+from main.pagination import InvalidCursor, cursor_paginate, wants_cursor
+from main.replicas import read_from_replica
 from tournaments.models import Tournament
-from django.db.models import Count, Q, F
-from django.db.models.functions import Coalesce
+from django.db import transaction
+from django.db.models import Count, Q, F, Value, Window
+from django.db.models.functions import Coalesce, RowNumber
 import json
 from django.core.paginator import Paginator
 from django.contrib import messages
@@ -17,71 +24,36 @@ from django.views.decorators.csrf import csrf_exempt
 
 def can_edit_thread(user, thread):
     """Check if user can edit thread"""
-    if not user.is_authenticated:
-        return False
-
-    user_role = None
-    try:
-        if hasattr(user, 'profile'):
-            user_role = user.profile.role
-    except:
-        pass
-    
-    return (user == thread.author or
-            user_role == 'ADMIN' or
-            user == thread.tournament.organizer or
-            user.is_superuser)
+    return ForumPermissions(user).can_edit_thread(thread)
 
 def can_edit_post(user, post):
     """Check if user can edit post"""
-    if not user.is_authenticated:
-        return False
-        
-    user_role = None
-    try:
-        if hasattr(user, 'profile'):
-            user_role = user.profile.role
-    except:
-        pass
-    
-    return (user == post.author or
-            user_role == 'ADMIN' or
-            user == post.thread.tournament.organizer or
-            user.is_superuser)
+    return ForumPermissions(user).can_edit_post(post)
 
 def can_delete_thread(user, thread):
     """Check if user can delete thread"""
-    if not user.is_authenticated:
-        return False
-        
-    user_role = None
-    try:
-        if hasattr(user, 'profile'):
-            user_role = user.profile.role
-    except:
-        pass
-    
-    return (user == thread.author or
-            user_role == 'ADMIN' or
-            user == thread.tournament.organizer or
-            user.is_superuser)
+    return ForumPermissions(user).can_delete_thread(thread)
 
 def can_delete_post(user, post):
     """Check if user can delete post"""
-    if not user.is_authenticated:
-        return False
-        
-    user_role = None
-    try:
-        if hasattr(user, 'profile'):
-            user_role = user.profile.role
-    except:
-        pass
-    
-    return (user == post.author or
-            user_role == 'ADMIN' or
-            user == post.thread.tournament.organizer or
-            user.is_superuser)
+    return ForumPermissions(user).can_delete_post(post)
+
+
+# Urutan keyset untuk mode cursor di list thread; selalu diakhiri pk sebagai tie-breaker
+THREAD_CURSOR_ORDERINGS = {
+    'created_at': ('created_at', 'pk'),
+    'popularity': ('reply_count', 'created_at', 'pk'),
+    'latest_activity': ('activity_at', 'pk'),
+    'title': ('title', 'pk'),
+    'author': ('author__username', 'pk'),
+}
+
+
+def thread_cursor_ordering(sort_param):
+    ordering = THREAD_CURSOR_ORDERINGS.get(sort_param.lstrip('-'), THREAD_CURSOR_ORDERINGS['created_at'])
+    if sort_param.startswith('-'):
+        ordering = tuple('-' + field for field in ordering)
+    return ordering
 
 
 @login_required
@@ -128,7 +100,9 @@ def edit_thread(request, thread_id):
     if request.method == 'POST' and is_ajax:
         form = ThreadEditForm(request.POST, instance=thread)
         if form.is_valid():
-            thread = form.save()
+            # Hanya kolom yang diedit; counter thread diubah request lain lewat F()
+            thread = form.save(commit=False)
+            thread.save(update_fields=['title', 'updated_at'])
 
             thread_data = {
                 'id': thread.id,
@@ -137,7 +111,7 @@ def edit_thread(request, thread_id):
                 'author_username': thread.author.username if thread.author else 'Unknown',
                 'created_date': timezone.localtime(thread.created_at).strftime('%d %b %Y'), 
                 'created_time': timezone.localtime(thread.created_at).strftime('%H:%M'), 
-                'reply_count': max(0, thread.posts.filter(is_deleted=False).count() - 1),
+                'reply_count': thread.reply_count,
                 'can_edit': True,
                 'can_delete': can_delete_thread(request.user, thread),
             }
@@ -227,7 +201,7 @@ def delete_thread(request, thread_id):
     is_ajax = request.headers.get('X-Requested-With') == 'XMLHttpRequest'
 
     thread.is_deleted = True
-    thread.save()
+    thread.save(update_fields=['is_deleted', 'updated_at'])
 
     if is_ajax:
         return JsonResponse({'success': True, 'redirect_url': reverse('forums:forum_threads', args=[thread.tournament.id])})
@@ -277,9 +251,7 @@ def get_tournament_threads(request, tournament_id):
         sort_param = request.GET.get('sort', '-created_at')
         page_number = request.GET.get('page', 1)
 
-        base_queryset = tournament.threads.filter(is_deleted=False).select_related('author').annotate(
-             reply_count_agg=Coalesce(Count('posts', filter=Q(posts__is_deleted=False)), 0) - 1
-        )
+        base_queryset = tournament.threads.filter(is_deleted=False).select_related('author')
 
         filters = Q()
         if query:
@@ -291,7 +263,8 @@ def get_tournament_threads(request, tournament_id):
 
         valid_sort_fields = {
             'created_at': 'created_at',
-            'popularity': 'reply_count_agg',
+            'popularity': 'reply_count',
+            'latest_activity': 'last_post_at',
             'title': 'title',
             'author': 'author__username'
         }
@@ -301,35 +274,50 @@ def get_tournament_threads(request, tournament_id):
         order_field_name = valid_sort_fields.get(sort_key, 'created_at') 
         final_order_field = sort_direction + order_field_name
 
-        if 'reply_count_agg' in final_order_field:
+        if order_field_name in ('reply_count', 'last_post_at'):
             if final_order_field.startswith('-'):
-                 base_queryset = base_queryset.order_by(F('reply_count_agg').desc(nulls_last=True), '-created_at') 
+                 base_queryset = base_queryset.order_by(F(order_field_name).desc(nulls_last=True), '-created_at') 
             else:
-                 base_queryset = base_queryset.order_by(F('reply_count_agg').asc(nulls_first=True), 'created_at') 
+                 base_queryset = base_queryset.order_by(F(order_field_name).asc(nulls_first=True), 'created_at') 
         else:
              base_queryset = base_queryset.order_by(final_order_field)
 
-        paginator = Paginator(base_queryset, 15)
-        page_obj = paginator.get_page(page_number)
+        if wants_cursor(request):
+            try:
+                page_items, next_cursor = cursor_paginate(
+                    base_queryset.annotate(activity_at=Coalesce('last_post_at', 'created_at')),
+                    thread_cursor_ordering(sort_param), request.GET.get('cursor'), 15
+                )
+            except InvalidCursor as e:
+                return JsonResponse({'error': str(e)}, status=400)
+            pagination = {'has_next': next_cursor is not None, 'next_cursor': next_cursor}
+        else:
+            paginator = Paginator(base_queryset, 15)
+            page_obj = paginator.get_page(page_number)
+            page_items = page_obj.object_list
+            pagination = {
+                'current_page': page_obj.number, 'has_next': page_obj.has_next(),
+                'total_pages': paginator.num_pages, 'total_count': paginator.count,
+            }
 
+        perms = forum_permissions(request)
+        to_local = LocalTimeFormatter().local
         threads_data = []
-        for thread in page_obj.object_list:
-            reply_count = max(0, thread.reply_count_agg)
+        for thread in page_items:
+            reply_count = thread.reply_count
+            created_at = to_local(thread.created_at)
             threads_data.append({
                 'id': thread.id, 'title': thread.title,
                 'url': reverse('forums:thread_posts', args=[thread.id]),
                 'author_username': thread.author.username if thread.author else 'Unknown',
-                'created_date': timezone.localtime(thread.created_at).strftime('%d %b %Y'),
-                'created_time': timezone.localtime(thread.created_at).strftime('%H:%M'),
+                'created_date': created_at.strftime('%d %b %Y'),
+                'created_time': created_at.strftime('%H:%M'),
                 'reply_count': reply_count,
-                'can_edit': can_edit_thread(request.user, thread),
-                'can_delete': can_delete_thread(request.user, thread),
+                'can_edit': perms.can_edit_thread(thread),
+                'can_delete': perms.can_delete_thread(thread),
             })
 
-        return JsonResponse({ 'threads': threads_data, 'pagination': {
-                'current_page': page_obj.number, 'has_next': page_obj.has_next(),
-                'total_pages': paginator.num_pages, 'total_count': paginator.count,
-            }})
+        return JsonResponse({ 'threads': threads_data, 'pagination': pagination })
 
     except Exception as e:
         print(f"Error in get_tournament_threads: {e}")
@@ -343,6 +331,7 @@ def thread_posts(request, thread_id):
         raise Http404("Thread tidak ditemukan.")
 
     is_ajax = request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+    perms = forum_permissions(request)
 
     if request.method == 'POST' and is_ajax:
         if not request.user.is_authenticated:
@@ -363,11 +352,6 @@ def thread_posts(request, thread_id):
             else:
                  post.parent = None
             post.save() 
-            depth = 0
-            temp_parent = parent_post
-            while temp_parent:
-                depth += 1
-                temp_parent = temp_parent.parent
 
             response_data = {
                 'success': True,
@@ -382,9 +366,9 @@ def thread_posts(request, thread_id):
                     'is_thread_author': post.author == thread.author,
                     'reply_count': 0, 
                     'is_edited': post.is_edited,
-                    'can_edit': can_edit_post(request.user, post),
-                    'can_delete': can_delete_post(request.user, post),
-                    'depth': depth,
+                    'can_edit': perms.can_edit_post(post),
+                    'can_delete': perms.can_delete_post(post),
+                    'depth': post.depth,
                 }
             }
             return JsonResponse(response_data, status=201)
@@ -400,34 +384,58 @@ def thread_posts(request, thread_id):
                            .values('parent_id').annotate(count=Count('id'))
     reply_count_map = {item['parent_id']: item['count'] for item in reply_counts_query}
 
+    format_local = LocalTimeFormatter()
     for post in all_posts:
         posts_json_data.append({
             "id": post.pk,
             "author_username": post.author.username,
             "body": post.body,
             "body_raw": post.body, 
-            "created_at": timezone.localtime(post.created_at).strftime('%d %b %Y, %H:%M'),
+            "created_at": format_local(post.created_at, '%d %b %Y, %H:%M'),
             "image_url": post.image, 
-            "parent_id": post.parent.pk if post.parent else None,
-            "is_thread_author": post.author == thread.author,
+            "parent_id": post.parent_id,
+            "is_thread_author": post.author_id == thread.author_id,
             "reply_count": reply_count_map.get(post.pk, 0),
             "is_edited": post.is_edited,
-            "can_edit": can_edit_post(request.user, post),
-            "can_delete": can_delete_post(request.user, post),
+            "can_edit": perms.can_edit_post(post),
+            "can_delete": perms.can_delete_post(post),
         })
 
-    reply_count_total = max(0, all_posts.count() - 1)
+    reply_count_total = thread.reply_count
     reply_form = PostReplyForm() 
     context = {
         'thread': thread,
         'posts_json': json.dumps(posts_json_data),
         'reply_count': reply_count_total,
         'reply_form': reply_form,
-        'can_edit_thread': can_edit_thread(request.user, thread),
-        'can_delete_thread': can_delete_thread(request.user, thread),
+        'can_edit_thread': perms.can_edit_thread(thread),
+        'can_delete_thread': perms.can_delete_thread(thread),
     }
     return render(request, 'forums/thread_posts.html', context)
 
+TOURNAMENT_CURSOR_ORDERINGS = {
+    'name': ('name', 'pk'),
+    'start_date': ('start_date', 'pk'),
+    'participant_count': ('participant_count', 'name', 'pk'),
+    'organizer__username': ('organizer__username', 'pk'),
+}
+
+
+def participant_logos(tournament_ids, limit=10):
+    """
+    Logo peserta (maks. limit per turnamen) untuk satu halaman turnamen dalam satu query.
+    Batas per turnamen dipotong di SQL (ROW_NUMBER per turnamen), jadi jumlah baris
+    mengikuti ukuran halaman, bukan jumlah peserta.
+    """
+    rows = Tournament.participants.through.objects.filter(tournament_id__in=tournament_ids).annotate(
+        position=Window(RowNumber(), partition_by=[F('tournament_id')], order_by=F('pk').asc())
+    ).filter(position__lte=limit).order_by('tournament_id', 'pk').values_list('tournament_id', 'team__logo')
+    logos = {}
+    for tournament_id, logo in rows:
+        logos.setdefault(tournament_id, []).append(logo)
+    return logos
+
+
 def search_tournaments(request):
     try:
         query = request.GET.get('q', '').strip()
@@ -439,14 +447,11 @@ def search_tournaments(request):
         primary_sort_field = request.GET.get('primary_sort', 'name')
         page_number = request.GET.get('page', 1)
 
+        # Statistik dibaca dari TournamentForumStats (LEFT JOIN satu baris per turnamen)
         base_queryset = Tournament.objects.select_related('organizer').annotate(
-            participant_count=Count(
-                'threads__posts__author', 
-                filter=Q(threads__posts__is_deleted=False) & Q(threads__is_deleted=False), 
-                distinct=True
-            ),
-            thread_count=Count('threads', filter=Q(threads__is_deleted=False), distinct=True),
-            post_count=Count('threads__posts', filter=Q(threads__posts__is_deleted=False), distinct=True)
+            participant_count=Coalesce('forum_stats__participant_count', Value(0)),
+            thread_count=Coalesce('forum_stats__thread_count', Value(0)),
+            post_count=Coalesce('forum_stats__post_count', Value(0)),
         )
 
         filters = Q()
@@ -510,15 +515,32 @@ def search_tournaments(request):
         else:
              base_queryset = base_queryset.order_by(final_order_field)
 
-        paginator = Paginator(base_queryset, 10)
-        page_obj = paginator.get_page(page_number)
+        if wants_cursor(request):
+            cursor_ordering = TOURNAMENT_CURSOR_ORDERINGS[order_field_name]
+            if sort_direction_prefix:
+                cursor_ordering = tuple('-' + field for field in cursor_ordering)
+            try:
+                page_items, next_cursor = cursor_paginate(
+                    base_queryset, cursor_ordering, request.GET.get('cursor'), 10
+                )
+            except InvalidCursor as e:
+                return JsonResponse({'error': str(e)}, status=400)
+            pagination = {'has_next': next_cursor is not None, 'next_cursor': next_cursor}
+        else:
+            paginator = Paginator(base_queryset, 10)
+            page_obj = paginator.get_page(page_number)
+            page_items = page_obj.object_list
+            pagination = {
+                'current_page': page_obj.number, 'has_next': page_obj.has_next(),
+                'total_pages': paginator.num_pages, 'total_count': paginator.count,
+            }
+
+        page_items = list(page_items)
+        logos_by_tournament = participant_logos([tournament.id for tournament in page_items])
 
         tournaments_data = []
-        for tournament in page_obj.object_list:
-            try:
-                related_images = list(tournament.participants.all().values_list('logo', flat=True)[:10])
-            except Exception:
-                related_images = []
+        for tournament in page_items:
+            related_images = logos_by_tournament.get(tournament.id, [])
 
             tournaments_data.append({
                 'id': tournament.id, 
@@ -536,10 +558,7 @@ def search_tournaments(request):
                 'organizer_username': tournament.organizer.username if tournament.organizer else 'Tidak diketahui'
             })
 
-        return JsonResponse({ 'tournaments': tournaments_data, 'pagination': {
-                'current_page': page_obj.number, 'has_next': page_obj.has_next(),
-                'total_pages': paginator.num_pages, 'total_count': paginator.count,
-            }})
+        return JsonResponse({ 'tournaments': tournaments_data, 'pagination': pagination })
 
     except Exception as e:
         print(f"Error in search_tournaments: {e}")
@@ -554,9 +573,7 @@ def api_get_tournament_threads(request, tournament_id):
         sort_param = request.GET.get('sort', '-created_at')
         page_number = request.GET.get('page', 1)
 
-        base_queryset = tournament.threads.filter(is_deleted=False).select_related('author').annotate(
-             reply_count_agg=Coalesce(Count('posts', filter=Q(posts__is_deleted=False)), 0) - 1
-        )
+        base_queryset = tournament.threads.filter(is_deleted=False).select_related('author')
 
         filters = Q()
         if query:
@@ -568,7 +585,8 @@ def api_get_tournament_threads(request, tournament_id):
 
         valid_sort_fields = {
             'created_at': 'created_at',
-            'popularity': 'reply_count_agg',
+            'popularity': 'reply_count',
+            'latest_activity': 'last_post_at',
             'title': 'title',
             'author': 'author__username'
         }
@@ -578,40 +596,53 @@ def api_get_tournament_threads(request, tournament_id):
         order_field_name = valid_sort_fields.get(sort_key, 'created_at') 
         final_order_field = sort_direction + order_field_name
 
-        if 'reply_count_agg' in final_order_field:
+        if order_field_name in ('reply_count', 'last_post_at'):
             if final_order_field.startswith('-'):
-                 base_queryset = base_queryset.order_by(F('reply_count_agg').desc(nulls_last=True), '-created_at') 
+                 base_queryset = base_queryset.order_by(F(order_field_name).desc(nulls_last=True), '-created_at') 
             else:
-                 base_queryset = base_queryset.order_by(F('reply_count_agg').asc(nulls_first=True), 'created_at') 
+                 base_queryset = base_queryset.order_by(F(order_field_name).asc(nulls_first=True), 'created_at') 
         else:
              base_queryset = base_queryset.order_by(final_order_field)
 
-        paginator = Paginator(base_queryset, 15)
-        page_obj = paginator.get_page(page_number)
+        if wants_cursor(request):
+            try:
+                page_items, next_cursor = cursor_paginate(
+                    base_queryset.annotate(activity_at=Coalesce('last_post_at', 'created_at')),
+                    thread_cursor_ordering(sort_param), request.GET.get('cursor'), 15
+                )
+            except InvalidCursor as e:
+                return JsonResponse({'error': str(e)}, status=400)
+            pagination = {'has_next': next_cursor is not None, 'next_cursor': next_cursor}
+        else:
+            paginator = Paginator(base_queryset, 15)
+            page_obj = paginator.get_page(page_number)
+            page_items = page_obj.object_list
+            pagination = {
+                'current_page': page_obj.number, 'has_next': page_obj.has_next(),
+                'total_pages': paginator.num_pages, 'total_count': paginator.count,
+            }
 
+        perms = forum_permissions(request)
+        to_local = LocalTimeFormatter().local
         threads_data = []
-        for thread in page_obj.object_list:
-            reply_count = max(0, thread.reply_count_agg)
+        for thread in page_items:
+            reply_count = thread.reply_count
+            created_at = to_local(thread.created_at)
             threads_data.append({
                 'id': thread.id,
                 'title': thread.title,
                 'author_username': thread.author.username if thread.author else 'Unknown',
-                'created_at': timezone.localtime(thread.created_at).strftime('%d %b %Y, %H:%M'),
-                'created_date': timezone.localtime(thread.created_at).strftime('%d %b %Y'),
-                'created_time': timezone.localtime(thread.created_at).strftime('%H:%M'),
+                'created_at': created_at.strftime('%d %b %Y, %H:%M'),
+                'created_date': created_at.strftime('%d %b %Y'),
+                'created_time': created_at.strftime('%H:%M'),
                 'reply_count': reply_count,
-                'can_edit': can_edit_thread(request.user, thread),
-                'can_delete': can_delete_thread(request.user, thread),
+                'can_edit': perms.can_edit_thread(thread),
+                'can_delete': perms.can_delete_thread(thread),
             })
 
         return JsonResponse({
             'threads': threads_data,
-            'pagination': {
-                'current_page': page_obj.number,
-                'has_next': page_obj.has_next(),
-                'total_pages': paginator.num_pages,
-                'total_count': paginator.count,
-            }
+            'pagination': pagination
         })
 
     except Exception as e:
@@ -682,12 +713,6 @@ def api_reply_to_thread(request, thread_id):
              post.parent = None
         post.save() 
 
-        depth = 0
-        temp_parent = parent_post
-        while temp_parent:
-            depth += 1
-            temp_parent = temp_parent.parent
-
         response_data = {
             'success': True,
             'post': {
@@ -700,7 +725,7 @@ def api_reply_to_thread(request, thread_id):
                 'is_thread_author': post.author == thread.author,
                 'reply_count': 0, 
                 'is_edited': post.is_edited,
-                'depth': depth,
+                'depth': post.depth,
             }
         }
         return JsonResponse(response_data, status=201)
@@ -708,45 +733,39 @@ def api_reply_to_thread(request, thread_id):
         error_dict = {field: error[0] for field, error in form.errors.items()}
         return JsonResponse({'success': False, 'error': 'Validation failed', 'errors': error_dict}, status=400)
     
+@read_from_replica
 def api_thread_posts(request, thread_id):
     try:
         thread = get_object_or_404(Thread, pk=thread_id)
         
-        all_posts = thread.posts.filter(is_deleted=False).select_related('author').order_by('created_at')
+        # Urut path = depth-first, depth sudah tersimpan di setiap post
+        all_posts = thread.posts.filter(is_deleted=False).select_related('author').order_by('path')
 
         reply_counts_query = Post.objects.filter(thread=thread, parent__isnull=False, is_deleted=False)\
                                .values('parent_id').annotate(count=Count('id'))
         reply_count_map = {item['parent_id']: item['count'] for item in reply_counts_query}
 
-        parent_map = {p.id: p.parent_id for p in all_posts}
-
+        perms = forum_permissions(request)
+        format_local = LocalTimeFormatter()
         posts_data = []
 
         for post in all_posts:
-            depth = 0
-            current_parent_id = parent_map.get(post.id)
-            
-            while current_parent_id is not None:
-                depth += 1
-                current_parent_id = parent_map.get(current_parent_id)
-                if depth > 50: break 
-
             posts_data.append({
                 "id": post.pk,
                 "author_username": post.author.username,
                 "body": post.body,
-                "created_at": timezone.localtime(post.created_at).strftime('%d %b %Y, %H:%M'),
+                "created_at": format_local(post.created_at, '%d %b %Y, %H:%M'),
                 "image_url": post.image, 
                 
                 "parent_id": post.parent_id, 
                 
-                "is_thread_author": post.author == thread.author,
+                "is_thread_author": post.author_id == thread.author_id,
                 "reply_count": reply_count_map.get(post.pk, 0),
                 "is_edited": post.is_edited,
-                "can_edit": can_edit_post(request.user, post),
-                "can_delete": can_delete_post(request.user, post),
+                "can_edit": perms.can_edit_post(post),
+                "can_delete": perms.can_delete_post(post),
                 
-                "depth": depth, 
+                "depth": post.depth, 
             })
 
         return JsonResponse({'posts': posts_data})
@@ -794,17 +813,13 @@ def api_delete_post(request, post_id):
     post = get_object_or_404(Post, pk=post_id)
     if not can_delete_post(request.user, post):
         return JsonResponse({'success': False, 'error': 'Permission denied.'}, status=403)
-    def soft_delete_children_recursive(parent_post):
-        children = parent_post.replies.filter(is_deleted=False) 
-        
-        for child in children:
-            soft_delete_children_recursive(child)
-            
-            child.is_deleted = True
-            child.save()
-    soft_delete_children_recursive(post)
-    post.is_deleted = True
-    post.save()
+    # Satu UPDATE untuk post beserta seluruh balasannya
+    with transaction.atomic():
+        subtree = post.subtree().filter(is_deleted=False)
+        deleted_ids = list(subtree.values_list('pk', flat=True))
+        subtree.update(is_deleted=True, updated_at=timezone.now())
+        refresh_thread_counters([post.thread_id])
+        search.remove_posts(deleted_ids)
     return JsonResponse({'success': True, 'message': 'Post deleted successfully'})
 
 
@@ -821,10 +836,26 @@ def api_delete_thread(request, thread_id):
     if not can_delete_thread(request.user, thread):
         return JsonResponse({'success': False, 'error': 'Permission denied.'}, status=403)
     thread.is_deleted = True
-    thread.save()
-    posts_to_delete = thread.posts.filter(is_deleted=False)
-    
-    for post in posts_to_delete:
-        post.is_deleted = True
-        post.save()
-    return JsonResponse({'success': True, 'message': 'Thread and all posts deleted successfully'})
\ No newline at end of file
+    with transaction.atomic():
+        thread.save(update_fields=['is_deleted', 'updated_at'])
+        thread.posts.filter(is_deleted=False).update(is_deleted=True, updated_at=timezone.now())
+        refresh_thread_counters([thread.pk])
+    return JsonResponse({'success': True, 'message': 'Thread and all posts deleted successfully'})
+
+
+def api_search_forum(request):
+    query = request.GET.get('q', '').strip()
+    tournament_id = request.GET.get('tournament')
+    try:
+        limit = min(max(int(request.GET.get('limit', 20)), 1), 50)
+        tournament_id = int(tournament_id) if tournament_id else None
+    except ValueError:
+        return JsonResponse({'error': 'Parameter tidak valid.'}, status=400)
+
+    if len(query) < 2:
+        return JsonResponse({'results': []})
+
+    results = search.search_forum(query, tournament_id=tournament_id, limit=limit)
+    for result in results:
+        result['url'] = reverse('forums:thread_posts', args=[result['thread_id']])
+    return JsonResponse({'results': results})
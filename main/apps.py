@@ -7,3 +7,7 @@ class MainConfig(AppConfig):
 
     def ready(self):
         import main.signals
+        main.signals.connect_cache_invalidation()
+        main.signals.connect_sync_tracking()
+        main.signals.connect_autocomplete_invalidation()
+        main.signals.connect_home_snapshot_invalidation()
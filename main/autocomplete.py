@@ -0,0 +1,216 @@
+"""
+Autocomplete untuk username, nama tim, dan nama turnamen.
+
+Di PostgreSQL pencarian memakai pg_trgm: indeks GIN trigram (migrasi
+main.0004) melayani istartswith dan operator word similarity (%>), dan hasil
+diurutkan dengan word_similarity. Indeks UPPER(kolom) yang sama juga
+mempercepat filter icontains lama di view pencarian lain.
+
+Di database lain (SQLite saat development) dipakai NGramIndex: indeks trigram
+di memori proses yang dibangun sekali per sumber dan dibangun ulang kalau
+versinya berubah. Versi naik lewat signal hanya kalau kolom yang diindeks
+berubah, jadi save last_login saat login tidak memicu rebuild.
+"""
+import bisect
+import heapq
+import time
+from collections import Counter
+
+from django.apps import apps
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from .cache import get_cache
+
+# type -> (label model, kolom yang dicari)
+AUTOCOMPLETE_SOURCES = {
+    'users': ('auth.User', 'username'),
+    'teams': ('teams.Team', 'name'),
+    'tournaments': ('tournaments.Tournament', 'name'),
+}
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+MIN_SIMILARITY = 0.3
+# Jumlah maksimum baris prefix yang diranking per query
+PREFIX_CANDIDATES = 1000
+VERSION_KEY = 'autocomplete:version:{}'
+
+
+def normalize(text):
+    return ' '.join(str(text).lower().split())
+
+
+def trigrams(text):
+    """Trigram seperti pg_trgm: setiap kata diberi padding dua spasi di depan dan satu di belakang."""
+    grams = set()
+    for word in normalize(text).split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def rank(query, key, similarity):
+    """Skor gabungan (query dan key sudah dinormalisasi): persis > prefix > substring, lalu kemiripan trigram."""
+    if key == query:
+        return 3 + similarity
+    if key.startswith(query):
+        return 2 + similarity
+    if query in key:
+        return 1 + similarity
+    return similarity
+
+
+class NGramIndex:
+    """Indeks trigram di memori untuk satu sumber: postings trigram -> posisi baris."""
+
+    def __init__(self, rows):
+        self.ids, self.labels, self.keys, self.sizes = [], [], [], []
+        self.postings = {}
+        for position, (pk, label) in enumerate(rows):
+            grams = trigrams(label)
+            self.ids.append(pk)
+            self.labels.append(label)
+            self.keys.append(normalize(label))
+            self.sizes.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(position)
+        # (key, posisi) terurut untuk pencarian prefix dengan bisect
+        self.sorted_keys = sorted((key, position) for position, key in enumerate(self.keys))
+
+    def prefix_matches(self, query, limit):
+        start = bisect.bisect_left(self.sorted_keys, (query, -1))
+        matches = []
+        for key, position in self.sorted_keys[start:start + limit]:
+            if not key.startswith(query):
+                break
+            matches.append(position)
+        return matches
+
+    def substring_matches(self, query):
+        """Baris yang mengandung query, dicari dari posting trigram (tanpa padding) yang paling jarang."""
+        inner = [word[i:i + 3] for word in query.split() for i in range(len(word) - 2)]
+        if not inner:
+            return []
+        rarest = min((self.postings.get(gram, ()) for gram in inner), key=len)
+        return [position for position in rarest if query in self.keys[position]]
+
+    def similarity(self, shared, query_size, position):
+        """Similarity trigram (Jaccard, seperti pg_trgm) dari jumlah trigram yang sama."""
+        return shared / (query_size + self.sizes[position] - shared)
+
+    def search(self, query, limit=DEFAULT_LIMIT, min_similarity=MIN_SIMILARITY):
+        """List (id, label, score) terurut score, maksimal limit baris."""
+        query = normalize(query)
+        if not query:
+            return []
+        query_grams = trigrams(query)
+        size = len(query_grams)
+
+        # Prefix (termasuk query 1-2 huruf) dan substring. Trigram yang sama tidak perlu dihitung:
+        # prefix hanya tidak memiliki trigram akhir query, substring juga tidak memiliki dua trigram awalnya
+        scores = {}
+        for position in self.substring_matches(query):
+            scores[position] = rank(query, self.keys[position], self.similarity(max(size - 3, 0), size, position))
+        for position in self.prefix_matches(query, PREFIX_CANDIDATES):
+            key = self.keys[position]
+            scores[position] = rank(query, key, 1.0 if key == query else self.similarity(size - 1, size, position))
+
+        # Hasil fuzzy selalu di bawah prefix/substring (rank < 1), jadi hanya dicari kalau belum cukup
+        if len(scores) < limit:
+            shared = Counter()
+            for gram in query_grams:
+                shared.update(self.postings.get(gram, ()))
+            for position, count in shared.items():
+                if position not in scores:
+                    similarity = self.similarity(count, size, position)
+                    if similarity >= min_similarity:
+                        scores[position] = similarity
+
+        best = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], self.keys[item[0]]))
+        return [(self.ids[position], self.labels[position], round(score, 4)) for position, score in best]
+
+
+_indexes = {}
+
+
+def source_version(source):
+    cache = get_cache()
+    key = VERSION_KEY.format(source)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_source_version(source):
+    cache = get_cache()
+    key = VERSION_KEY.format(source)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def get_index(source):
+    """NGramIndex untuk sumber ini, dibangun ulang kalau versinya sudah berubah."""
+    version = source_version(source)
+    cached = _indexes.get(source)
+    if cached is None or cached[0] != version:
+        label, field = AUTOCOMPLETE_SOURCES[source]
+        rows = apps.get_model(label).objects.order_by('pk').values_list('pk', field).iterator(chunk_size=5000)
+        cached = _indexes[source] = (version, NGramIndex(rows))
+    return cached[1]
+
+
+def uses_pg_trgm():
+    return connection.vendor == 'postgresql' and apps.is_installed('django.contrib.postgres')
+
+
+def search_postgres(source, query, limit):
+    from django.contrib.postgres.search import TrigramWordSimilarity
+
+    label, field = AUTOCOMPLETE_SOURCES[source]
+    prefix = Q(**{f'{field}__istartswith': query})
+    rows = (
+        apps.get_model(label).objects
+        .filter(prefix | Q(**{f'{field}__trigram_word_similar': query}))
+        .annotate(
+            similarity=TrigramWordSimilarity(query, field),
+            is_prefix=Case(When(prefix, then=Value(1)), default=Value(0), output_field=IntegerField()),
+        )
+        .order_by('-is_prefix', '-similarity', field)
+        .values_list('pk', field, 'similarity')[:limit]
+    )
+    normalized = normalize(query)
+    return [(pk, value, round(rank(normalized, normalize(value), similarity), 4)) for pk, value, similarity in rows]
+
+
+def autocomplete(query, types=None, limit=DEFAULT_LIMIT):
+    """
+    Hasil gabungan semua sumber: [{'type', 'id', 'label', 'score'}], diurutkan score
+    lalu label. types None berarti semua sumber.
+    """
+    results = []
+    for source in types or AUTOCOMPLETE_SOURCES:
+        if uses_pg_trgm():
+            matches = search_postgres(source, query, limit)
+        else:
+            matches = get_index(source).search(query, limit)
+        results.extend({'type': source, 'id': pk, 'label': label, 'score': score} for pk, label, score in matches)
+    results.sort(key=lambda item: (-item['score'], item['label'].lower()))
+    return results[:limit]
+
+
+# --- Invalidasi (dihubungkan di main.signals) ---
+
+def invalidate_on_save(sender, instance, created, update_fields=None, **kwargs):
+    for source, (label, field) in AUTOCOMPLETE_SOURCES.items():
+        if sender._meta.label == label and (created or update_fields is None or field in update_fields):
+            bump_source_version(source)
+
+
+def invalidate_on_delete(sender, **kwargs):
+    for source, (label, _) in AUTOCOMPLETE_SOURCES.items():
+        if sender._meta.label == label:
+            bump_source_version(source)
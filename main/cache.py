@@ -0,0 +1,111 @@
+"""
+Cache respons untuk endpoint JSON publik.
+
+Key respons = endpoint + query params yang dinormalisasi + versi setiap model
+yang menjadi dependensi endpoint. Setiap write ke model tersebut (lewat
+post_save / post_delete / m2m_changed di main.signals) menaikkan versinya,
+sehingga respons lama otomatis tidak terpakai lagi.
+"""
+import hashlib
+import time
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+from .replicas import primary_reads
+
+RESPONSE_CACHE_ALIAS = 'default'
+VERSION_KEY = 'response-cache:version:{}'
+
+
+def get_cache():
+    return caches[RESPONSE_CACHE_ALIAS]
+
+
+def cache_timeout():
+    return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 60)
+
+
+def normalize_params(query_dict):
+    """
+    Query string dengan urutan stabil. Parameter kosong tetap dihitung karena
+    bisa bermakna (misalnya ?cursor= untuk meminta mode cursor).
+    """
+    items = sorted(
+        (key, value)
+        for key in query_dict
+        for value in query_dict.getlist(key)
+    )
+    return urlencode(items)
+
+
+def model_versions(labels):
+    """
+    Versi saat ini untuk setiap label model. Versi yang belum ada diisi dengan
+    timestamp, jadi kalau key versi sempat hilang dari cache, key respons lama
+    tidak akan cocok lagi.
+    """
+    cache = get_cache()
+    keys = [VERSION_KEY.format(label) for label in labels]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_model_version(label):
+    """Invalidasi semua respons yang bergantung pada model ini."""
+    cache = get_cache()
+    key = VERSION_KEY.format(label)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def response_cache_key(endpoint, request, view_kwargs, labels):
+    params = normalize_params(request.GET)
+    kwargs = urlencode(sorted(view_kwargs.items()))
+    versions = '.'.join(str(v) for v in model_versions(labels))
+    digest = hashlib.md5(f'{params}|{kwargs}|{versions}'.encode()).hexdigest()
+    return f'response-cache:{endpoint}:{digest}'
+
+
+def cache_json_response(*labels):
+    """
+    Decorator untuk view JSON publik. Hanya GET dari user anonim yang di-cache
+    (respons user login bisa berisi data pribadi) dan hanya yang status 200.
+    labels adalah model dependensi, misalnya 'tournaments.Match'.
+    """
+    def decorator(view):
+        endpoint = f'{view.__module__}.{view.__name__}'
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            timeout = cache_timeout()
+            if request.method != 'GET' or request.user.is_authenticated or not timeout:
+                return view(request, *args, **kwargs)
+
+            cache = get_cache()
+            key = response_cache_key(endpoint, request, kwargs, labels)
+            cached = cache.get(key)
+            if cached is not None:
+                response = HttpResponse(cached, content_type='application/json')
+                response['X-Cache'] = 'HIT'
+                return response
+
+            # Yang disimpan harus dari primary: replica yang tertinggal akan menyimpan
+            # data lama di bawah versi yang baru dinaikkan
+            with primary_reads():
+                response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                cache.set(key, response.content, timeout)
+            response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
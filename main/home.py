@@ -0,0 +1,100 @@
+"""
+Snapshot halaman home (home_view dan show_home_json).
+
+Bagian yang sama untuk semua user (turnamen berjalan, laga mendatang, thread
+terbaru, top predictor, dan statistik global) dihitung sekali lalu disimpan di
+cache, jadi satu request cukup satu cache read. Snapshot dibangun ulang kalau:
+- hilang atau kedaluwarsa (HOME_SNAPSHOT_TIMEOUT detik),
+- tanggal sudah berganti (daftar turnamen berjalan bergantung hari ini),
+- ada write ke Tournament, Match, Team, atau Thread (signal di main.signals),
+- command refresh_home_snapshot dijalankan (misalnya dari cron).
+Prediksi dan ledger poin berubah sangat sering, jadi top predictor dan jumlah
+prediktor cukup ikut kedaluwarsa. Rank dan tim user tetap dihitung live.
+"""
+from django.conf import settings
+from django.utils import timezone
+
+from forums.models import Thread
+from predictions import ledger
+from predictions.models import Prediction
+from tournaments.models import Match, Tournament
+
+from .cache import get_cache
+
+HOME_SNAPSHOT_KEY = 'home:snapshot'
+HOME_LIST_SIZE = 3
+# Laga mendatang disimpan lebih banyak karena yang sudah lewat dibuang saat dibaca
+UPCOMING_BUFFER = 10
+
+
+def snapshot_timeout():
+    return getattr(settings, 'HOME_SNAPSHOT_TIMEOUT', 300)
+
+
+def build_home_snapshot(now=None):
+    now = now or timezone.now()
+    today = now.date()
+    ongoing = Tournament.objects.filter(start_date__lte=today, end_date__gte=today)
+
+    upcoming = Match.objects.filter(
+        match_date__gte=now, home_score__isnull=True, away_score__isnull=True
+    ).order_by('match_date').values(
+        'id', 'tournament_id', 'tournament__name', 'home_team__name', 'away_team__name', 'match_date'
+    )[:UPCOMING_BUFFER]
+
+    threads = Thread.objects.order_by('-created_at').values(
+        'id', 'title', 'author__username', 'tournament__name', 'reply_count'
+    )[:HOME_LIST_SIZE]
+
+    return {
+        'date': today,
+        'generated_at': now,
+        'ongoing_tournaments': list(
+            ongoing.order_by('-start_date').values('id', 'name', 'end_date')[:HOME_LIST_SIZE]
+        ),
+        'upcoming_matches': [{
+            'id': match['id'],
+            'tournament_id': match['tournament_id'],
+            'tournament_name': match['tournament__name'],
+            'home_team': match['home_team__name'],
+            'away_team': match['away_team__name'],
+            'match_date': match['match_date'],
+        } for match in upcoming],
+        'recent_threads': [{
+            'id': thread['id'],
+            'title': thread['title'],
+            'author': thread['author__username'],
+            'tournament': thread['tournament__name'],
+            'reply_count': thread['reply_count'],
+        } for thread in threads],
+        'top_predictors': list(ledger.top_predictors().filter(total_points__gt=0)[:HOME_LIST_SIZE]),
+        'stats': {
+            'tournaments_count': ongoing.count(),
+            'matches_count': Match.objects.filter(match_date__gte=now).count(),
+            'threads_count': Thread.objects.count(),
+            'predictors_count': Prediction.objects.values('user').distinct().count(),
+        },
+    }
+
+
+def refresh_home_snapshot(now=None):
+    snapshot = build_home_snapshot(now)
+    get_cache().set(HOME_SNAPSHOT_KEY, snapshot, snapshot_timeout())
+    return snapshot
+
+
+def get_home_snapshot(now=None):
+    """
+    Snapshot dari cache (dibangun kalau belum ada atau sudah beda hari). Laga yang
+    sudah dimulai dibuang di sini sehingga daftar tetap benar sampai snapshot berikutnya.
+    """
+    now = now or timezone.now()
+    snapshot = get_cache().get(HOME_SNAPSHOT_KEY)
+    if snapshot is None or snapshot['date'] != now.date():
+        snapshot = refresh_home_snapshot(now)
+    upcoming = [match for match in snapshot['upcoming_matches'] if match['match_date'] >= now]
+    return dict(snapshot, upcoming_matches=upcoming[:HOME_LIST_SIZE])
+
+
+def invalidate_home_snapshot(**kwargs):
+    get_cache().delete(HOME_SNAPSHOT_KEY)
@@ -0,0 +1,83 @@
+import random
+import string
+import time
+
+from django.core.management.base import BaseCommand
+
+from main import autocomplete
+from main.profiling import percentile
+
+SYLLABLES = [consonant + vowel for consonant in 'bcdfghjklmnprstwy' for vowel in 'aeiou'] + ['ng', 'ny', 'tr', 'an']
+
+
+def sample_usernames(count, seed):
+    rng = random.Random(seed)
+    return [
+        ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) + str(rng.randint(0, 9999))
+        for _ in range(count)
+    ]
+
+
+def sample_queries(usernames, count, seed):
+    """Prefix yang sedang diketik, potongan di tengah, dan salah ketik satu huruf."""
+    rng = random.Random(seed)
+    queries = []
+    for i in range(count):
+        name = rng.choice(usernames)
+        if i % 3 == 0:
+            queries.append(name[:rng.randint(2, 6)])
+        elif i % 3 == 1:
+            start = rng.randint(0, max(len(name) - 4, 0))
+            queries.append(name[start:start + 4])
+        else:
+            position = rng.randrange(len(name))
+            queries.append(name[:position] + rng.choice(string.ascii_lowercase) + name[position + 1:])
+    return queries
+
+
+class Command(BaseCommand):
+    help = ('Benchmarks the in-process n-gram autocomplete index against a full icontains-style scan '
+            'on synthetic usernames (default 1M). On PostgreSQL the same queries are served by pg_trgm indexes.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1_000_000, help='Synthetic usernames to index.')
+        parser.add_argument('--queries', type=int, default=200, help='Autocomplete queries to time.')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def timed(self, func, queries):
+        samples = []
+        for query in queries:
+            started = time.perf_counter()
+            func(query)
+            samples.append((time.perf_counter() - started) * 1000)
+        return samples
+
+    def report(self, label, samples):
+        samples = sorted(samples)
+        self.stdout.write(
+            f'{label:<22} p50 {percentile(samples, 50):8.3f} ms   p95 {percentile(samples, 95):8.3f} ms   '
+            f'max {max(samples):8.3f} ms'
+        )
+
+    def handle(self, *args, **options):
+        usernames = sample_usernames(options['users'], options['seed'])
+        queries = sample_queries(usernames, options['queries'], options['seed'] + 1)
+        rows = list(enumerate(usernames, start=1))
+
+        started = time.perf_counter()
+        index = autocomplete.NGramIndex(rows)
+        build_seconds = time.perf_counter() - started
+        self.stdout.write(
+            f'{len(usernames)} usernames, {len(index.postings)} distinct trigrams, '
+            f'index built in {build_seconds:.2f}s, {len(queries)} queries'
+        )
+
+        keys = index.keys
+
+        def scan(query):
+            # Setara WHERE username ILIKE '%q%' tanpa indeks: baca semua baris
+            query = autocomplete.normalize(query)
+            return [position for position, key in enumerate(keys) if query in key][:autocomplete.DEFAULT_LIMIT]
+
+        self.report('icontains scan', self.timed(scan, queries))
+        self.report('n-gram index', self.timed(index.search, queries))
@@ -0,0 +1,107 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections
+from django.test import Client
+from django.urls import reverse
+
+from main.profiling import percentile
+
+
+class Command(BaseCommand):
+    help = ('Load-tests an endpoint with a fresh database connection per request, with persistent '
+            'connections (CONN_MAX_AGE + health checks) and, on PostgreSQL with psycopg 3, with the '
+            'connection pool. Point PRODUCTION/DB_* at a local Postgres to use it as a stand-in '
+            'for the remote database; --connect-delay adds simulated handshake latency.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Requests per scenario.')
+        parser.add_argument('--path', help='Endpoint to hit (default: profile search, which is not cached).')
+        parser.add_argument('--max-age', type=int, default=600,
+                            help='CONN_MAX_AGE for the persistent scenario when the settings use 0.')
+        parser.add_argument('--pool-size', type=int, default=4,
+                            help='max_size for the pooled scenario when the settings have no pool.')
+        parser.add_argument('--connect-delay', type=float, default=0,
+                            help='Milliseconds added to every new (non-pooled) connection, e.g. the remote RTT.')
+
+    def scenarios(self, connection, options):
+        configured = connection.settings_dict
+        pool = configured['OPTIONS'].get('pool')
+        base = dict(configured, OPTIONS={k: v for k, v in configured['OPTIONS'].items() if k != 'pool'})
+        yield 'fresh', dict(base, CONN_MAX_AGE=0, CONN_HEALTH_CHECKS=False)
+        yield 'persistent', dict(base, CONN_MAX_AGE=configured['CONN_MAX_AGE'] or options['max_age'],
+                                 CONN_HEALTH_CHECKS=True)
+        if connection.vendor != 'postgresql':
+            self.stdout.write(self.style.WARNING('pooled: skipped, the pool needs PostgreSQL with psycopg 3'))
+            return
+        pool = pool or {'min_size': 1, 'max_size': options['pool_size']}
+        yield 'pooled', dict(base, CONN_MAX_AGE=0, OPTIONS=dict(base['OPTIONS'], pool=pool))
+
+    def run(self, connection, client, path, requests, settings_dict, delay):
+        connection.close()
+        connection.settings_dict = settings_dict
+        # Pool di-cache per wrapper; buang supaya mengikuti OPTIONS skenario ini
+        connection.__dict__.pop('pool', None)
+        connect_times = []
+        original_connect = connection.connect
+
+        def timed_connect():
+            started = time.perf_counter()
+            if delay and not settings_dict['OPTIONS'].get('pool'):
+                time.sleep(delay)
+            original_connect()
+            connect_times.append((time.perf_counter() - started) * 1000)
+
+        connection.connect = timed_connect
+        samples = []
+        try:
+            for _ in range(requests):
+                started = time.perf_counter()
+                # Test client tidak menutup koneksi; tiru request_started/request_finished dari server WSGI
+                close_old_connections()
+                response = client.get(path)
+                close_old_connections()
+                samples.append((time.perf_counter() - started) * 1000)
+                if response.status_code != 200:
+                    raise CommandError(f'{path} returned {response.status_code}.')
+        finally:
+            del connection.connect
+            connection.close()
+            if settings_dict['OPTIONS'].get('pool'):
+                connection.close_pool()
+        return sorted(samples), connect_times
+
+    def handle(self, *args, **options):
+        connection = connections[DEFAULT_DB_ALIAS]
+        if connection.in_atomic_block:
+            raise CommandError('Cannot benchmark connections inside a transaction.')
+        path = options['path'] or reverse('main:search_profiles') + '?q=a'
+        client = Client(HTTP_HOST='localhost')
+        self.stdout.write(
+            f'{options["requests"]} requests per scenario to {path} on {connection.vendor}, '
+            f'connect delay {options["connect_delay"]:g} ms'
+        )
+
+        configured = connection.settings_dict
+        p95 = {}
+        try:
+            for name, settings_dict in self.scenarios(connection, options):
+                samples, connect_times = self.run(
+                    connection, client, path, options['requests'], settings_dict, options['connect_delay'] / 1000
+                )
+                p95[name] = percentile(samples, 95)
+                connect_ms = sum(connect_times) / len(connect_times) if connect_times else 0
+                self.stdout.write(
+                    f'{name:<11} p50 {percentile(samples, 50):8.3f} ms   p95 {p95[name]:8.3f} ms   '
+                    f'connections {len(connect_times):>5}   connect {connect_ms:7.3f} ms avg'
+                )
+        finally:
+            connection.close()
+            connection.settings_dict = configured
+            connection.__dict__.pop('pool', None)
+
+        for name in ('persistent', 'pooled'):
+            if name in p95:
+                self.stdout.write(self.style.SUCCESS(
+                    f'{name}: {p95["fresh"] - p95[name]:.3f} ms cut from p95 compared to a connection per request'
+                ))
@@ -0,0 +1,82 @@
+import datetime
+import timeit
+
+from django.core.management.base import BaseCommand
+from django.http import JsonResponse as DjangoJsonResponse
+from django.utils import timezone
+
+from main import responses
+
+
+def sample_rows(count):
+    """Baris mirip api_thread_posts: teks, angka, flag, dan waktu pembuatan."""
+    start = timezone.now()
+    return [{
+        'id': i,
+        'author_username': f'user{i % 50}',
+        'body': 'Diskusi strategi tim untuk babak final. ' * 3,
+        'created_at': start - datetime.timedelta(minutes=i),
+        'image_url': None,
+        'parent_id': i - 1 if i % 3 else None,
+        'is_thread_author': i % 7 == 0,
+        'reply_count': i % 5,
+        'is_edited': False,
+        'can_edit': True,
+        'can_delete': False,
+        'depth': i % 4,
+    } for i in range(count)]
+
+
+class Command(BaseCommand):
+    help = ('Benchmarks the shared JSON response helper against django.http.JsonResponse '
+            'and per-row timezone.localtime() against LocalTimeFormatter.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Rows per payload.')
+        parser.add_argument('--repeat', type=int, default=50, help='Responses built per measurement.')
+
+    def measure(self, func, repeat):
+        return min(timeit.repeat(func, number=repeat, repeat=3)) / repeat * 1000
+
+    def report(self, label, baseline_ms, fast_ms):
+        self.stdout.write(
+            f'{label:<24} baseline {baseline_ms:8.3f} ms   fast {fast_ms:8.3f} ms   '
+            f'speedup {baseline_ms / fast_ms:5.2f}x'
+        )
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        payload = sample_rows(rows)
+        encoder = 'orjson' if responses.orjson is not None else 'stdlib (orjson not installed)'
+        self.stdout.write(f'{rows} rows, {repeat} responses per measurement, encoder: {encoder}')
+
+        # Format lama: localtime + strftime per kolom; format baru: satu konversi per baris
+        def format_per_row():
+            return [
+                dict(row, created_at=timezone.localtime(row['created_at']).strftime('%d %b %Y, %H:%M'),
+                     created_time=timezone.localtime(row['created_at']).strftime('%H:%M'))
+                for row in payload
+            ]
+
+        def format_batched():
+            to_local = responses.LocalTimeFormatter().local
+            formatted = []
+            for row in payload:
+                local = to_local(row['created_at'])
+                formatted.append(dict(row, created_at=local.strftime('%d %b %Y, %H:%M'),
+                                      created_time=local.strftime('%H:%M')))
+            return formatted
+
+        self.report('format datetimes', self.measure(format_per_row, repeat), self.measure(format_batched, repeat))
+
+        formatted = format_batched()
+        self.report(
+            'serialize response',
+            self.measure(lambda: DjangoJsonResponse({'posts': formatted}), repeat),
+            self.measure(lambda: responses.JsonResponse({'posts': formatted}), repeat),
+        )
+        self.report(
+            'serialize raw datetimes',
+            self.measure(lambda: DjangoJsonResponse({'posts': payload}), repeat),
+            self.measure(lambda: responses.JsonResponse({'posts': payload}), repeat),
+        )
@@ -0,0 +1,41 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from forums.models import Post
+from main.query_plans import check_hot_queries
+from tournaments.models import Tournament
+
+
+class Command(BaseCommand):
+    help = ('Runs EXPLAIN for the hot endpoint queries and reports whether each one uses its index. '
+            'Sample IDs default to the first tournament, post and user in the database.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tournament', type=int)
+        parser.add_argument('--post', type=int, help='Post ID; its thread is used for the thread queries.')
+        parser.add_argument('--user', type=int)
+        parser.add_argument('--plans', action='store_true', help='Print the full plan for every query.')
+
+    def handle(self, *args, **options):
+        tournament_id = options['tournament'] or Tournament.objects.values_list('pk', flat=True).first()
+        post = Post.objects.filter(pk=options['post']).first() if options['post'] else Post.objects.first()
+        user_id = options['user'] or User.objects.values_list('pk', flat=True).first()
+        if tournament_id is None or post is None or user_id is None:
+            raise CommandError('Need at least one tournament, post and user to explain the hot queries.')
+
+        results = check_hot_queries(
+            tournament_id=tournament_id, thread_id=post.thread_id, post_id=post.pk, user_id=user_id
+        )
+        missing = 0
+        for query, plan, index in results:
+            if index:
+                self.stdout.write(self.style.SUCCESS(f'{query.name:<22} uses {index}'))
+            else:
+                missing += 1
+                self.stdout.write(self.style.WARNING(f'{query.name:<22} does NOT use {", ".join(query.indexes)}'))
+            if options['plans'] or not index:
+                self.stdout.write(f'    ({query.source})\n    ' + plan.replace('\n', '\n    '))
+
+        if missing:
+            raise CommandError(f'{missing} of {len(results)} hot queries do not use their index.')
+        self.stdout.write(self.style.SUCCESS(f'All {len(results)} hot queries use an index.'))
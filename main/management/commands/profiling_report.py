@@ -0,0 +1,35 @@
+import json
+
+from django.core.management.base import BaseCommand
+from main.profiling import build_report, reset_samples
+
+COLUMNS = ['p50_ms', 'p95_ms', 'p99_ms', 'avg_queries', 'max_queries', 'avg_sql_ms', 'max_size', 'requests']
+
+
+class Command(BaseCommand):
+    help = ('Prints the per-endpoint latency and query-count report collected by ProfilingMiddleware. '
+            'Needs a shared cache backend (CACHE_BACKEND=file or redis) to see samples from the web process.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sort', default='p95_ms', choices=COLUMNS, help='Column to sort by (descending).')
+        parser.add_argument('--limit', type=int, help='Only show the top N endpoints.')
+        parser.add_argument('--json', action='store_true', help='Dump the report as JSON.')
+        parser.add_argument('--reset', action='store_true', help='Clear the collected samples after printing.')
+
+    def handle(self, *args, **options):
+        rows = build_report(sort=options['sort'])[:options['limit']]
+
+        if options['json']:
+            self.stdout.write(json.dumps(rows, indent=2))
+        elif not rows:
+            self.stdout.write(self.style.WARNING('No profiling samples found. Is PROFILING enabled?'))
+        else:
+            width = max(len(row['endpoint']) for row in rows)
+            self.stdout.write(f'{"endpoint":<{width}}  ' + '  '.join(f'{col:>11}' for col in COLUMNS))
+            for row in rows:
+                values = '  '.join(f'{"-" if row[col] is None else row[col]:>11}' for col in COLUMNS)
+                self.stdout.write(f'{row["endpoint"]:<{width}}  {values}')
+
+        if options['reset']:
+            reset_samples()
+            self.stdout.write(self.style.SUCCESS('Profiling samples cleared.'))
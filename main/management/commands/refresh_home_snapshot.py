@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from main.home import refresh_home_snapshot, snapshot_timeout
+
+
+class Command(BaseCommand):
+    help = ('Rebuilds the cached home page snapshot (ongoing tournaments, upcoming matches, recent threads, '
+            'top predictors and global stats). Run it periodically, more often than HOME_SNAPSHOT_TIMEOUT.')
+
+    def handle(self, *args, **options):
+        snapshot = refresh_home_snapshot()
+        self.stdout.write(self.style.SUCCESS(
+            f'Home snapshot rebuilt at {snapshot["generated_at"].isoformat()} '
+            f'({len(snapshot["upcoming_matches"])} upcoming matches buffered, expires in {snapshot_timeout()}s).'
+        ))
@@ -0,0 +1,50 @@
+"""
+Indeks trigram pg_trgm untuk main.autocomplete dan filter icontains yang sudah ada.
+
+Hanya dijalankan di PostgreSQL; di SQLite autocomplete memakai NGramIndex di memori.
+Indeks UPPER(kolom::text) cocok dengan SQL yang dihasilkan Django untuk
+icontains/istartswith, indeks kolom biasa dipakai operator word similarity (%>).
+"""
+from django.db import migrations
+
+TRIGRAM_COLUMNS = (
+    ('auth_user', 'username'),
+    ('teams_team', 'name'),
+    ('tournaments_tournament', 'name'),
+)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table, column in TRIGRAM_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {table}_{column}_trgm ON {table} USING gin ({column} gin_trgm_ops)'
+        )
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {table}_{column}_upper_trgm '
+            f'ON {table} USING gin ((UPPER({column}::text)) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, column in TRIGRAM_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {table}_{column}_trgm')
+        schema_editor.execute(f'DROP INDEX IF EXISTS {table}_{column}_upper_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0003_tombstone'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('teams', '0003_team_updated_at'),
+        ('tournaments', '0006_bracketnode'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -32,3 +32,15 @@ class Profile(models.Model):
 
     def __str__(self):
         return f'{self.user.username} Profile'
+
+
+class Tombstone(models.Model):
+    """Penanda baris yang sudah dihapus, supaya client sync delta (main.sync) ikut menghapusnya."""
+    model = models.CharField(max_length=50)
+    object_id = models.BigIntegerField()
+    # Pemilik baris untuk data pribadi (Prediction); None untuk data publik
+    owner_id = models.IntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f'{self.model}#{self.object_id} deleted at {self.deleted_at}'
@@ -0,0 +1,93 @@
+"""
+Keyset (cursor) pagination untuk list API.
+
+Cursor adalah token opaque berisi nilai sort key + pk dari baris terakhir di
+halaman sebelumnya. Halaman berikutnya diambil dengan WHERE (sort key, pk)
+setelah nilai itu, jadi tidak ada COUNT(*) dan tidak ada OFFSET scan.
+Mode ini opt-in: view memakai cursor hanya kalau parameter ?cursor= dikirim
+(boleh kosong untuk halaman pertama).
+"""
+import base64
+import datetime
+import json
+from functools import reduce
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def wants_cursor(request):
+    return 'cursor' in request.GET
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(ordering, values):
+    payload = json.dumps({'o': list(ordering), 'v': [_encode_value(v) for v in values]})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, ordering):
+    """Return nilai sort key dari token. Token dari urutan lain dianggap tidak valid."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload['v']
+        valid = payload['o'] == list(ordering) and len(values) == len(ordering)
+    except (ValueError, TypeError, KeyError):
+        valid = False
+    if not valid:
+        raise InvalidCursor('Cursor tidak valid.')
+    return values
+
+
+def keyset_filter(ordering, values):
+    """
+    Q untuk baris setelah values menurut ordering, misalnya untuk ('-start_date', 'pk'):
+    start_date < v0 OR (start_date = v0 AND pk > v1).
+    """
+    clauses = []
+    for index, field in enumerate(ordering):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        equal = {f.lstrip('-'): v for f, v in zip(ordering[:index], values[:index])}
+        clauses.append(Q(**equal, **{f'{name}__{lookup}': values[index]}))
+    return reduce(lambda a, b: a | b, clauses)
+
+
+def _value_of(obj, field):
+    value = obj
+    for part in field.lstrip('-').split('__'):
+        value = getattr(value, part)
+    return value
+
+
+def cursor_paginate(queryset, ordering, cursor, per_page):
+    """
+    Ambil satu halaman secara keyset. ordering harus diakhiri field unik (biasanya 'pk')
+    dan field-field sort tidak boleh NULL. Return (items, next_cursor), next_cursor None
+    kalau sudah halaman terakhir.
+    """
+    ordering = tuple(ordering)
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        values = decode_cursor(cursor, ordering)
+        # Bentuk token sudah dicek decode_cursor; tipe nilainya baru dicek field saat filter dibangun
+        try:
+            queryset = queryset.filter(keyset_filter(ordering, values))
+        except (ValueError, TypeError, ValidationError):
+            raise InvalidCursor('Cursor tidak valid.')
+
+    items = list(queryset[:per_page + 1])
+    if len(items) <= per_page:
+        return items, None
+    items = items[:per_page]
+    return items, encode_cursor(ordering, [_value_of(items[-1], field) for field in ordering])
@@ -0,0 +1,209 @@
+"""
+Profiling request: jumlah query SQL, waktu SQL, waktu total, dan ukuran respons.
+
+ProfilingMiddleware bersifat opt-in (setting PROFILING_ENABLED). Setiap request
+mendapat header Server-Timing, dan sampelnya disimpan di cache per URL name
+(maks. PROFILING_WINDOW sampel terakhir) untuk laporan p50/p95/p99.
+Penyimpanan berupa ring buffer: counter per endpoint dinaikkan dengan
+cache.incr (atomik) lalu sampel ditulis ke slot counter % window, jadi request
+yang bersamaan tidak saling menimpa dan tidak ada list besar yang di-pickle
+ulang setiap request. Respons streaming dicatat saat body selesai dikirim.
+Sampel disimpan di cache 'default', jadi laporan dari proses lain (misalnya
+management command profiling_report) hanya terlihat kalau CACHE_BACKEND
+adalah file atau redis.
+"""
+import math
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+PROFILING_CACHE_ALIAS = 'default'
+# Index endpoint juga ring tanpa read-modify-write: slot ke-n berisi satu nama endpoint
+ENDPOINT_COUNT_KEY = 'profiling:endpoints'
+ENDPOINT_KEY = 'profiling:endpoint:{}'
+COUNTER_KEY = 'profiling:counter:{}'
+SAMPLE_KEY = 'profiling:sample:{}:{}'
+UNRESOLVED = '<unresolved>'
+
+
+def get_cache():
+    return caches[PROFILING_CACHE_ALIAS]
+
+
+def profiling_window():
+    return getattr(settings, 'PROFILING_WINDOW', 500)
+
+
+class QueryRecorder:
+    """execute_wrapper yang menghitung jumlah dan durasi query."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+def endpoint_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return UNRESOLVED
+    return match.view_name
+
+
+def response_size(response):
+    if response.streaming:
+        return None
+    return len(response.content)
+
+
+def server_timing(sample):
+    return (
+        f'sql;dur={sample["sql_ms"]:.1f};desc="{sample["queries"]} queries", '
+        f'total;dur={sample["total_ms"]:.1f}'
+    )
+
+
+def _increment(cache, key):
+    cache.add(key, 0, timeout=None)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Key sempat hilang di antara add dan incr
+        cache.set(key, 1, timeout=None)
+        return 1
+
+
+def record_sample(endpoint, sample):
+    cache = get_cache()
+    counter_key = COUNTER_KEY.format(endpoint)
+    # add hanya berhasil sekali per endpoint, jadi endpoint didaftarkan sekali
+    if cache.add(counter_key, 0, timeout=None):
+        slot = _increment(cache, ENDPOINT_COUNT_KEY)
+        cache.set(ENDPOINT_KEY.format(slot), endpoint, timeout=None)
+    count = _increment(cache, counter_key)
+    cache.set(SAMPLE_KEY.format(endpoint, (count - 1) % profiling_window()), sample, timeout=None)
+
+
+def recorded_endpoints():
+    cache = get_cache()
+    count = cache.get(ENDPOINT_COUNT_KEY) or 0
+    names = cache.get_many([ENDPOINT_KEY.format(slot) for slot in range(1, count + 1)])
+    return sorted(set(names.values()))
+
+
+def endpoint_samples(endpoint):
+    cache = get_cache()
+    count = cache.get(COUNTER_KEY.format(endpoint)) or 0
+    slots = range(min(count, profiling_window()))
+    return list(cache.get_many([SAMPLE_KEY.format(endpoint, slot) for slot in slots]).values())
+
+
+def reset_samples():
+    cache = get_cache()
+    endpoints = recorded_endpoints()
+    count = cache.get(ENDPOINT_COUNT_KEY) or 0
+    keys = [ENDPOINT_COUNT_KEY] + [ENDPOINT_KEY.format(slot) for slot in range(1, count + 1)]
+    for endpoint in endpoints:
+        keys.append(COUNTER_KEY.format(endpoint))
+        keys += [SAMPLE_KEY.format(endpoint, slot) for slot in range(profiling_window())]
+    cache.delete_many(keys)
+
+
+def percentile(values, pct):
+    """Percentile nearest-rank dari list yang sudah diurutkan."""
+    if not values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(values)), 1)
+    return values[min(rank, len(values)) - 1]
+
+
+def summarize(endpoint, samples):
+    totals = sorted(sample['total_ms'] for sample in samples)
+    queries = [sample['queries'] for sample in samples]
+    sizes = [sample['size'] for sample in samples if sample['size'] is not None]
+    return {
+        'endpoint': endpoint,
+        'requests': len(samples),
+        'p50_ms': round(percentile(totals, 50), 1),
+        'p95_ms': round(percentile(totals, 95), 1),
+        'p99_ms': round(percentile(totals, 99), 1),
+        'avg_queries': round(sum(queries) / len(queries), 1),
+        'max_queries': max(queries),
+        'avg_sql_ms': round(sum(sample['sql_ms'] for sample in samples) / len(samples), 1),
+        'max_size': max(sizes) if sizes else None,
+    }
+
+
+def build_report(sort='p95_ms'):
+    """Ringkasan per URL name, diurutkan dari yang paling berat menurut kolom sort."""
+    rows = []
+    for endpoint in recorded_endpoints():
+        samples = endpoint_samples(endpoint)
+        if samples:
+            rows.append(summarize(endpoint, samples))
+    return sorted(rows, key=lambda row: row.get(sort) or 0, reverse=True)
+
+
+@contextmanager
+def recording(recorder):
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield
+
+
+class ProfilingMiddleware:
+    """Ukur setiap request kalau PROFILING_ENABLED aktif; kalau tidak, middleware ini dilewati."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with recording(recorder):
+            response = self.get_response(request)
+
+        if response.streaming:
+            # Header sudah terkirim sebelum body selesai, jadi tanpa Server-Timing
+            response.streaming_content = self.finish_stream(
+                response.streaming_content, endpoint_name(request), recorder, start
+            )
+            return response
+
+        sample = self.sample(recorder, start, response_size(response))
+        response['Server-Timing'] = server_timing(sample)
+        record_sample(endpoint_name(request), sample)
+        return response
+
+    def sample(self, recorder, start, size):
+        return {
+            'total_ms': (time.perf_counter() - start) * 1000,
+            'sql_ms': recorder.duration * 1000,
+            'queries': recorder.count,
+            'size': size,
+        }
+
+    def finish_stream(self, content, endpoint, recorder, start):
+        """Query dan waktu selama body dikirim ikut dihitung; dicatat juga kalau client putus."""
+        size = 0
+        try:
+            with recording(recorder):
+                for chunk in content:
+                    size += len(chunk)
+                    yield chunk
+        finally:
+            record_sample(endpoint, self.sample(recorder, start, size))
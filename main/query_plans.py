@@ -0,0 +1,90 @@
+"""
+Query plan untuk query panas di view, dipakai test EXPLAIN dan command explain_hot_queries.
+
+Setiap entri meniru filter dan urutan queryset di view aslinya dan mencatat
+indeks yang seharusnya dipakai (Meta.indexes di tournaments, forums, dan
+predictions, atau index otomatis ForeignKey). Di PostgreSQL seq scan dimatikan
+sementara (SET LOCAL) supaya dataset kecil tetap menunjukkan apakah indeks *bisa*
+dipakai planner.
+"""
+from dataclasses import dataclass
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from forums.models import Post, Thread
+from predictions.models import Prediction
+from tournaments.models import Match, Tournament
+
+
+@dataclass
+class HotQuery:
+    name: str
+    source: str
+    queryset: object
+    indexes: tuple
+
+
+def hot_queries(tournament_id, thread_id, post_id, user_id, now=None):
+    now = now or timezone.now()
+    today = now.date()
+    unplayed = Q(home_score__isnull=True) | Q(away_score__isnull=True)
+    return [
+        HotQuery('ongoing_tournaments', 'main.views.home_view / tournaments.views.get_tournaments_json',
+                 Tournament.objects.filter(start_date__lte=today, end_date__gte=today).order_by('-start_date'),
+                 ('tournament_dates_idx',)),
+        HotQuery('tournament_matches', 'tournaments.views.get_tournament_detail_json',
+                 Match.objects.filter(tournament_id=tournament_id).order_by('match_date'),
+                 ('match_tournament_date_idx',)),
+        HotQuery('ongoing_matches', 'predictions.views.get_ongoing_matches',
+                 Match.objects.filter(unplayed).order_by('match_date'),
+                 ('match_unplayed_date_idx',)),
+        HotQuery('finished_matches', 'predictions.views.get_finished_matches',
+                 Match.objects.filter(home_score__isnull=False, away_score__isnull=False).order_by('-match_date'),
+                 ('match_finished_date_idx',)),
+        HotQuery('upcoming_matches', 'main.views.home_view',
+                 Match.objects.filter(match_date__gte=now, home_score__isnull=True, away_score__isnull=True)
+                 .order_by('match_date'),
+                 ('match_unplayed_date_idx',)),
+        HotQuery('recent_threads', 'main.views.home_view',
+                 Thread.objects.order_by('-created_at'),
+                 ('thread_created_idx',)),
+        HotQuery('tournament_threads', 'forums.views (daftar thread, sort=newest)',
+                 Thread.objects.filter(tournament_id=tournament_id, is_deleted=False).order_by('-created_at'),
+                 ('thread_recent_idx',)),
+        HotQuery('thread_posts', 'forums.views.api_thread_posts',
+                 Post.objects.filter(thread_id=thread_id, is_deleted=False).order_by('created_at'),
+                 ('post_thread_created_idx',)),
+        HotQuery('post_replies', 'forums.views (jumlah balasan per post)',
+                 Post.objects.filter(parent_id=post_id, is_deleted=False),
+                 # Index otomatis ForeignKey (nama berakhiran hash)
+                 ('forums_post_parent_id',)),
+        HotQuery('user_predictions', 'main.views.profile_view / get_profile_json',
+                 Prediction.objects.filter(user_id=user_id).order_by('-created_at'),
+                 ('prediction_user_recent_idx',)),
+    ]
+
+
+def explain(queryset):
+    """Teks EXPLAIN queryset; di PostgreSQL seq scan dimatikan hanya untuk query ini."""
+    if connection.vendor != 'postgresql':
+        return queryset.explain()
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+
+def used_index(plan, indexes):
+    """Nama indeks yang diharapkan dan muncul di plan, atau None."""
+    return next((index for index in indexes if index in plan), None)
+
+
+def check_hot_queries(**params):
+    """List (HotQuery, plan, indeks yang dipakai atau None)."""
+    results = []
+    for query in hot_queries(**params):
+        plan = explain(query.queryset)
+        results.append((query, plan, used_index(plan, query.indexes)))
+    return results
@@ -0,0 +1,136 @@
+"""
+Routing baca ke read replica untuk endpoint JSON GET yang ramai.
+
+Replica adalah database alias 'replica' (DB_REPLICA_* di settings). Hanya view
+yang diberi decorator read_from_replica yang membaca dari replica, dan hanya
+untuk GET/HEAD. Semua write (dan session) tetap ke 'default'.
+
+Read-your-writes: setelah user login mengirim request yang mengubah data
+(POST/PUT/PATCH/DELETE), session-nya di-pin ke primary selama
+REPLICA_STICKY_SECONDS detik, jadi perubahannya langsung terlihat walaupun
+replica masih tertinggal. User anonim tidak di-pin, jadi bacaan mereka bisa
+tertinggal sebesar lag replica. Respons yang disimpan cache_json_response selalu
+dibangun dari primary (primary_reads), karena respons dari replica yang tertinggal
+akan tersimpan di bawah versi model yang baru dan bertahan sampai cache timeout.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_ALIAS = 'replica'
+PINNED_UNTIL_KEY = '_db_pinned_until'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+# Session baru (misalnya tepat setelah login) belum tentu sudah ada di replica
+PRIMARY_ONLY_APPS = {'sessions'}
+
+_use_replica = ContextVar('use_replica', default=False)
+_force_primary = ContextVar('force_primary', default=False)
+
+
+def _target(alias):
+    settings_dict = connections[alias].settings_dict
+    return tuple(settings_dict.get(key) for key in ('ENGINE', 'HOST', 'PORT', 'NAME'))
+
+
+def replica_configured():
+    # Saat test, replica adalah MIRROR dari database test default: tidak ada gunanya dirouting
+    return REPLICA_ALIAS in connections.settings and _target(REPLICA_ALIAS) != _target(DEFAULT_DB_ALIAS)
+
+
+@contextmanager
+def primary_reads():
+    """Di dalam blok ini read_from_replica tidak berlaku."""
+    token = _force_primary.set(True)
+    try:
+        yield
+    finally:
+        _force_primary.reset(token)
+
+
+def sticky_seconds():
+    return getattr(settings, 'REPLICA_STICKY_SECONDS', 5)
+
+
+def pin_to_primary(request, now=None):
+    request.session[PINNED_UNTIL_KEY] = (now or time.time()) + sticky_seconds()
+
+
+def is_pinned(request, now=None):
+    session = getattr(request, 'session', None)
+    pinned_until = session.get(PINNED_UNTIL_KEY) if session is not None else None
+    return pinned_until is not None and pinned_until > (now or time.time())
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and model._meta.app_label not in PRIMARY_ONLY_APPS and replica_configured():
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Eksplisit, karena tanpa router Django menulis ke database asal instance (bisa replica)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, REPLICA_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+def _stream_from_replica(content):
+    """Query StreamingHttpResponse baru jalan saat dikirim, setelah view selesai."""
+    iterator = iter(content)
+    while True:
+        token = _use_replica.set(True)
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _use_replica.reset(token)
+        yield chunk
+
+
+def read_from_replica(view):
+    """
+    Decorator untuk view JSON yang hanya membaca. GET/HEAD dibaca dari replica
+    kecuali session user sedang di-pin ke primary atau di dalam primary_reads().
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if (request.method not in ('GET', 'HEAD') or _force_primary.get()
+                or not replica_configured() or is_pinned(request)):
+            return view(request, *args, **kwargs)
+
+        token = _use_replica.set(True)
+        try:
+            response = view(request, *args, **kwargs)
+        finally:
+            _use_replica.reset(token)
+        if response.streaming:
+            response.streaming_content = _stream_from_replica(response.streaming_content)
+        return response
+    return wrapper
+
+
+class ReplicaPinningMiddleware:
+    """Pin session ke primary setelah write yang berhasil dari user login."""
+
+    def __init__(self, get_response):
+        if not replica_configured():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        user = getattr(request, 'user', None)
+        if (request.method not in SAFE_METHODS and response.status_code < 400
+                and user is not None and user.is_authenticated):
+            pin_to_primary(request)
+        return response
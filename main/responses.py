@@ -0,0 +1,103 @@
+"""
+Respons JSON untuk semua endpoint API.
+
+JsonResponse di sini adalah pengganti django.http.JsonResponse dengan
+argumen yang sama. Kalau package orjson terpasang, serialisasi memakai orjson
+(datetime, date, dan UUID diserialisasi langsung di C dalam satu pass). Kalau
+tidak, memakai encoder stdlib dengan DjangoJSONEncoder seperti sebelumnya.
+orjson opsional (tidak ada di requirements dasar). Perhatikan bahwa datetime
+dari orjson tetap mikrodetik, sedangkan DjangoJSONEncoder memotongnya ke
+milidetik, jadi payload API berbeda antara environment dengan dan tanpa orjson.
+StreamingJsonResponse mengirim array besar per potongan tanpa membangun seluruh
+body di memori. LocalTimeFormatter membaca timezone aktif sekali per request,
+bukan sekali per baris seperti timezone.localtime().
+"""
+import datetime
+import decimal
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse as DjangoJsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.duration import duration_iso_string
+from django.utils.functional import Promise
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson opsional
+    orjson = None
+
+STREAM_CHUNK_SIZE = 500
+
+
+def _orjson_default(value):
+    """Tipe yang tidak dikenal orjson, disamakan dengan DjangoJSONEncoder."""
+    if isinstance(value, (decimal.Decimal, Promise)):
+        return str(value)
+    if isinstance(value, datetime.timedelta):
+        return duration_iso_string(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dumps(data):
+    """Serialisasi ke bytes UTF-8 dengan encoder tercepat yang tersedia."""
+    if orjson is not None:
+        return orjson.dumps(data, default=_orjson_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+
+class JsonResponse(DjangoJsonResponse):
+    """Drop-in untuk django.http.JsonResponse; encoder/json_dumps_params hanya dipakai tanpa orjson."""
+
+    def __init__(self, data, encoder=DjangoJSONEncoder, safe=True, json_dumps_params=None, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError(
+                'In order to allow non-dict objects to be serialized set the safe parameter to False.'
+            )
+        kwargs.setdefault('content_type', 'application/json')
+        if orjson is not None and encoder is DjangoJSONEncoder and not json_dumps_params:
+            content = dumps(data)
+        else:
+            content = json.dumps(data, cls=encoder, **(json_dumps_params or {}))
+        HttpResponse.__init__(self, content=content, **kwargs)
+
+
+class StreamingJsonResponse(StreamingHttpResponse):
+    """
+    Stream array JSON dari iterable (misalnya queryset.iterator()). Kalau key diisi,
+    hasilnya {"key": [...]} dan extra ikut sebagai field lain di objek yang sama.
+    """
+
+    def __init__(self, items, key=None, extra=None, chunk_size=STREAM_CHUNK_SIZE, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(self._chunks(items, key, extra or {}, chunk_size), **kwargs)
+
+    @staticmethod
+    def _chunks(items, key, extra, chunk_size):
+        if key is not None:
+            head = dumps(extra)[:-1]
+            yield head + (b',' if extra else b'') + dumps(key) + b':['
+        else:
+            yield b'['
+        batch, first = [], True
+        for item in items:
+            batch.append(dumps(item))
+            if len(batch) >= chunk_size:
+                yield (b'' if first else b',') + b','.join(batch)
+                batch, first = [], False
+        if batch:
+            yield (b'' if first else b',') + b','.join(batch)
+        yield b']}' if key is not None else b']'
+
+
+class LocalTimeFormatter:
+    """Format datetime di timezone aktif; timezone diambil sekali saat formatter dibuat."""
+
+    def __init__(self):
+        self.tz = timezone.get_current_timezone()
+
+    def local(self, value):
+        return value.astimezone(self.tz)
+
+    def __call__(self, value, fmt):
+        return value.astimezone(self.tz).strftime(fmt)
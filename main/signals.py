@@ -1,6 +1,9 @@
-from django.db.models.signals import post_save
+from django.apps import apps
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.contrib.auth.models import User
 from django.dispatch import receiver
+from .cache import bump_model_version
+from . import autocomplete, home, sync
 from .models import Profile
 
 
@@ -32,3 +35,97 @@ def create_profile_for_new_user(sender, instance, created, **kwargs):
                 del instance._registration_role
             except AttributeError:
                 pass
+
+
+# Invalidasi cache respons JSON publik (lihat main.cache)
+CACHED_MODELS = (
+    'tournaments.Tournament',
+    'tournaments.Match',
+    'tournaments.BracketNode',
+    'teams.Team',
+    'forums.Thread',
+    'forums.Post',
+    'predictions.Prediction',
+)
+
+
+def invalidate_response_cache(sender, **kwargs):
+    bump_model_version(sender._meta.label)
+
+
+def invalidate_response_cache_m2m(sender, instance, action, model, **kwargs):
+    if action.startswith('post_'):
+        bump_model_version(instance._meta.label)
+        bump_model_version(model._meta.label)
+
+
+def connect_cache_invalidation():
+    for label in CACHED_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(invalidate_response_cache, sender=model,
+                          dispatch_uid=f'response-cache-save-{label}')
+        post_delete.connect(invalidate_response_cache, sender=model,
+                            dispatch_uid=f'response-cache-delete-{label}')
+        for field in model._meta.local_many_to_many:
+            m2m_changed.connect(invalidate_response_cache_m2m, sender=field.remote_field.through,
+                                dispatch_uid=f'response-cache-m2m-{label}-{field.name}')
+
+
+# Sync delta Flutter (lihat main.sync): tombstone untuk delete, updated_at untuk perubahan M2M
+SYNC_M2M_FIELDS = (
+    # (model pemilik, field M2M yang ikut dikirim di payload model itu)
+    ('tournaments.Tournament', 'participants'),
+    ('teams.Team', 'members'),
+)
+
+
+def touch_after_m2m_change(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        sync.touch_updated_at(type(instance), [instance.pk])
+        return
+    # Sisi reverse (mis. team.tournaments.add): instance adalah model lawan, pemiliknya di pk_set
+    if action == 'pre_clear':
+        source = next(f for f in sender._meta.fields if f.related_model is type(instance))
+        target = next(f for f in sender._meta.fields if f.related_model is model)
+        pk_set = sender.objects.filter(**{source.attname: instance.pk}).values_list(target.attname, flat=True)
+    sync.touch_updated_at(model, list(pk_set or []))
+
+
+def connect_sync_tracking():
+    for label in sync.SYNC_MODELS.values():
+        post_delete.connect(sync.record_tombstone, sender=apps.get_model(label),
+                            dispatch_uid=f'sync-tombstone-{label}')
+    for label, field_name in SYNC_M2M_FIELDS:
+        through = apps.get_model(label)._meta.get_field(field_name).remote_field.through
+        m2m_changed.connect(touch_after_m2m_change, sender=through,
+                            dispatch_uid=f'sync-m2m-{label}-{field_name}')
+
+
+# Indeks autocomplete di memori (lihat main.autocomplete)
+def connect_autocomplete_invalidation():
+    for source, (label, _) in autocomplete.AUTOCOMPLETE_SOURCES.items():
+        model = apps.get_model(label)
+        post_save.connect(autocomplete.invalidate_on_save, sender=model,
+                          dispatch_uid=f'autocomplete-save-{source}')
+        post_delete.connect(autocomplete.invalidate_on_delete, sender=model,
+                            dispatch_uid=f'autocomplete-delete-{source}')
+
+
+# Snapshot halaman home (lihat main.home)
+HOME_SNAPSHOT_MODELS = (
+    'tournaments.Tournament',
+    'tournaments.Match',
+    'teams.Team',
+    'forums.Thread',
+)
+
+
+def connect_home_snapshot_invalidation():
+    for label in HOME_SNAPSHOT_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(home.invalidate_home_snapshot, sender=model,
+                          dispatch_uid=f'home-snapshot-save-{label}')
+        post_delete.connect(home.invalidate_home_snapshot, sender=model,
+                            dispatch_uid=f'home-snapshot-delete-{label}')
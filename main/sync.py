@@ -0,0 +1,186 @@
+"""
+Sync delta untuk client Flutter.
+
+Client menyimpan token dari respons terakhir dan mengirimnya lagi sebagai
+?since=<token>. Respons hanya berisi Tournament, Match, Team, dan Prediction
+(milik user sendiri) yang updated_at-nya setelah token, plus id baris yang
+sudah dihapus (Tombstone). Token adalah waktu server saat respons dibuat
+(mikrodetik sejak epoch). Query mundur SYNC_OVERLAP_SECONDS dari token supaya
+transaksi yang commit belakangan tidak terlewat, jadi client harus
+memperlakukan setiap baris sebagai upsert.
+
+Tanpa since, atau kalau token lebih tua dari masa simpan tombstone
+(SYNC_TOMBSTONE_DAYS), respons berisi snapshot penuh dengan reset=True.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Prefetch, Q
+from django.utils import timezone
+
+from .models import Tombstone
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+# key payload -> label model
+SYNC_MODELS = {
+    'tournaments': 'tournaments.Tournament',
+    'matches': 'tournaments.Match',
+    'teams': 'teams.Team',
+    'predictions': 'predictions.Prediction',
+}
+# Model yang barisnya hanya dikirim ke pemiliknya
+PRIVATE_MODELS = {'predictions.Prediction': 'user_id'}
+
+
+class InvalidSyncToken(ValueError):
+    pass
+
+
+def overlap():
+    return timedelta(seconds=getattr(settings, 'SYNC_OVERLAP_SECONDS', 5))
+
+
+def tombstone_retention():
+    return timedelta(days=getattr(settings, 'SYNC_TOMBSTONE_DAYS', 30))
+
+
+def encode_token(moment):
+    return str((moment - EPOCH) // timedelta(microseconds=1))
+
+
+def decode_token(token):
+    try:
+        return EPOCH + timedelta(microseconds=int(token))
+    except (ValueError, OverflowError):
+        raise InvalidSyncToken('Token sync tidak valid.')
+
+
+# --- Serializer ringkas per model ---
+
+def tournament_rows(queryset):
+    Team = apps.get_model('teams', 'Team')
+    queryset = queryset.select_related('organizer').prefetch_related(
+        Prefetch('participants', queryset=Team.objects.only('id'))
+    )
+    return [{
+        'id': tournament.id,
+        'name': tournament.name,
+        'description': tournament.description,
+        'banner': tournament.banner,
+        'organizer': tournament.organizer.username,
+        'start_date': tournament.start_date.isoformat(),
+        'end_date': tournament.end_date.isoformat(),
+        'registration_open': tournament.registration_open,
+        'winner_id': tournament.winner_id,
+        'participant_ids': [team.id for team in tournament.participants.all()],
+    } for tournament in queryset]
+
+
+def match_rows(queryset):
+    return [{
+        'id': match['id'],
+        'tournament_id': match['tournament_id'],
+        'home_team_id': match['home_team_id'],
+        'away_team_id': match['away_team_id'],
+        'match_date': match['match_date'].isoformat(),
+        'home_score': match['home_score'],
+        'away_score': match['away_score'],
+    } for match in queryset.values(
+        'id', 'tournament_id', 'home_team_id', 'away_team_id', 'match_date', 'home_score', 'away_score'
+    )]
+
+
+def team_rows(queryset):
+    User = apps.get_model('auth', 'User')
+    queryset = queryset.select_related('captain').prefetch_related(
+        Prefetch('members', queryset=User.objects.only('id', 'username'))
+    )
+    return [{
+        'id': team.id,
+        'name': team.name,
+        'logo': team.logo or "",
+        'captain': team.captain.username if team.captain else None,
+        'members': [member.username for member in team.members.all()],
+    } for team in queryset]
+
+
+def prediction_rows(queryset):
+    return list(queryset.values('id', 'match_id', 'predicted_winner_id', 'points_awarded'))
+
+
+SERIALIZERS = {
+    'tournaments': tournament_rows,
+    'matches': match_rows,
+    'teams': team_rows,
+    'predictions': prediction_rows,
+}
+
+
+def visible_rows(label, user):
+    queryset = apps.get_model(label).objects.all()
+    owner_field = PRIVATE_MODELS.get(label)
+    if owner_field:
+        if not user.is_authenticated:
+            return queryset.none()
+        queryset = queryset.filter(**{owner_field: user.pk})
+    return queryset
+
+
+def deleted_ids(changed_after, user):
+    tombstones = Tombstone.objects.filter(deleted_at__gt=changed_after)
+    visible = Q(owner_id__isnull=True)
+    if user.is_authenticated:
+        visible |= Q(owner_id=user.pk)
+    keys = {label: key for key, label in SYNC_MODELS.items()}
+    deleted = {key: [] for key in SYNC_MODELS}
+    for label, object_id in tombstones.filter(visible).order_by('pk').values_list('model', 'object_id'):
+        if label in keys:
+            deleted[keys[label]].append(object_id)
+    return deleted
+
+
+def build_sync_payload(user, since_token=None):
+    """Payload sync untuk user; since_token None berarti snapshot penuh."""
+    now = timezone.now()
+    since = decode_token(since_token) if since_token else None
+    reset = since is None or since < now - tombstone_retention()
+    changed_after = None if reset else since - overlap()
+
+    changes = {}
+    for key, label in SYNC_MODELS.items():
+        queryset = visible_rows(label, user)
+        if not reset:
+            queryset = queryset.filter(updated_at__gt=changed_after)
+        changes[key] = SERIALIZERS[key](queryset.order_by('pk'))
+
+    return {
+        'token': encode_token(now),
+        'reset': reset,
+        'changes': changes,
+        'deleted': {key: [] for key in SYNC_MODELS} if reset else deleted_ids(changed_after, user),
+    }
+
+
+# --- Pencatatan perubahan (dihubungkan di main.signals) ---
+
+def record_tombstone(sender, instance, **kwargs):
+    owner_field = PRIVATE_MODELS.get(sender._meta.label)
+    Tombstone.objects.create(
+        model=sender._meta.label,
+        object_id=instance.pk,
+        owner_id=getattr(instance, owner_field) if owner_field else None,
+    )
+
+
+def touch_updated_at(model, ids):
+    """Naikkan updated_at tanpa save(), misalnya saat relasi M2M berubah."""
+    if ids:
+        model.objects.filter(pk__in=ids).update(updated_at=timezone.now())
+
+
+def prune_tombstones():
+    """Hapus tombstone yang lebih tua dari masa simpan. Return jumlah yang dihapus."""
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=timezone.now() - tombstone_retention()).delete()
+    return deleted
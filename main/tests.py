@@ -1,7 +1,24 @@
-from django.test import TestCase, Client
+import datetime
+import json
+import shutil
+import tempfile
+import threading
+from decimal import Decimal
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from django.test import TestCase, TransactionTestCase, Client, override_settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
 from django.urls import reverse, resolve
 from django.contrib.auth.models import User
 from .models import Profile
+from .pagination import decode_cursor, encode_cursor
+from .profiling import build_report, percentile
+from . import autocomplete, home, profiling, query_plans, replicas, responses, sync
 from .forms import (
     UserRegisterForm, CustomLoginForm, UserUpdateForm,
     ProfileUpdateForm, CustomPasswordChangeForm
@@ -11,7 +28,8 @@ from .views import (
     edit_my_profile_view, edit_user_profile_view, CustomPasswordChangeView
 )
 from teams.models import Team
-from predictions.models import Prediction
+from forums.models import Post, Thread
+from predictions.models import Prediction, UserPoints
 # Asumsi nama model Match di tournaments
 from tournaments.models import Tournament, Match
 
@@ -608,3 +626,556 @@ class MainViewTests(BaseTestCase):
 # coverage run manage.py test main
 # coverage report -m
 # coverage html # (Untuk lihat report detail di browser)
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(username='organizer', password='pass')
+        self.team = Team.objects.create(name='Alpha', captain=self.organizer)
+        self.tournament = Tournament.objects.create(
+            name='Cache Cup',
+            organizer=self.organizer,
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + datetime.timedelta(days=3)
+        )
+        self.url = reverse('tournaments:get_tournaments_json')
+
+    def test_anonymous_get_is_served_from_cache(self):
+        first = self.client.get(self.url, {'status': 'ongoing', 'search': ''})
+        second = self.client.get(self.url, {'search': '', 'status': 'ongoing'})
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.json(), second.json())
+
+    def test_write_invalidates_cached_response(self):
+        self.client.get(self.url)
+        self.tournament.name = 'Renamed Cup'
+        self.tournament.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['tournaments'][0]['name'], 'Renamed Cup')
+
+    def test_m2m_change_invalidates_cached_response(self):
+        url = reverse('tournaments:get_tournament_detail_json', args=[self.tournament.pk])
+        self.assertEqual(self.client.get(url).json()['participants'], [])
+        self.tournament.participants.add(self.team)
+        self.assertEqual(len(self.client.get(url).json()['participants']), 1)
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.client.login(username='organizer', password='pass')
+        self.client.get(self.url)
+        self.assertFalse(self.client.get(self.url).has_header('X-Cache'))
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username='organizer', password='pass')
+        today = timezone.now().date()
+        # Beberapa turnamen punya start_date sama supaya tie-breaker pk teruji
+        for i in range(12):
+            Tournament.objects.create(
+                name=f'Cup {i:02d}',
+                organizer=self.organizer,
+                start_date=today - datetime.timedelta(days=i // 3),
+                end_date=today + datetime.timedelta(days=10)
+            )
+        self.url = reverse('tournaments:get_tournaments_json')
+
+    def test_cursor_walk_matches_ordering_without_count(self):
+        expected = list(Tournament.objects.order_by('-start_date', 'name', 'pk').values_list('name', flat=True))
+        seen, cursor = [], ''
+        while True:
+            with CaptureQueriesContext(connection) as queries:
+                data = self.client.get(self.url, {'cursor': cursor}).json()
+            self.assertFalse(any('COUNT(' in q['sql'] for q in queries.captured_queries))
+            seen += [t['name'] for t in data['tournaments']]
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(seen, expected)
+
+    def test_page_mode_still_available(self):
+        data = self.client.get(self.url, {'page': 2}).json()
+        self.assertEqual((data['current_page'], data['total_pages']), (2, 2))
+        self.assertNotIn('next_cursor', data)
+
+    def test_invalid_or_foreign_cursor_is_rejected(self):
+        self.assertEqual(self.client.get(self.url, {'cursor': 'not-a-cursor'}).status_code, 400)
+        foreign = encode_cursor(('name', 'pk'), ['Cup 01', 1])
+        self.assertEqual(self.client.get(self.url, {'cursor': foreign}).status_code, 400)
+
+    def test_cursor_with_wrong_value_types_is_rejected(self):
+        ordering = ('-start_date', 'name', 'pk')
+        for values in (['2026-01-01', 'Cup 01', 'notanint'], ['not-a-date', 'Cup 01', 1],
+                       ['2026-01-01', 'Cup 01', {'pk': 1}]):
+            response = self.client.get(self.url, {'cursor': encode_cursor(ordering, values)})
+            self.assertEqual(response.status_code, 400, values)
+        teams_url = reverse('teams:search_teams')
+        response = self.client.get(teams_url, {'cursor': encode_cursor(('name', 'pk'), ['x', 'notanint'])})
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_round_trips_datetimes_exactly(self):
+        moment = timezone.now().replace(microsecond=123456)
+        ordering = ('-created_at', '-pk')
+        self.assertEqual(decode_cursor(encode_cursor(ordering, [moment, 5]), ordering), [moment.isoformat(), 5])
+
+
+@override_settings(PROFILING_ENABLED=True)
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(username='admin', password='pass')
+        self.url = reverse('tournaments:get_tournaments_json')
+
+    def test_server_timing_header_and_report(self):
+        response = self.client.get(self.url)
+        self.assertRegex(response['Server-Timing'], r'^sql;dur=[\d.]+;desc="\d+ queries", total;dur=[\d.]+$')
+        self.client.get(self.url)
+
+        row = next(r for r in build_report() if r['endpoint'] == 'tournaments:get_tournaments_json')
+        self.assertEqual(row['requests'], 2)
+        self.assertGreaterEqual(row['max_queries'], 1)
+        self.assertEqual(row['max_size'], len(response.content))
+
+    def test_report_view_is_superuser_only(self):
+        report_url = reverse('main:profiling_report_json')
+        self.assertEqual(self.client.get(report_url).status_code, 302)
+        self.client.login(username='admin', password='pass')
+        self.client.get(self.url)
+        endpoints = [r['endpoint'] for r in self.client.get(report_url).json()['endpoints']]
+        self.assertIn('tournaments:get_tournaments_json', endpoints)
+
+    def test_command_prints_and_resets(self):
+        self.client.get(self.url)
+        out = StringIO()
+        call_command('profiling_report', '--reset', stdout=out)
+        self.assertIn('tournaments:get_tournaments_json', out.getvalue())
+        self.assertEqual(build_report(), [])
+
+    def test_concurrent_samples_are_not_lost(self):
+        def record(worker):
+            for i in range(25):
+                profiling.record_sample(f'endpoint-{worker % 4}', {
+                    'total_ms': float(i), 'sql_ms': 0.0, 'queries': 1, 'size': 10,
+                })
+
+        threads = [threading.Thread(target=record, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        rows = build_report()
+        self.assertEqual(sorted(row['endpoint'] for row in rows), [f'endpoint-{n}' for n in range(4)])
+        self.assertEqual([row['requests'] for row in rows], [50] * 4)
+
+    @override_settings(PROFILING_WINDOW=3)
+    def test_window_keeps_latest_samples(self):
+        for i in range(5):
+            profiling.record_sample('windowed', {'total_ms': float(i), 'sql_ms': 0.0, 'queries': 0, 'size': None})
+        row = build_report()[0]
+        self.assertEqual((row['requests'], row['p50_ms'], row['p99_ms']), (3, 3.0, 4.0))
+
+    def test_streaming_response_is_recorded_when_body_finishes(self):
+        url = reverse('predictions:get_leaderboard_json')
+        response = self.client.get(url)
+        self.assertEqual(build_report(), [])
+
+        body = b''.join(response.streaming_content)
+        row = next(r for r in build_report() if r['endpoint'] == 'predictions:get_leaderboard_json')
+        self.assertEqual((row['requests'], row['max_size']), (1, len(body)))
+        self.assertGreaterEqual(row['max_queries'], 1)
+
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual((percentile(values, 50), percentile(values, 95), percentile(values, 99)), (50, 95, 99))
+        self.assertEqual(percentile([7], 99), 7)
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_disabled_by_default(self):
+        self.assertFalse(self.client.get(self.url).has_header('Server-Timing'))
+
+
+@override_settings(SYNC_OVERLAP_SECONDS=0)
+class SyncEndpointTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='syncer', password='pass')
+        self.other = User.objects.create_user(username='other', password='pass')
+        self.home = Team.objects.create(name='Home', captain=self.user)
+        self.away = Team.objects.create(name='Away')
+        self.tournament = Tournament.objects.create(
+            name='Sync Cup',
+            organizer=self.user,
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + datetime.timedelta(days=3)
+        )
+        self.match = Match.objects.create(
+            tournament=self.tournament, home_team=self.home, away_team=self.away,
+            match_date=timezone.now() + datetime.timedelta(days=1)
+        )
+        self.url = reverse('main:sync_json')
+        self.client.login(username='syncer', password='pass')
+
+    def sync(self, token=None):
+        return self.client.get(self.url, {'since': token} if token else {}).json()
+
+    def ids(self, payload, key):
+        return [row['id'] for row in payload['changes'][key]]
+
+    def test_full_snapshot_then_only_changes(self):
+        full = self.sync()
+        self.assertTrue(full['reset'])
+        self.assertEqual(self.ids(full, 'teams'), [self.home.pk, self.away.pk])
+
+        delta = self.sync(full['token'])
+        self.assertFalse(delta['reset'])
+        self.assertEqual(delta['changes'], {'tournaments': [], 'matches': [], 'teams': [], 'predictions': []})
+
+        self.match.home_score = 1
+        self.match.save()
+        self.tournament.participants.add(self.home)
+        delta = self.sync(delta['token'])
+        self.assertEqual(self.ids(delta, 'matches'), [self.match.pk])
+        self.assertEqual(delta['changes']['tournaments'][0]['participant_ids'], [self.home.pk])
+        self.assertEqual(self.ids(delta, 'teams'), [])
+
+    def test_deletes_become_tombstones_and_predictions_stay_private(self):
+        mine = Prediction.objects.create(user=self.user, match=self.match, predicted_winner=self.home)
+        theirs = Prediction.objects.create(user=self.other, match=self.match, predicted_winner=self.away)
+        token = self.sync()['token']
+        expected = {'predictions': [mine.pk], 'teams': [self.away.pk], 'matches': [self.match.pk]}
+
+        mine.delete()
+        theirs.delete()
+        self.away.delete()  # ikut menghapus match lewat cascade
+        deleted = self.sync(token)['deleted']
+        self.assertEqual({key: deleted[key] for key in expected}, expected)
+
+    def test_settled_predictions_are_resent(self):
+        Prediction.objects.create(user=self.user, match=self.match, predicted_winner=self.home)
+        token = self.sync()['token']
+        self.match.home_score, self.match.away_score = 2, 0
+        self.match.save()
+        row = self.sync(token)['changes']['predictions'][0]
+        self.assertEqual(row['points_awarded'], 10)
+
+    def test_invalid_or_expired_token(self):
+        self.assertEqual(self.client.get(self.url, {'since': 'yesterday'}).status_code, 400)
+        old = sync.encode_token(timezone.now() - datetime.timedelta(days=365))
+        self.assertTrue(self.sync(old)['reset'])
+
+
+class JsonResponseHelperTests(TestCase):
+    def test_matches_django_output_for_plain_payloads(self):
+        from django.http import JsonResponse as DjangoJsonResponse
+        data = {'teams': [{'id': 1, 'name': 'Garuda ✓', 'logo': None, 'score': 1.5, 'open': True}], 'count': 1}
+        fast = responses.JsonResponse(data)
+        self.assertEqual(fast['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(fast.content), json.loads(DjangoJsonResponse(data).content))
+
+    def test_serializes_django_types(self):
+        moment = timezone.make_aware(datetime.datetime(2026, 3, 1, 15, 30), datetime.timezone.utc)
+        content = json.loads(responses.JsonResponse({
+            'at': moment, 'day': moment.date(), 'price': Decimal('1.50'), 'label': gettext_lazy('Halo'),
+        }).content)
+        self.assertEqual(content, {'at': '2026-03-01T15:30:00Z', 'day': '2026-03-01', 'price': '1.50', 'label': 'Halo'})
+
+    def test_safe_flag_like_django(self):
+        with self.assertRaises(TypeError):
+            responses.JsonResponse([1, 2])
+        self.assertEqual(json.loads(responses.JsonResponse([1, 2], safe=False).content), [1, 2])
+
+    def test_streaming_array(self):
+        for count in (0, 1, responses.STREAM_CHUNK_SIZE * 2 + 3):
+            items = ({'id': i} for i in range(count))
+            response = responses.StreamingJsonResponse(items, key='rows', extra={'status': 'success'})
+            body = json.loads(b''.join(response.streaming_content))
+            self.assertEqual(body['status'], 'success')
+            self.assertEqual([row['id'] for row in body['rows']], list(range(count)))
+        bare = responses.StreamingJsonResponse(iter([1, 2]))
+        self.assertEqual(json.loads(b''.join(bare.streaming_content)), [1, 2])
+
+    def test_benchmark_command_runs(self):
+        out = StringIO()
+        call_command('benchmark_json', '--rows', '20', '--repeat', '2', stdout=out)
+        self.assertIn('serialize response', out.getvalue())
+
+
+class AutocompleteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='garuda_fan', password='pass')
+        User.objects.create_user(username='budi', password='pass')
+        self.team = Team.objects.create(name='Garuda Muda')
+        Team.objects.create(name='Elang Emas')
+        self.tournament = Tournament.objects.create(
+            name='Piala Garuda', organizer=self.user,
+            start_date=timezone.now().date(), end_date=timezone.now().date() + datetime.timedelta(days=3)
+        )
+        self.url = reverse('main:autocomplete_json')
+
+    def test_ngram_index_ranks_exact_prefix_substring_then_fuzzy(self):
+        index = autocomplete.NGramIndex([(1, 'garuda'), (2, 'garudaku'), (3, 'piala garuda'), (4, 'garuds'), (5, 'elang')])
+        self.assertEqual([row[0] for row in index.search('garuda')], [1, 2, 3, 4])
+        self.assertEqual([row[0] for row in index.search('ga')], [1, 4, 2])
+        self.assertEqual([row[0] for row in index.search('garuds', limit=1)], [4])
+        self.assertEqual(index.search('zzz'), [])
+
+    def test_endpoint_searches_all_types_with_filter(self):
+        data = self.client.get(self.url, {'q': 'garuda'}).json()['data']
+        self.assertEqual(
+            {(row['type'], row['id']) for row in data},
+            {('users', self.user.pk), ('teams', self.team.pk), ('tournaments', self.tournament.pk)},
+        )
+        self.assertEqual(data[0]['label'], 'Garuda Muda')
+
+        data = self.client.get(self.url, {'q': 'garu', 'type': 'teams'}).json()['data']
+        self.assertEqual([row['id'] for row in data], [self.team.pk])
+        self.assertEqual(self.client.get(self.url, {'q': 'x', 'type': 'players'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url).json()['data'], [])
+
+    def test_index_rebuilds_only_when_indexed_field_changes(self):
+        autocomplete.get_index('users')
+        version = autocomplete.source_version('users')
+
+        self.user.last_login = timezone.now()
+        self.user.save(update_fields=['last_login'])
+        self.assertEqual(autocomplete.source_version('users'), version)
+
+        User.objects.create_user(username='garuda_baru', password='pass')
+        self.assertNotEqual(autocomplete.source_version('users'), version)
+        labels = [row['label'] for row in self.client.get(self.url, {'q': 'garuda_b', 'type': 'users'}).json()['data']]
+        self.assertEqual(labels[0], 'garuda_baru')
+
+
+class QueryPlanTests(TestCase):
+    """EXPLAIN query panas di dataset kecil: setiap query harus memakai indeksnya."""
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.user = User.objects.create_user(username='planner', password='pass')
+        teams = [Team.objects.create(name=f'Plan Team {i}') for i in range(4)]
+        cls.tournaments = [
+            Tournament.objects.create(
+                name=f'Plan Cup {i}', organizer=cls.user,
+                start_date=(now - datetime.timedelta(days=30 - i * 10)).date(),
+                end_date=(now + datetime.timedelta(days=i * 10)).date(),
+            ) for i in range(3)
+        ]
+        matches = []
+        for tournament in cls.tournaments:
+            for day in range(-10, 10):
+                finished = day < 0
+                matches.append(Match.objects.create(
+                    tournament=tournament, home_team=teams[day % 4], away_team=teams[(day + 1) % 4],
+                    match_date=now + datetime.timedelta(days=day),
+                    home_score=1 if finished else None, away_score=0 if finished else None,
+                ))
+        for match in matches[::3]:
+            Prediction.objects.create(user=cls.user, match=match, predicted_winner=match.home_team)
+        cls.thread = Thread.objects.create(tournament=cls.tournaments[0], title='Plan', author=cls.user)
+        cls.root = Post.objects.create(thread=cls.thread, author=cls.user, body='root')
+        for i in range(5):
+            Post.objects.create(thread=cls.thread, author=cls.user, body=f'reply {i}', parent=cls.root)
+
+    def test_hot_queries_use_their_indexes(self):
+        results = query_plans.check_hot_queries(
+            tournament_id=self.tournaments[0].pk, thread_id=self.thread.pk,
+            post_id=self.root.pk, user_id=self.user.pk,
+        )
+        self.assertEqual(len(results), 10)
+        for query, plan, index in results:
+            with self.subTest(query=query.name):
+                self.assertIsNotNone(index, f'{query.name} ({query.source}) tidak memakai indeks:\n{plan}')
+
+    def test_explain_hot_queries_command(self):
+        out = StringIO()
+        call_command('explain_hot_queries', stdout=out)
+        self.assertIn('All 10 hot queries use an index.', out.getvalue())
+
+
+class HomeSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        self.user = User.objects.create_user(username='homie', password='pass')
+        self.home_team = Team.objects.create(name='Home Snap')
+        self.away_team = Team.objects.create(name='Away Snap')
+        self.home_team.members.add(self.user)
+        self.tournament = Tournament.objects.create(
+            name='Snapshot Cup', organizer=self.user,
+            start_date=now.date() - datetime.timedelta(days=1), end_date=now.date() + datetime.timedelta(days=5)
+        )
+        self.match = Match.objects.create(
+            tournament=self.tournament, home_team=self.home_team, away_team=self.away_team,
+            match_date=now + datetime.timedelta(hours=3)
+        )
+        Thread.objects.create(tournament=self.tournament, title='Snapshot thread', author=self.user)
+
+    def test_anonymous_home_is_served_from_snapshot(self):
+        first = self.client.get(reverse('main:home'))
+        self.assertContains(first, 'Snapshot Cup')
+        self.assertContains(first, 'Home Snap')
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('main:home'))
+        self.assertContains(response, 'Snapshot thread')
+
+    def test_logged_in_only_user_part_is_live(self):
+        home.refresh_home_snapshot()
+        self.client.login(username='homie', password='pass')
+        self.client.get(reverse('main:show_home_json'))
+
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(reverse('main:show_home_json')).json()
+        tables = ' '.join(query['sql'] for query in queries.captured_queries)
+        self.assertNotIn('forums_thread', tables)
+        self.assertNotIn('tournaments_match', tables)
+        self.assertEqual(data['user_data']['teams'][0]['name'], 'Home Snap')
+        self.assertEqual(data['ongoing_tournaments'][0]['name'], 'Snapshot Cup')
+        self.assertEqual(data['stats']['threads_count'], 1)
+
+    def test_writes_and_time_refresh_the_snapshot(self):
+        snapshot = home.get_home_snapshot()
+        self.assertEqual([m['id'] for m in snapshot['upcoming_matches']], [self.match.pk])
+
+        Tournament.objects.create(
+            name='Fresh Cup', organizer=self.user,
+            start_date=timezone.now().date(), end_date=timezone.now().date() + datetime.timedelta(days=1)
+        )
+        self.assertIn('Fresh Cup', [t['name'] for t in home.get_home_snapshot()['ongoing_tournaments']])
+
+        # Laga yang sudah dimulai dibuang tanpa rebuild
+        later = timezone.now() + datetime.timedelta(hours=4)
+        self.assertEqual(home.get_home_snapshot(now=later)['upcoming_matches'], [])
+
+    def test_refresh_home_snapshot_command(self):
+        out = StringIO()
+        call_command('refresh_home_snapshot', stdout=out)
+        self.assertIn('Home snapshot rebuilt', out.getvalue())
+        self.assertIsNotNone(cache.get(home.HOME_SNAPSHOT_KEY))
+
+
+class ConnectionBenchmarkTests(TransactionTestCase):
+    def test_benchmark_reports_scenarios_and_restores_settings(self):
+        User.objects.create_user(username='alpha', password='pass')
+        configured = connection.settings_dict
+        out = StringIO()
+        call_command('benchmark_db_connections', requests=5, connect_delay=1, stdout=out)
+
+        output = out.getvalue()
+        self.assertIn('fresh ', output)
+        self.assertIn('persistent ', output)
+        self.assertIn('pooled: skipped', output)
+        self.assertIs(connection.settings_dict, configured)
+        self.assertNotIn('connect', connections['default'].__dict__)
+
+
+class ConnectionBenchmarkTransactionTests(TestCase):
+    def test_refuses_to_run_inside_a_transaction(self):
+        with self.assertRaises(CommandError):
+            call_command('benchmark_db_connections', requests=1, stdout=StringIO())
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=0, REPLICA_STICKY_SECONDS=30)
+class ReadReplicaTests(TransactionTestCase):
+    """Replica disimulasikan dengan file SQLite kedua yang datanya sengaja berbeda dari primary."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Alias dibuat setelah test runner berjalan, jadi izinkan secara eksplisit
+        cls.replica_dir = tempfile.mkdtemp()
+        connections.settings[replicas.REPLICA_ALIAS] = dict(
+            connections['default'].settings_dict, NAME=f'{cls.replica_dir}/replica.sqlite3'
+        )
+        cls.databases = cls.databases | {replicas.REPLICA_ALIAS}
+        call_command('migrate', database=replicas.REPLICA_ALIAS, verbosity=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[replicas.REPLICA_ALIAS].close()
+        del connections[replicas.REPLICA_ALIAS]
+        del connections.settings[replicas.REPLICA_ALIAS]
+        shutil.rmtree(cls.replica_dir)
+
+    def setUp(self):
+        cache.clear()
+        today = timezone.now().date()
+        self.organizer = User.objects.create_user(username='organizer', password='pass')
+        Profile.objects.filter(user=self.organizer).update(role='PENYELENGGARA')
+        Tournament.objects.create(name='Primary Cup', organizer=self.organizer, start_date=today, end_date=today)
+        # "Replikasi" user tanpa signal, plus data yang hanya ada di replica
+        User.objects.using(replicas.REPLICA_ALIAS).bulk_create([
+            User(pk=self.organizer.pk, username='organizer', password=self.organizer.password)
+        ])
+        Tournament.objects.using(replicas.REPLICA_ALIAS).bulk_create([
+            Tournament(name='Replica Cup', organizer_id=self.organizer.pk, start_date=today, end_date=today)
+        ])
+        self.client = Client()
+
+    def tournament_names(self):
+        response = self.client.get(reverse('tournaments:get_tournaments_json'))
+        return {tournament['name'] for tournament in response.json()['tournaments']}
+
+    def test_decorated_reads_use_replica_and_writes_use_primary(self):
+        self.assertEqual(self.tournament_names(), {'Replica Cup'})
+        response = self.client.get(reverse('main:search_profiles'), {'q': 'org'})
+        self.assertEqual([user['username'] for user in response.json()['data']], ['organizer'])
+        # View tanpa decorator tetap membaca primary
+        self.assertTrue(Tournament.objects.filter(name='Primary Cup').exists())
+
+        router = replicas.ReplicaRouter()
+        replica_row = Tournament.objects.using(replicas.REPLICA_ALIAS).get()
+        self.assertEqual(router.db_for_write(Tournament, instance=replica_row), 'default')
+
+    def test_post_pins_session_to_primary_until_sticky_window_ends(self):
+        self.client.login(username='organizer', password='pass')
+        self.assertEqual(self.tournament_names(), {'Replica Cup'})
+
+        today = timezone.now().date()
+        response = self.client.post(reverse('tournaments:create_tournament'), {
+            'name': 'Fresh Cup', 'start_date': today, 'end_date': today,
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.tournament_names(), {'Primary Cup', 'Fresh Cup'})
+
+        with override_settings(REPLICA_STICKY_SECONDS=0):
+            self.client.post(reverse('tournaments:create_tournament'), {
+                'name': 'Later Cup', 'start_date': today, 'end_date': today,
+            })
+        self.assertEqual(self.tournament_names(), {'Replica Cup'})
+
+    def test_anonymous_writes_are_not_pinned(self):
+        self.client.post(reverse('main:search_profiles'), {'q': 'org'})
+        self.assertNotIn(replicas.PINNED_UNTIL_KEY, self.client.session)
+        self.assertEqual(self.tournament_names(), {'Replica Cup'})
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=60)
+    def test_cached_responses_are_built_from_primary_when_replica_lags(self):
+        response = self.client.get(reverse('tournaments:get_tournaments_json'))
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+        # Write menaikkan versi cache; replica belum menerima turnamen baru
+        today = timezone.now().date()
+        Tournament.objects.create(name='New Cup', organizer=self.organizer, start_date=today, end_date=today)
+        for expected_cache in ('MISS', 'HIT'):
+            response = self.client.get(reverse('tournaments:get_tournaments_json'))
+            self.assertEqual(response['X-Cache'], expected_cache)
+            self.assertEqual(
+                {tournament['name'] for tournament in response.json()['tournaments']}, {'Primary Cup', 'New Cup'}
+            )
+
+    def test_streaming_leaderboard_reads_replica(self):
+        UserPoints.objects.using(replicas.REPLICA_ALIAS).bulk_create([
+            UserPoints(user_id=self.organizer.pk, total_points=7, updated_at=timezone.now())
+        ])
+        response = self.client.get(reverse('predictions:get_leaderboard_json'))
+        # Query leaderboard baru jalan saat stream dibaca, di luar view
+        self.assertEqual(
+            json.loads(b''.join(response.streaming_content)),
+            [{'user__username': 'organizer', 'total_points': 7}]
+        )
@@ -31,4 +31,8 @@ urlpatterns = [
     path('api/search/', search_profiles, name='search_profiles'),
     path('api/change-password/', change_password_flutter,
          name='change_password_flutter'),
+    path('api/sync/', views.sync_json, name='sync_json'),
+    path('api/autocomplete/', views.autocomplete_json, name='autocomplete_json'),
+    path('api/profiling/', views.profiling_report_json,
+         name='profiling_report_json'),
 ]
@@ -8,8 +8,13 @@ from .forms import (
 from django.views.decorators.csrf import csrf_exempt
 import json
 from .models import Profile
+from .cache import cache_json_response
+from .replicas import read_from_replica
+from . import autocomplete, home, profiling, sync
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse, HttpResponseRedirect
+from django.http import HttpResponseRedirect
+from .responses import JsonResponse
 from django.contrib.auth import authenticate, login, logout, update_session_auth_hash
 from django.contrib.auth.models import User
 from django.contrib import messages
@@ -21,61 +26,34 @@ import datetime
 from django.db.models import Sum
 from teams.models import Team
 from predictions.models import Prediction
-from tournaments.models import Tournament, Match
-from forums.models import Thread
+from predictions import ledger
 from predictions.models import Prediction
-from django.db.models import Count, F
-from django.utils import timezone
+from django.db.models import F
 from django.views.decorators.http import require_GET, require_POST
 from django.middleware.csrf import get_token
 from django.db.models import Q
 
 
 def home_view(request):
-    now_datetime = timezone.now()
-    now_date = now_datetime.date()
-
-    ongoing_tournaments = Tournament.objects.filter(
-        start_date__lte=now_date,
-        end_date__gte=now_date
-    ).order_by('-start_date')[:3]
-
-    upcoming_matches_for_prediction = Match.objects.filter(
-        match_date__gte=now_datetime,
-        home_score__isnull=True,
-        away_score__isnull=True
-    ).select_related('tournament', 'home_team', 'away_team').order_by('match_date')[:3]
-
-    recent_threads = Thread.objects.select_related('tournament', 'author')\
-        .annotate(post_count=Count('posts'))\
-        .order_by('-created_at')[:3]
-
-    top_predictors = Prediction.objects.values('user__username')\
-        .annotate(total_points=Sum('points_awarded'))\
-        .filter(total_points__gt=0)\
-        .order_by('-total_points')[:3]
+    # Bagian umum dari snapshot (main.home), rank dan tim user dihitung live
+    snapshot = home.get_home_snapshot()
 
     user_rank = None
     user_teams = None
+    user_total_points = 0
     if request.user.is_authenticated:
-        user_total_points = Prediction.objects.filter(user=request.user)\
-            .aggregate(total=Sum('points_awarded'))['total'] or 0
-
-        higher_ranked_users = Prediction.objects.values('user')\
-            .annotate(total_points=Sum('points_awarded'))\
-            .filter(total_points__gt=user_total_points)\
-            .count()
-        user_rank = higher_ranked_users + 1
+        user_total_points = ledger.user_points(request.user)
+        user_rank = ledger.user_rank(user_total_points)
 
         user_teams = request.user.teams.all()[:2]
 
     context = {
-        'ongoing_tournaments': ongoing_tournaments,
-        'upcoming_matches': upcoming_matches_for_prediction,
-        'recent_threads': recent_threads,
-        'top_predictors': top_predictors,
+        'ongoing_tournaments': snapshot['ongoing_tournaments'],
+        'upcoming_matches': snapshot['upcoming_matches'],
+        'recent_threads': snapshot['recent_threads'],
+        'top_predictors': snapshot['top_predictors'],
         'user_rank': user_rank,
-        'user_total_points': user_total_points if request.user.is_authenticated else 0,
+        'user_total_points': user_total_points,
         'user_teams': user_teams,
     }
     return render(request, 'main/home.html', context)
@@ -84,6 +62,49 @@ def home_view(request):
 def is_superuser(user): return user.is_superuser
 
 
+@require_GET
+def sync_json(request):
+    """Perubahan sejak token ?since= untuk client Flutter (lihat main.sync)."""
+    try:
+        payload = sync.build_sync_payload(request.user, request.GET.get('since'))
+    except sync.InvalidSyncToken as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    return JsonResponse(payload)
+
+
+@require_GET
+def autocomplete_json(request):
+    """
+    Autocomplete gabungan: ?q=teks&type=users,teams,tournaments&limit=10.
+    Hasil diurutkan: nama persis, prefix, substring, lalu kemiripan trigram.
+    """
+    query = request.GET.get('q', '').strip()
+    types = [t for t in request.GET.get('type', '').split(',') if t]
+    unknown = set(types) - set(autocomplete.AUTOCOMPLETE_SOURCES)
+    if unknown:
+        return JsonResponse({
+            'status': 'error',
+            'message': f"type tidak dikenal: {', '.join(sorted(unknown))}."
+        }, status=400)
+    try:
+        limit = min(max(int(request.GET.get('limit', autocomplete.DEFAULT_LIMIT)), 1), autocomplete.MAX_LIMIT)
+    except ValueError:
+        limit = autocomplete.DEFAULT_LIMIT
+
+    if not query:
+        return JsonResponse({'status': 'success', 'data': []})
+    return JsonResponse({'status': 'success', 'data': autocomplete.autocomplete(query, types or None, limit)})
+
+
+@user_passes_test(is_superuser)
+def profiling_report_json(request):
+    sort = request.GET.get('sort', 'p95_ms')
+    return JsonResponse({
+        'enabled': settings.PROFILING_ENABLED,
+        'endpoints': profiling.build_report(sort=sort),
+    })
+
+
 def register_view(request):
     if request.user.is_authenticated:
         return redirect('main:profile', username=request.user.username)
@@ -329,69 +350,27 @@ def logout_flutter(request):
 
 @csrf_exempt
 @require_GET
+@cache_json_response('tournaments.Tournament', 'tournaments.Match', 'teams.Team', 'forums.Thread', 'forums.Post', 'predictions.Prediction')
 def show_home_json(request):
-    now_datetime = timezone.now()
-    now_date = now_datetime.date()
-
-    ongoing_tournaments = Tournament.objects.filter(
-        start_date__lte=now_date,
-        end_date__gte=now_date
-    ).order_by('-start_date')[:3]
-
-    ongoing_list = []
-    for t in ongoing_tournaments:
-        ongoing_list.append({
-            'id': t.pk,
-            'name': t.name,
-            'end_date': t.end_date.strftime("%d %b %Y")
-        })
+    snapshot = home.get_home_snapshot()
 
-    upcoming_matches = Match.objects.filter(
-        match_date__gte=now_datetime,
-        home_score__isnull=True,
-        away_score__isnull=True
-    ).select_related('tournament', 'home_team', 'away_team').order_by('match_date')[:3]
-
-    match_list = []
-    for m in upcoming_matches:
-        match_list.append({
-            'home_team': m.home_team.name,
-            'away_team': m.away_team.name,
-            'tournament_name': m.tournament.name,
-            'date': m.match_date.strftime("%d %b, %H:%M")
-        })
-
-    recent_threads = Thread.objects.select_related('tournament', 'author')\
-        .annotate(post_count=Count('posts'))\
-        .order_by('-created_at')[:3]
-
-    thread_list = []
-    for th in recent_threads:
-        thread_list.append({
-            'id': th.pk,
-            'title': th.title,
-            'author': th.author.username,
-            'tournament': th.tournament.name,
-            'reply_count': max(0, th.post_count - 1)
-        })
-
-    top_predictors = Prediction.objects.values('user__username')\
-        .annotate(total_points=Sum('points_awarded'))\
-        .filter(total_points__gt=0)\
-        .order_by('-total_points')[:3]
+    ongoing_list = [{
+        'id': t['id'],
+        'name': t['name'],
+        'end_date': t['end_date'].strftime("%d %b %Y")
+    } for t in snapshot['ongoing_tournaments']]
 
-    predictor_list = list(top_predictors)
+    match_list = [{
+        'home_team': m['home_team'],
+        'away_team': m['away_team'],
+        'tournament_name': m['tournament_name'],
+        'date': m['match_date'].strftime("%d %b, %H:%M")
+    } for m in snapshot['upcoming_matches']]
 
     user_data = None
     if request.user.is_authenticated:
-        user_total_points = Prediction.objects.filter(user=request.user)\
-            .aggregate(total=Sum('points_awarded'))['total'] or 0
-
-        higher_ranked_users = Prediction.objects.values('user')\
-            .annotate(total_points=Sum('points_awarded'))\
-            .filter(total_points__gt=user_total_points)\
-            .count()
-        user_rank = higher_ranked_users + 1
+        user_total_points = ledger.user_points(request.user)
+        user_rank = ledger.user_rank(user_total_points)
 
         my_teams = request.user.teams.all()[:2]
         team_list = []
@@ -419,21 +398,14 @@ def show_home_json(request):
             'teams': team_list
         }
 
-    stats = {
-        'tournaments_count': Tournament.objects.filter(start_date__lte=now_date, end_date__gte=now_date).count(),
-        'matches_count': Match.objects.filter(match_date__gte=now_datetime).count(),
-        'threads_count': Thread.objects.count(),
-        'predictors_count': Prediction.objects.values('user').distinct().count()
-    }
-
     return JsonResponse({
         'status': True,
         'ongoing_tournaments': ongoing_list,
         'upcoming_matches': match_list,
-        'recent_threads': thread_list,
-        'top_predictors': predictor_list,
+        'recent_threads': snapshot['recent_threads'],
+        'top_predictors': snapshot['top_predictors'],
         'user_data': user_data,
-        'stats': stats
+        'stats': snapshot['stats']
     })
 
 
@@ -600,6 +572,7 @@ def update_profile_flutter(request):
         return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
 
 
+@read_from_replica
 def search_profiles(request):
     query = request.GET.get('q', '')
     if not query:
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from predictions.models import Prediction
+from predictions.models import Prediction, UserPoints
 
 @admin.register(Prediction)
 class PredictionAdmin(admin.ModelAdmin):
@@ -8,3 +8,10 @@ class PredictionAdmin(admin.ModelAdmin):
     search_fields = ['user__username', 'match__home_team__name', 'match__away_team__name']
     date_hierarchy = 'created_at'
     ordering = ['-created_at']
+
+
+@admin.register(UserPoints)
+class UserPointsAdmin(admin.ModelAdmin):
+    list_display = ['user', 'total_points', 'correct_count', 'wrong_count', 'updated_at']
+    search_fields = ['user__username']
+    ordering = ['-total_points']
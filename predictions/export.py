@@ -0,0 +1,114 @@
+"""
+Export penuh data match, prediksi, dan klasemen sebagai NDJSON atau CSV.
+
+Baris dibaca dengan .values().iterator(chunk_size=...) (server-side cursor di
+PostgreSQL) dan langsung ditulis per baris, jadi memori tetap konstan
+berapa pun jumlah datanya. Dipakai oleh endpoint export_data_view dan
+management command export_data.
+"""
+import csv
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+from main.responses import dumps
+from tournaments.models import Match, Standing
+from tournaments.standings import STANDING_FIELDS
+
+from .models import Prediction
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = ('ndjson', 'csv')
+CONTENT_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+# dataset -> (model, kolom .values() -> nama kolom export, field tournament, field tanggal)
+EXPORT_DATASETS = {
+    'matches': (Match, {
+        'id': 'id',
+        'tournament_id': 'tournament_id',
+        'tournament__name': 'tournament',
+        'match_date': 'match_date',
+        'home_team_id': 'home_team_id',
+        'home_team__name': 'home_team',
+        'away_team_id': 'away_team_id',
+        'away_team__name': 'away_team',
+        'home_score': 'home_score',
+        'away_score': 'away_score',
+    }, 'tournament_id', 'match_date'),
+    'predictions': (Prediction, {
+        'id': 'id',
+        'user_id': 'user_id',
+        'user__username': 'username',
+        'match_id': 'match_id',
+        'match__tournament_id': 'tournament_id',
+        'predicted_winner_id': 'predicted_winner_id',
+        'predicted_winner__name': 'predicted_winner',
+        'points_awarded': 'points_awarded',
+        'created_at': 'created_at',
+    }, 'match__tournament_id', 'match__match_date'),
+    # Klasemen tidak punya tanggal, filter tanggal diabaikan
+    'standings': (Standing, {
+        'tournament_id': 'tournament_id',
+        'team_id': 'team_id',
+        'team__name': 'team',
+        **{field: field for field in STANDING_FIELDS},
+    }, 'tournament_id', None),
+}
+
+
+def parse_day_start(value):
+    """YYYY-MM-DD → awal hari itu (timezone aktif); ValueError kalau format salah."""
+    day = datetime.strptime(value, '%Y-%m-%d').date()
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def export_columns(dataset):
+    return list(EXPORT_DATASETS[dataset][1].values())
+
+
+def export_rows(dataset, tournament_ids=None, date_from=None, date_to=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Iterator dict per baris dengan nama kolom export. tournament_ids None berarti semua turnamen;
+    date_from/date_to adalah awal hari dari parse_day_start, keduanya inklusif.
+    """
+    model, fields, tournament_field, date_field = EXPORT_DATASETS[dataset]
+    queryset = model.objects.all()
+    if tournament_ids is not None:
+        queryset = queryset.filter(**{f'{tournament_field}__in': tournament_ids})
+    if date_field and date_from:
+        queryset = queryset.filter(**{f'{date_field}__gte': date_from})
+    if date_field and date_to:
+        queryset = queryset.filter(**{f'{date_field}__lt': date_to + timedelta(days=1)})
+
+    for row in queryset.order_by('pk').values(*fields).iterator(chunk_size=chunk_size):
+        yield {name: row[source] for source, name in fields.items()}
+
+
+class _Echo:
+    """Pseudo-file untuk csv.writer: write() langsung mengembalikan barisnya."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield dumps(row) + b'\n'
+
+
+def csv_lines(columns, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([_csv_value(row[column]) for column in columns])
+
+
+def export_lines(dataset, export_format, **filters):
+    rows = export_rows(dataset, **filters)
+    if export_format == 'csv':
+        return csv_lines(export_columns(dataset), rows)
+    return ndjson_lines(rows)
@@ -0,0 +1,109 @@
+"""
+Ledger poin per user (UserPoints) untuk leaderboard prediksi.
+Di-update oleh jalur scoring, jadi top-N dan rank user cukup baca tabel ini
+tanpa GROUP BY atas seluruh tabel Prediction.
+"""
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .models import Prediction, UserPoints
+
+LEDGER_FIELDS = ('total_points', 'correct_count', 'wrong_count')
+
+
+def compute_user_points(user_ids=None):
+    """
+    Hitung poin dari Prediction dalam satu GROUP BY.
+    Return dict {user_id: {'total_points', 'correct_count', 'wrong_count'}}.
+    """
+    predictions = Prediction.objects.all()
+    if user_ids is not None:
+        predictions = predictions.filter(user_id__in=user_ids)
+    rows = predictions.values('user_id').annotate(
+        total_points=Sum('points_awarded'),
+        correct_count=Count('id', filter=Q(points_awarded__gt=0)),
+        wrong_count=Count('id', filter=Q(points_awarded__lt=0)),
+    ).order_by()
+    return {
+        row['user_id']: {field: row[field] or 0 for field in LEDGER_FIELDS}
+        for row in rows
+    }
+
+
+def write_user_points(totals, user_ids=None):
+    """
+    Tulis hasil compute_user_points ke UserPoints (bulk update + bulk create).
+    User di user_ids yang sudah tidak punya prediksi dihapus dari ledger.
+    """
+    with transaction.atomic():
+        stale = UserPoints.objects.exclude(user_id__in=totals.keys())
+        if user_ids is not None:
+            stale = stale.filter(user_id__in=user_ids)
+        stale.delete()
+
+        now = timezone.now()
+        existing = list(UserPoints.objects.filter(user_id__in=totals.keys()))
+        for entry in existing:
+            for field, value in totals[entry.user_id].items():
+                setattr(entry, field, value)
+            entry.updated_at = now
+        UserPoints.objects.bulk_update(existing, [*LEDGER_FIELDS, 'updated_at'], batch_size=1000)
+
+        known = {entry.user_id for entry in existing}
+        UserPoints.objects.bulk_create([
+            UserPoints(user_id=user_id, **values)
+            for user_id, values in totals.items() if user_id not in known
+        ], batch_size=1000)
+
+
+def refresh_user_points(user_ids):
+    """Hitung ulang baris ledger untuk sekumpulan user saja."""
+    user_ids = set(user_ids)
+    if user_ids:
+        write_user_points(compute_user_points(user_ids), user_ids)
+
+
+def rebuild_user_points():
+    """Bangun ulang seluruh ledger dari Prediction. Return jumlah baris."""
+    totals = compute_user_points()
+    write_user_points(totals)
+    return len(totals)
+
+
+def remove_prediction_points(prediction):
+    """
+    Kurangi kontribusi satu prediksi yang dihapus dari ledger pemiliknya. Kalau itu
+    prediksi terakhirnya, baris ledger ikut dihapus (sama seperti write_user_points).
+    """
+    if not Prediction.objects.filter(user_id=prediction.user_id).exists():
+        UserPoints.objects.filter(user_id=prediction.user_id).delete()
+        return
+
+    points = prediction.points_awarded
+    if not points:
+        return
+    UserPoints.objects.filter(user_id=prediction.user_id).update(
+        total_points=F('total_points') - points,
+        correct_count=F('correct_count') - (1 if points > 0 else 0),
+        wrong_count=F('wrong_count') - (1 if points < 0 else 0),
+        updated_at=timezone.now(),
+    )
+
+
+def top_predictors(limit=None, ascending=False):
+    """Leaderboard dari ledger dengan key yang sama seperti GROUP BY lama."""
+    leaderboard = UserPoints.objects.values('user__username', 'total_points').order_by(
+        'total_points' if ascending else '-total_points', 'user__username'
+    )
+    return leaderboard[:limit] if limit else leaderboard
+
+
+def user_points(user):
+    """Total poin user, 0 kalau belum ada di ledger."""
+    return UserPoints.objects.filter(user=user).values_list('total_points', flat=True).first() or 0
+
+
+def user_rank(total_points):
+    """Rank = jumlah user dengan poin lebih tinggi + 1 (index lookup pada total_points)."""
+    return UserPoints.objects.filter(total_points__gt=total_points).count() + 1
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+from predictions.export import EXPORT_DATASETS, EXPORT_FORMATS, export_lines, parse_day_start
+
+
+class Command(BaseCommand):
+    help = ('Streams matches, predictions or standings as NDJSON or CSV with constant memory, '
+            'optionally filtered by tournament and match date range.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(EXPORT_DATASETS))
+        parser.add_argument('--format', default='ndjson', choices=EXPORT_FORMATS)
+        parser.add_argument('--tournament', type=int, action='append', dest='tournaments',
+                            help='Only export the given tournament ID (can be repeated).')
+        parser.add_argument('--date-from', help='First match day to include (YYYY-MM-DD).')
+        parser.add_argument('--date-to', help='Last match day to include (YYYY-MM-DD).')
+        parser.add_argument('--output', help='Write to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        try:
+            date_from = parse_day_start(options['date_from']) if options['date_from'] else None
+            date_to = parse_day_start(options['date_to']) if options['date_to'] else None
+        except ValueError:
+            raise CommandError('Dates must use the YYYY-MM-DD format.')
+
+        lines = export_lines(
+            options['dataset'], options['format'],
+            tournament_ids=options['tournaments'], date_from=date_from, date_to=date_to,
+        )
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line.decode() if isinstance(line, bytes) else line, ending='')
+            return
+
+        count = 0
+        with open(options['output'], 'wb') as output:
+            for line in lines:
+                output.write(line if isinstance(line, bytes) else line.encode())
+                count += 1
+        self.stderr.write(self.style.SUCCESS(f'Wrote {count} line(s) to {options["output"]}.'))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from predictions.ledger import LEDGER_FIELDS, compute_user_points, write_user_points
+from predictions.models import UserPoints
+
+
+class Command(BaseCommand):
+    help = 'Verifies the UserPoints ledger against the raw Prediction rows and optionally repairs it.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix', action='store_true',
+            help='Rewrite the ledger from the Prediction rows when mismatches are found.'
+        )
+
+    def handle(self, *args, **options):
+        expected = compute_user_points()
+        stored = {
+            row['user_id']: {field: row[field] for field in LEDGER_FIELDS}
+            for row in UserPoints.objects.values('user_id', *LEDGER_FIELDS)
+        }
+
+        # Baris nol tanpa prediksi (sisa ledger lama) setara dengan tidak ada baris
+        empty = dict.fromkeys(LEDGER_FIELDS, 0)
+        mismatches = 0
+        for user_id in sorted(expected.keys() | stored.keys()):
+            if expected.get(user_id, empty) != stored.get(user_id):
+                mismatches += 1
+                self.stdout.write(self.style.WARNING(
+                    f'User {user_id}: ledger={stored.get(user_id)} expected={expected.get(user_id)}'
+                ))
+
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS(f'Ledger OK: {len(expected)} users checked.'))
+            return
+
+        if options['fix']:
+            write_user_points(expected)
+            self.stdout.write(self.style.SUCCESS(f'Fixed {mismatches} ledger rows.'))
+        else:
+            self.stdout.write(self.style.ERROR(f'Found {mismatches} mismatched ledger rows. Run with --fix to repair.'))
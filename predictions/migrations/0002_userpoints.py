@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-17 17:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_user_points(apps, schema_editor):
+    Prediction = apps.get_model('predictions', 'Prediction')
+    UserPoints = apps.get_model('predictions', 'UserPoints')
+
+    rows = Prediction.objects.values('user_id').annotate(
+        total=Sum('points_awarded'),
+        correct=Count('id', filter=Q(points_awarded__gt=0)),
+        wrong=Count('id', filter=Q(points_awarded__lt=0)),
+    ).order_by()
+    UserPoints.objects.bulk_create([
+        UserPoints(user_id=row['user_id'], total_points=row['total'] or 0,
+                   correct_count=row['correct'], wrong_count=row['wrong'])
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserPoints',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_points', models.IntegerField(default=0)),
+                ('correct_count', models.IntegerField(default=0)),
+                ('wrong_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='prediction_points', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-total_points'], name='userpoints_total_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_user_points, migrations.RunPython.noop),
+    ]
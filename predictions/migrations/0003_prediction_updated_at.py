@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0002_userpoints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='prediction',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-17 19:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0003_prediction_updated_at'),
+        ('teams', '0003_team_updated_at'),
+        ('tournaments', '0006_bracketnode'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='prediction',
+            index=models.Index(fields=['user', '-created_at'], name='prediction_user_recent_idx'),
+        ),
+    ]
@@ -2,14 +2,34 @@ from django.db import models
 from django.contrib.auth.models import User
 
 class Prediction(models.Model):
-    user = models.ForeignKey(User, related_name='predictions', on_delete=models.CASCADE)
+    # Index user sudah tercakup oleh unique (user, match) dan prediction_user_recent_idx
+    user = models.ForeignKey(User, related_name='predictions', on_delete=models.CASCADE, db_index=False)
     match = models.ForeignKey('tournaments.Match', related_name='predictions', on_delete=models.CASCADE)
     predicted_winner = models.ForeignKey('teams.Team', related_name='predictions_on', on_delete=models.CASCADE)    
     points_awarded = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         unique_together = ('user', 'match')
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='prediction_user_recent_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.user.username}'s prediction for {self.match}"
\ No newline at end of file
+        return f"{self.user.username}'s prediction for {self.match}"
+
+class UserPoints(models.Model):
+    user = models.OneToOneField(User, related_name='prediction_points', on_delete=models.CASCADE)
+    total_points = models.IntegerField(default=0)
+    correct_count = models.IntegerField(default=0)
+    wrong_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-total_points'], name='userpoints_total_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username}: {self.total_points} poin"
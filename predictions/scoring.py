@@ -0,0 +1,53 @@
+"""
+Penilaian prediksi secara set-based: satu match diselesaikan dengan satu
+UPDATE (CASE pada predicted_winner_id), bukan save() per baris Prediction.
+"""
+from django.db import transaction
+from django.db.models import Case, IntegerField, Value, When
+from django.utils import timezone
+
+from .ledger import refresh_user_points
+from .models import Prediction
+
+CORRECT_POINTS = 10
+WRONG_POINTS = -10
+DRAW_POINTS = 0
+
+
+def match_winner_id(match):
+    """ID tim pemenang, None kalau draw. Skor harus sudah lengkap."""
+    if match.home_score > match.away_score:
+        return match.home_team_id
+    if match.away_score > match.home_score:
+        return match.away_team_id
+    return None
+
+
+def points_expression(winner_id):
+    """Ekspresi poin untuk semua prediksi sebuah match dengan pemenang winner_id."""
+    if winner_id is None:
+        return Value(DRAW_POINTS)
+    return Case(
+        When(predicted_winner_id=winner_id, then=Value(CORRECT_POINTS)),
+        default=Value(WRONG_POINTS),
+        output_field=IntegerField(),
+    )
+
+
+def settle_match(match):
+    """
+    Beri poin ke semua prediksi match dalam satu UPDATE, lalu segarkan ledger
+    UserPoints untuk user yang memprediksi match ini.
+    Kalau skor belum lengkap, poin dikembalikan ke nol. Return jumlah baris yang diupdate.
+    """
+    predictions = Prediction.objects.filter(match_id=match.pk)
+    with transaction.atomic():
+        if match.home_score is None or match.away_score is None:
+            updated = predictions.exclude(points_awarded=0).update(points_awarded=0, updated_at=timezone.now())
+        else:
+            updated = predictions.update(
+                points_awarded=points_expression(match_winner_id(match)), updated_at=timezone.now()
+            )
+        if updated:
+            refresh_user_points(predictions.values_list('user_id', flat=True))
+    return updated
@@ -1,33 +1,29 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from tournaments.models import Match
-from .models import Prediction
+from tournaments.standings import match_result
+from .ledger import remove_prediction_points
+from .models import Prediction, UserPoints
+from .scoring import settle_match
 
 @receiver(post_save, sender=Match)
 def update_predictions_after_match(sender, instance, **kwargs):
-    # Kalau skor belum diisi, jangan update
-    if instance.home_score is None or instance.away_score is None:
+    # Hasil lama disimpan oleh pre_save di tournaments.signals.
+    # Kalau skor tidak berubah, tidak ada yang perlu dinilai ulang
+    previous = getattr(instance, '_previous_result', None)
+    if previous == match_result(instance):
         return
 
-    # Tentukan pemenang
-    if instance.home_score > instance.away_score:
-        winner = instance.home_team
-    elif instance.away_score > instance.home_score:
-        winner = instance.away_team
-    else:
-        winner = None  
+    settle_match(instance)
 
-    # Update poin pada setiap prediksi
-    predictions = Prediction.objects.filter(match=instance)
-    for pred in predictions:
-        # Kalau draw
-        if winner is None:
-            pred.points_awarded = 0
-        # Kalau prediksi benar
-        elif pred.predicted_winner == winner:
-            pred.points_awarded = 10
-        # Kalau prediksi salah
-        else:
-            pred.points_awarded = -10
 
-        pred.save()
+@receiver(post_save, sender=Prediction)
+def add_user_to_ledger(sender, instance, created, **kwargs):
+    # User baru muncul di leaderboard begitu punya prediksi pertama
+    if created:
+        UserPoints.objects.get_or_create(user_id=instance.user_id)
+
+
+@receiver(post_delete, sender=Prediction)
+def remove_prediction_from_ledger(sender, instance, **kwargs):
+    remove_prediction_points(instance)
@@ -1,9 +1,17 @@
+import json
 from django.test import TestCase, Client
 from django.contrib.auth.models import User
 from django.urls import reverse
 from django.utils import timezone
 from datetime import timedelta
 from predictions.models import Prediction
+from predictions.scoring import settle_match
+from predictions.models import UserPoints
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from io import StringIO
+from unittest.mock import patch
 from tournaments.models import Match, Tournament
 from teams.models import Team
 from django.utils.dateparse import parse_datetime
@@ -240,6 +248,20 @@ class PredictionViewTests(TestCase):
         response = self.client.get(reverse('predictions:get_finished_matches'))
         self.assertEqual(response.status_code, 200)
 
+    def test_ongoing_matches_cursor_mode_returns_json(self):
+        for i in range(10):
+            Match.objects.create(
+                tournament=self.tournament, home_team=self.teamA, away_team=self.teamB,
+                match_date=timezone.now() + timedelta(days=i + 1)
+            )
+        url = reverse('predictions:get_ongoing_matches')
+        first = self.client.get(url, {'cursor': ''}).json()
+        second = self.client.get(url, {'cursor': first['next_cursor']}).json()
+        self.assertEqual((len(first['matches']), len(second['matches'])), (9, 2))
+        self.assertFalse(second['has_next'])
+        ids = [m['id'] for m in first['matches'] + second['matches']]
+        self.assertEqual(ids, list(Match.objects.order_by('match_date', 'pk').values_list('id', flat=True)))
+
     def test_predictions_index_and_leaderboard(self):
         # predictions_index
         response = self.client.get(reverse('predictions:predictions_index'))
@@ -278,3 +300,278 @@ class PredictionViewTests(TestCase):
             response_data['message'], 
             'Turnamen ini sudah selesai. Tidak bisa menambah match baru.'
         )
+
+
+class ScoringTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='pass')
+        self.users = [User.objects.create_user(username=f'user{i}', password='pass') for i in range(3)]
+        self.teamA = Team.objects.create(name='Team A')
+        self.teamB = Team.objects.create(name='Team B')
+        self.tournament = Tournament.objects.create(
+            name='Scoring Cup',
+            organizer=self.admin,
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=5)
+        )
+        self.tournament.participants.add(self.teamA, self.teamB)
+        self.match = Match.objects.create(
+            tournament=self.tournament,
+            home_team=self.teamA,
+            away_team=self.teamB,
+            match_date=timezone.now()
+        )
+        for user, team in zip(self.users, [self.teamA, self.teamA, self.teamB]):
+            Prediction.objects.create(user=user, match=self.match, predicted_winner=team)
+
+    def points(self):
+        return list(Prediction.objects.order_by('user__username').values_list('points_awarded', flat=True))
+
+
+class PredictionScoringTests(ScoringTestCase):
+
+    def test_settle_match_query_count_independent_of_predictions(self):
+        self.match.home_score = 2
+        self.match.away_score = 0
+        with CaptureQueriesContext(connection) as few:
+            settle_match(self.match)
+        self.assertEqual(self.points(), [10, 10, -10])
+
+        for i in range(3, 10):
+            user = User.objects.create_user(username=f'user{i}', password='pass')
+            Prediction.objects.create(user=user, match=self.match, predicted_winner=self.teamB)
+        with CaptureQueriesContext(connection) as many:
+            settle_match(self.match)
+        self.assertEqual(len(many), len(few))
+        updates = [q for q in few.captured_queries if q['sql'].startswith('UPDATE "predictions_prediction"')]
+        self.assertEqual(len(updates), 1)
+
+    def test_signal_scores_draw_and_clears_points(self):
+        self.match.home_score = 0
+        self.match.away_score = 1
+        self.match.save()
+        self.assertEqual(self.points(), [-10, -10, 10])
+
+        self.match.home_score = 1
+        self.match.save()
+        self.assertEqual(self.points(), [0, 0, 0])
+
+        self.match.home_score = 3
+        self.match.save()
+        self.match.home_score = None
+        self.match.away_score = None
+        self.match.save()
+        self.assertEqual(self.points(), [0, 0, 0])
+
+    def test_signal_skips_when_score_unchanged(self):
+        self.match.home_score = 2
+        self.match.away_score = 1
+        self.match.save()
+        Prediction.objects.update(points_awarded=99)
+
+        self.match.save()
+        self.assertEqual(self.points(), [99, 99, 99])
+
+    def test_edit_score_flutter_settles_predictions(self):
+        self.admin.profile.role = 'ADMIN'
+        self.admin.profile.save()
+        self.client.login(username='admin', password='pass')
+        response = self.client.post(
+            reverse('predictions:edit_match_score_flutter'),
+            data={'match_id': self.match.id, 'home_score': 1, 'away_score': 0},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.points(), [10, 10, -10])
+
+
+class UserPointsLedgerTests(ScoringTestCase):
+
+    def ledger(self):
+        return {
+            p.user.username: (p.total_points, p.correct_count, p.wrong_count)
+            for p in UserPoints.objects.select_related('user')
+        }
+
+    def test_ledger_follows_scoring_and_deletes(self):
+        self.assertEqual(self.ledger(), {'user0': (0, 0, 0), 'user1': (0, 0, 0), 'user2': (0, 0, 0)})
+
+        self.match.home_score = 2
+        self.match.away_score = 0
+        self.match.save()
+        self.assertEqual(self.ledger(), {'user0': (10, 1, 0), 'user1': (10, 1, 0), 'user2': (-10, 0, 1)})
+
+        Prediction.objects.filter(user=self.users[0]).delete()
+        self.assertNotIn('user0', self.ledger())
+
+    def test_deleting_only_prediction_leaves_ledger_consistent(self):
+        self.match.home_score = 2
+        self.match.away_score = 0
+        self.match.save()
+        Prediction.objects.get(user=self.users[2]).delete()
+        self.assertNotIn('user2', self.ledger())
+
+        out = StringIO()
+        call_command('reconcile_user_points', stdout=out)
+        self.assertIn('Ledger OK', out.getvalue())
+
+        # Baris nol yang tertinggal dari versi lama juga tidak dianggap selisih
+        UserPoints.objects.create(user=self.users[2])
+        out = StringIO()
+        call_command('reconcile_user_points', stdout=out)
+        self.assertIn('Ledger OK', out.getvalue())
+
+    def test_leaderboard_and_rank_read_ledger(self):
+        self.match.home_score = 0
+        self.match.away_score = 1
+        self.match.save()
+
+        response = self.client.get(reverse('predictions:get_leaderboard_json'))
+        leaderboard = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(leaderboard[0], {'user__username': 'user2', 'total_points': 10})
+
+        self.client.login(username='user0', password='pass')
+        user_data = self.client.get(reverse('main:show_home_json')).json()['user_data']
+        self.assertEqual((user_data['total_points'], user_data['rank']), (-10, 2))
+
+    def test_reconcile_command_detects_and_fixes_drift(self):
+        self.match.home_score = 2
+        self.match.away_score = 0
+        self.match.save()
+        UserPoints.objects.filter(user=self.users[0]).update(total_points=500)
+
+        out = StringIO()
+        call_command('reconcile_user_points', stdout=out)
+        self.assertIn('Found 1 mismatched', out.getvalue())
+        self.assertEqual(self.ledger()['user0'][0], 500)
+
+        call_command('reconcile_user_points', '--fix', stdout=out)
+        self.assertEqual(self.ledger()['user0'], (10, 1, 0))
+        out = StringIO()
+        call_command('reconcile_user_points', stdout=out)
+        self.assertIn('Ledger OK', out.getvalue())
+
+
+class MatchFeedTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='feeder', password='pass')
+        self.teamA = Team.objects.create(name='Feed A')
+        self.teamB = Team.objects.create(name='Feed B')
+        self.tournament = Tournament.objects.create(
+            name='Feed Cup',
+            organizer=self.user,
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=30)
+        )
+        self.other = Tournament.objects.create(
+            name='Other Cup',
+            organizer=self.user,
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=30)
+        )
+        self.start = timezone.make_aware(timezone.datetime(2026, 3, 1, 15, 0))
+        self.matches = [self.add_match(self.tournament, days) for days in range(6)]
+        self.add_match(self.other, 0)
+        self.url = reverse('predictions:get_match_feed_json')
+
+    def add_match(self, tournament, days, score=None):
+        return Match.objects.create(
+            tournament=tournament, home_team=self.teamA, away_team=self.teamB,
+            match_date=self.start + timedelta(days=days), home_score=score, away_score=score
+        )
+
+    def feed(self, **params):
+        return self.client.get(self.url, params).json()
+
+    def test_filters_and_cursor_walk(self):
+        finished = self.add_match(self.tournament, 10, score=1)
+        params = {'tournament': self.tournament.pk, 'status': 'ongoing', 'limit': 4}
+        first = self.feed(**params)
+        second = self.feed(cursor=first['next_cursor'], **params)
+        self.assertEqual([m['id'] for m in first['matches'] + second['matches']], [m.pk for m in self.matches])
+        self.assertFalse(second['has_next'])
+
+        self.assertEqual([m['id'] for m in self.feed(status='finished')['matches']], [finished.pk])
+        window = self.feed(tournament=self.tournament.pk, date_from='2026-03-02', date_to='2026-03-03')
+        self.assertEqual([m['id'] for m in window['matches']], [m.pk for m in self.matches[1:3]])
+
+    def test_user_prediction_joined_in_single_query(self):
+        Prediction.objects.create(user=self.user, match=self.matches[2], predicted_winner=self.teamB)
+        self.client.login(username='feeder', password='pass')
+        self.client.get(self.url)  # session & user sudah dimuat
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(self.url, {'tournament': self.tournament.pk}).json()
+        feed_queries = [q for q in queries.captured_queries if 'tournaments_match' in q['sql']]
+        self.assertEqual(len(feed_queries), 1)
+        predicted = {m['id']: m['user_prediction_team_id'] for m in data['matches']}
+        self.assertEqual(predicted[self.matches[2].pk], self.teamB.pk)
+        self.assertIsNone(predicted[self.matches[0].pk])
+
+    def test_invalid_params_rejected(self):
+        self.assertEqual(self.client.get(self.url, {'status': 'later'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'date_from': '01-03-2026'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'cursor': 'bogus'}).status_code, 400)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username='organizer', password='pass')
+        self.organizer.profile.role = 'PENYELENGGARA'
+        self.organizer.profile.save()
+        self.player = User.objects.create_user(username='player', password='pass')
+        self.teamA = Team.objects.create(name='Export A')
+        self.teamB = Team.objects.create(name='Export B')
+        self.tournament = self.add_tournament('Export Cup', self.organizer)
+        self.foreign = self.add_tournament('Foreign Cup', self.player)
+        start = timezone.make_aware(timezone.datetime(2026, 5, 1, 10, 0))
+        self.matches = [
+            Match.objects.create(tournament=self.tournament, home_team=self.teamA, away_team=self.teamB,
+                                 match_date=start + timedelta(days=i), home_score=i, away_score=1)
+            for i in range(3)
+        ]
+        Match.objects.create(tournament=self.foreign, home_team=self.teamA, away_team=self.teamB, match_date=start)
+        Prediction.objects.create(user=self.player, match=self.matches[0], predicted_winner=self.teamA)
+
+    def add_tournament(self, name, organizer):
+        return Tournament.objects.create(
+            name=name, organizer=organizer,
+            start_date=timezone.now().date(), end_date=timezone.now().date() + timedelta(days=30)
+        )
+
+    def export(self, dataset, **params):
+        response = self.client.get(reverse('predictions:export_data', args=[dataset]), params)
+        return response, b''.join(response.streaming_content).decode() if response.streaming else None
+
+    def test_organizer_streams_own_tournament_as_ndjson(self):
+        self.client.login(username='organizer', password='pass')
+        response, body = self.export('matches', date_from='2026-05-02', date_to='2026-05-03')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([row['id'] for row in rows], [m.pk for m in self.matches[1:]])
+        self.assertEqual(rows[0]['home_team'], 'Export A')
+
+        forbidden, _ = self.export('matches', tournament=self.foreign.pk)
+        self.assertEqual(forbidden.status_code, 403)
+
+    def test_csv_standings_and_predictions(self):
+        self.client.login(username='organizer', password='pass')
+        _, body = self.export('standings', format='csv')
+        header, *lines = body.splitlines()
+        self.assertTrue(header.startswith('tournament_id,team_id,team,played'))
+        self.assertEqual(len(lines), 2)
+
+        _, body = self.export('predictions')
+        self.assertEqual(json.loads(body)['username'], 'player')
+
+    def test_players_cannot_export(self):
+        self.client.login(username='player', password='pass')
+        response, _ = self.export('predictions')
+        self.assertEqual(response.status_code, 403)
+
+    def test_command_uses_chunked_iterator(self):
+        out = StringIO()
+        with patch('django.db.models.query.QuerySet.iterator', autospec=True,
+                   side_effect=lambda qs, chunk_size=None: iter(list(qs))) as iterator:
+            call_command('export_data', 'matches', '--tournament', str(self.tournament.pk), stdout=out)
+        self.assertEqual(iterator.call_args.kwargs['chunk_size'], 2000)
+        self.assertEqual(len(out.getvalue().splitlines()), 3)
@@ -15,10 +15,12 @@ urlpatterns = [
     path('get-ongoing-matches/', views.get_ongoing_matches, name='get_ongoing_matches'),
     path('get-finished-matches/', views.get_finished_matches, name='get_finished_matches'),
     path('api/matches/', views.get_matches_json, name='get_matches_json'),
+    path('api/matches/feed/', views.get_match_feed_json, name='get_match_feed_json'),
     path('api/leaderboard/', views.get_leaderboard_json, name='get_leaderboard_json'),
     path('api/submit/', views.submit_prediction_flutter, name='submit_prediction_flutter'),
     path('api/get-form-data/', views.get_form_data, name='get_form_data'),
     path('api/create-match/', views.create_match_flutter, name='create_match_flutter'),
     path('api/edit-score/', views.edit_match_score_flutter, name='edit_match_score_flutter'),
     path('api/delete-prediction/', views.delete_prediction_flutter, name='delete_prediction_flutter'),
+    path('api/export/<str:dataset>/', views.export_data_view, name='export_data'),
 ]
\ No newline at end of file
@@ -1,14 +1,21 @@
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse
+from django.http import StreamingHttpResponse
+from main.responses import JsonResponse, StreamingJsonResponse
 from django.utils import timezone
-from django.db.models import Sum, Q
+from django.db.models import IntegerField, OuterRef, Q, Subquery, Value
 from django.views.decorators.http import require_POST
 from django.contrib.auth.decorators import login_required
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 from django.utils.safestring import mark_safe
 from django.core.paginator import Paginator  
 from predictions.models import Prediction
+from predictions.ledger import top_predictors
+from predictions.scoring import settle_match
+from predictions import export
+from main.cache import cache_json_response
+from main.pagination import InvalidCursor, cursor_paginate, wants_cursor
+from main.replicas import read_from_replica
 from tournaments.models import Match, Tournament
 from teams.models import Team
 from django.views.decorators.csrf import csrf_exempt
@@ -32,6 +39,29 @@ def predictions_index(request):
     }
     return render(request, 'predictions/predictions_index.html', context)
 
+def match_cursor_page(request, matches, ordering):
+    """Mode cursor (?cursor=) untuk list match: JSON tanpa COUNT, dipakai infinite scroll Flutter."""
+    try:
+        page_items, next_cursor = cursor_paginate(
+            matches.select_related('tournament', 'home_team', 'away_team'),
+            ordering, request.GET.get('cursor'), 9
+        )
+    except InvalidCursor as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+
+    data = [{
+        'id': match.id,
+        'tournament': match.tournament.name,
+        'home_team': match.home_team.name,
+        'home_team_id': match.home_team_id,
+        'away_team': match.away_team.name,
+        'away_team_id': match.away_team_id,
+        'match_date': match.match_date.strftime("%Y-%m-%d %H:%M"),
+        'home_score': match.home_score,
+        'away_score': match.away_score,
+    } for match in page_items]
+    return JsonResponse({'matches': data, 'has_next': next_cursor is not None, 'next_cursor': next_cursor})
+
 #Untuk mengambil partial HTML ongoing matches
 def get_ongoing_matches(request):
     tournament_id = request.GET.get('tournament')
@@ -42,6 +72,9 @@ def get_ongoing_matches(request):
     ongoing_matches_list = matches.filter(  
         Q(home_score__isnull=True) | Q(away_score__isnull=True)
     ).order_by('match_date')
+
+    if wants_cursor(request):
+        return match_cursor_page(request, ongoing_matches_list, ('match_date', 'pk'))
     
    
     paginator = Paginator(ongoing_matches_list, 9) 
@@ -62,6 +95,9 @@ def get_finished_matches(request):
     finished_matches_list = matches.filter( 
         home_score__isnull=False, away_score__isnull=False
     ).order_by('-match_date')
+
+    if wants_cursor(request):
+        return match_cursor_page(request, finished_matches_list, ('-match_date', '-pk'))
     
 
     paginator = Paginator(finished_matches_list, 9) 
@@ -140,11 +176,7 @@ def submit_prediction(request):
 def leaderboard_view(request):
     sort_order = request.GET.get('sort', 'desc')  
 
-    leaderboard = (
-        Prediction.objects.values('user__username')
-        .annotate(total_points=Sum('points_awarded'))
-        .order_by('-total_points' if sort_order == 'desc' else 'total_points')
-    )
+    leaderboard = top_predictors(ascending=sort_order != 'desc')
 
     context = {
         'leaderboard': leaderboard,
@@ -160,25 +192,7 @@ def evaluate_predictions(request, match_id):
     if match.home_score is None or match.away_score is None:
         return JsonResponse({'success': False, 'message': 'Pertandingan belum selesai.'}, status=400)
 
-    if match.home_score > match.away_score:
-        correct_team = match.home_team
-    elif match.away_score > match.home_score:
-        correct_team = match.away_team
-    else:
-        correct_team = None
-
-    predictions = Prediction.objects.filter(match=match)
-    for p in predictions:
-        if correct_team is None:
-            # Jika hasilnya draw
-            p.points_awarded = 0
-        elif p.predicted_winner == correct_team:
-            # Prediksi benar
-            p.points_awarded = 10
-        else:
-            # Prediksi salah
-            p.points_awarded = -10
-        p.save()
+    settle_match(match)
 
     return JsonResponse({'success': True, 'message': 'Prediksi telah dievaluasi!'})
 
@@ -199,9 +213,11 @@ def edit_match_score(request):
     match = get_object_or_404(Match, id=match_id)
 
     # cast ke int
-    match.home_score = int(home_score)
-    match.away_score = int(away_score)
-    match.save()
+    home_score, away_score = int(home_score), int(away_score)
+    if (match.home_score, match.away_score) != (home_score, away_score):
+        match.home_score = home_score
+        match.away_score = away_score
+        match.save()
 
     return JsonResponse({"success": True, "message": "Skor berhasil diperbarui"})
 
@@ -224,51 +240,101 @@ def delete_prediction(request):
     return JsonResponse({'success': False, 'message': 'Metode tidak valid.'}, status=400)
 
 
+def match_feed_item(match):
+    is_finished = match.home_score is not None and match.away_score is not None
+    return {
+        'id': match.id,
+        'tournament': match.tournament.name,
+        'home_team': match.home_team.name,
+        'home_team_id': match.home_team_id,
+        'away_team': match.away_team.name,
+        'away_team_id': match.away_team_id,
+        'match_date': match.match_date.strftime("%Y-%m-%d %H:%M"),
+        'home_score': match.home_score if match.home_score is not None else 0,
+        'away_score': match.away_score if match.away_score is not None else 0,
+        'is_finished': is_finished,
+        # Guest selalu None
+        'user_prediction_team_id': match.user_prediction_team_id,
+    }
+
+
+def with_user_prediction(matches, user):
+    """Annotate id tim yang diprediksi user untuk setiap match (satu subquery, bukan query per baris)."""
+    if not user.is_authenticated:
+        return matches.annotate(user_prediction_team_id=Value(None, output_field=IntegerField()))
+    prediction = Prediction.objects.filter(match=OuterRef('pk'), user=user).values('predicted_winner_id')[:1]
+    return matches.annotate(user_prediction_team_id=Subquery(prediction))
+
+
+@cache_json_response('tournaments.Tournament', 'tournaments.Match', 'teams.Team')
 def get_matches_json(request):
     """
     API untuk mengambil daftar pertandingan dan status prediksi user.
     """
-    # Ambil semua match
     matches = Match.objects.select_related('home_team', 'away_team', 'tournament').all().order_by('match_date')
-    
+    matches = with_user_prediction(matches, request.user)
+    return JsonResponse([match_feed_item(match) for match in matches], safe=False)
 
-    user_prediction_map = {}
 
-    if request.user.is_authenticated:
-        user_predictions = Prediction.objects.filter(user=request.user)
-        user_prediction_map = {pred.match.id: pred.predicted_winner.id for pred in user_predictions}
-    
-    data = []
-    for match in matches:
-        is_finished = match.home_score is not None and match.away_score is not None
-        data.append({
-            'id': match.id,
-            'tournament': match.tournament.name,
-            'home_team': match.home_team.name,
-            'home_team_id': match.home_team.id,
-            'away_team': match.away_team.name,
-            'away_team_id': match.away_team.id,
-            'match_date': match.match_date.strftime("%Y-%m-%d %H:%M"),
-            'home_score': match.home_score if match.home_score is not None else 0,
-            'away_score': match.away_score if match.away_score is not None else 0,
-            'is_finished': is_finished,
-            # Jika map kosong (Guest), ini akan otomatis return None
-            'user_prediction_team_id': user_prediction_map.get(match.id) 
-        })
-    
-    return JsonResponse(data, safe=False)
+MATCH_FEED_ORDERINGS = {
+    'all': ('match_date', 'pk'),
+    'ongoing': ('match_date', 'pk'),
+    'finished': ('-match_date', '-pk'),
+}
+MATCH_FEED_PAGE_SIZE = 20
+MATCH_FEED_MAX_PAGE_SIZE = 100
 
 
+@cache_json_response('tournaments.Tournament', 'tournaments.Match', 'teams.Team')
+def get_match_feed_json(request):
+    """
+    Feed match untuk tab prediksi mobile: filter tournament, status (all/ongoing/finished),
+    date_from/date_to (YYYY-MM-DD, inklusif), cursor pagination (?cursor=, ?limit=),
+    dan prediksi user ikut di query yang sama.
+    """
+    status = request.GET.get('status', 'all')
+    if status not in MATCH_FEED_ORDERINGS:
+        return JsonResponse({'success': False, 'message': 'Status tidak valid.'}, status=400)
+
+    matches = Match.objects.select_related('tournament', 'home_team', 'away_team')
+    try:
+        tournament_id = request.GET.get('tournament')
+        if tournament_id:
+            matches = matches.filter(tournament_id=int(tournament_id))
+        if request.GET.get('date_from'):
+            matches = matches.filter(match_date__gte=export.parse_day_start(request.GET['date_from']))
+        if request.GET.get('date_to'):
+            matches = matches.filter(match_date__lt=export.parse_day_start(request.GET['date_to']) + timedelta(days=1))
+        limit = min(max(int(request.GET.get('limit', MATCH_FEED_PAGE_SIZE)), 1), MATCH_FEED_MAX_PAGE_SIZE)
+    except ValueError:
+        return JsonResponse({'success': False, 'message': 'Parameter tidak valid.'}, status=400)
+
+    if status == 'ongoing':
+        matches = matches.filter(Q(home_score__isnull=True) | Q(away_score__isnull=True))
+    elif status == 'finished':
+        matches = matches.filter(home_score__isnull=False, away_score__isnull=False)
+
+    try:
+        page_items, next_cursor = cursor_paginate(
+            with_user_prediction(matches, request.user),
+            MATCH_FEED_ORDERINGS[status], request.GET.get('cursor'), limit
+        )
+    except InvalidCursor as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+
+    return JsonResponse({
+        'matches': [match_feed_item(match) for match in page_items],
+        'has_next': next_cursor is not None,
+        'next_cursor': next_cursor,
+    })
+
+
+@read_from_replica
 def get_leaderboard_json(request):
     """
-    API untuk mengambil data leaderboard.
+    API untuk mengambil data leaderboard. Jumlah baris = jumlah user, jadi di-stream.
     """
-    leaderboard_data = (
-        Prediction.objects.values('user__username')
-        .annotate(total_points=Sum('points_awarded'))
-        .order_by('-total_points')
-    )
-    return JsonResponse(list(leaderboard_data), safe=False)
+    return StreamingJsonResponse(top_predictors().iterator())
 
 
 @csrf_exempt 
@@ -439,11 +505,13 @@ def edit_match_score_flutter(request):
         home_score = data.get("home_score")
         away_score = data.get("away_score")
 
-        # 4. Update Database
+        # 4. Update Database (signal Match yang menilai ulang prediksi)
         match = Match.objects.get(pk=match_id)
-        match.home_score = int(home_score)
-        match.away_score = int(away_score)
-        match.save()
+        home_score, away_score = int(home_score), int(away_score)
+        if (match.home_score, match.away_score) != (home_score, away_score):
+            match.home_score = home_score
+            match.away_score = away_score
+            match.save()
 
         return JsonResponse({"status": "success", "message": "Skor berhasil diperbarui!"})
 
@@ -477,4 +545,41 @@ def delete_prediction_flutter(request):
             return JsonResponse({"status": "error", "message": "Tidak ada prediksi yang ditemukan untuk dihapus."})
 
     except Exception as e:
-        return JsonResponse({"status": "error", "message": str(e)}, status=500)
\ No newline at end of file
+        return JsonResponse({"status": "error", "message": str(e)}, status=500)
+
+@login_required
+def export_data_view(request, dataset):
+    """
+    Stream export match/prediksi/klasemen (?format=ndjson|csv, ?tournament=, ?date_from=, ?date_to=).
+    Admin bisa export semua turnamen, penyelenggara hanya turnamen miliknya.
+    """
+    if dataset not in export.EXPORT_DATASETS:
+        return JsonResponse({'success': False, 'message': 'Dataset tidak dikenal.'}, status=404)
+    export_format = request.GET.get('format', 'ndjson')
+    if export_format not in export.EXPORT_FORMATS:
+        return JsonResponse({'success': False, 'message': 'Format harus ndjson atau csv.'}, status=400)
+
+    try:
+        tournament_id = int(request.GET['tournament']) if request.GET.get('tournament') else None
+        date_from = export.parse_day_start(request.GET['date_from']) if request.GET.get('date_from') else None
+        date_to = export.parse_day_start(request.GET['date_to']) if request.GET.get('date_to') else None
+    except ValueError:
+        return JsonResponse({'success': False, 'message': 'Parameter tidak valid.'}, status=400)
+
+    role = getattr(getattr(request.user, 'profile', None), 'role', None)
+    if request.user.is_superuser or role == 'ADMIN':
+        tournament_ids = [tournament_id] if tournament_id else None
+    elif role == 'PENYELENGGARA':
+        organized = set(Tournament.objects.filter(organizer=request.user).values_list('pk', flat=True))
+        if tournament_id and tournament_id not in organized:
+            return JsonResponse({'success': False, 'message': 'Anda bukan penyelenggara turnamen ini.'}, status=403)
+        tournament_ids = [tournament_id] if tournament_id else sorted(organized)
+    else:
+        return JsonResponse({'success': False, 'message': 'Hanya admin atau penyelenggara.'}, status=403)
+
+    lines = export.export_lines(
+        dataset, export_format, tournament_ids=tournament_ids, date_from=date_from, date_to=date_to
+    )
+    response = StreamingHttpResponse(lines, content_type=export.CONTENT_TYPES[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{dataset}.{export_format}"'
+    return response
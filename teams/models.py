@@ -6,6 +6,7 @@ class Team(models.Model):
     logo = models.URLField(blank=True, null=True)
     captain = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='captained_teams')
     members = models.ManyToManyField(User, related_name='teams', blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return self.name
@@ -1,4 +1,7 @@
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User
 from django.urls import reverse
 from .models import Team
@@ -205,3 +208,51 @@ class TeamsViewsTestCase(TestCase):
         data = response.json()
         self.assertIsInstance(data, list)
         self.assertGreater(len(data), 0)
+
+
+class TeamFlutterApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('teams:team_flutter_api')
+        self.captain = User.objects.create_user(username='captain', password='pass123')
+        for i in range(3):
+            self.add_team(f'Team {i}', 2)
+
+    def add_team(self, name, member_count):
+        team = Team.objects.create(name=name, captain=self.captain)
+        for j in range(member_count):
+            team.members.add(User.objects.create_user(username=f'{name}-{j}'.replace(' ', '')))
+        return team
+
+    def test_query_count_does_not_grow_with_teams(self):
+        with CaptureQueriesContext(connection) as baseline:
+            self.client.get(self.url, {'nocache': 1})
+        for i in range(5):
+            self.add_team(f'Extra {i}', 3)
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(self.url, {'nocache': 2}).json()['data']
+        self.assertEqual(len(queries), len(baseline))
+        extra = next(team for team in data if team['name'] == 'Extra 0')
+        self.assertEqual(extra['members_count'], len(extra['members']))
+        self.assertEqual(extra['captain'], 'captain')
+
+    def test_field_selection(self):
+        data = self.client.get(self.url, {'fields': 'id,name,members_count'}).json()['data']
+        self.assertEqual(set(data[0]), {'id', 'name', 'members_count'})
+        self.assertEqual(self.client.get(self.url, {'fields': 'id,password'}).status_code, 400)
+
+    def test_cursor_pagination(self):
+        with self.settings(RESPONSE_CACHE_TIMEOUT=0):
+            first = self.client.get(self.url, {'cursor': '', 'fields': 'name'}).json()
+        self.assertEqual([team['name'] for team in first['data']], ['Team 0', 'Team 1', 'Team 2'])
+        self.assertIsNone(first['next_cursor'])
+
+    def test_etag_revalidation(self):
+        response = self.client.get(self.url)
+        etag = response['ETag']
+        self.assertFalse(etag.startswith('W/'))
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        Team.objects.filter(name='Team 0').update(name='Renamed')
+        self.add_team('Team 9', 1)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
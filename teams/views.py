@@ -1,14 +1,16 @@
 import json
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import JsonResponse
-from django.views.decorators.http import require_POST
-from django.db.models import Q, Count
+from main.responses import JsonResponse
+from django.views.decorators.http import conditional_page, require_POST
+from django.db.models import Q, Count, Prefetch
 from django.core.paginator import Paginator, EmptyPage
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.models import User
 from django.contrib import messages
 from django.db import IntegrityError
 from .models import Team
+from main.cache import cache_json_response
+from main.pagination import InvalidCursor, cursor_paginate, wants_cursor
 
 # --- Helper Function ---
 def is_json_request(request):
@@ -45,11 +47,25 @@ def search_teams(request):
             Q(name__icontains=query) | Q(captain__username__icontains=query)
         )
 
-    paginator = Paginator(teams, 5)
-    try:
-        page_obj = paginator.get_page(page)
-    except EmptyPage:
-        page_obj = paginator.page(paginator.num_pages)
+    if wants_cursor(request):
+        try:
+            page_items, next_cursor = cursor_paginate(teams, ('name', 'pk'), request.GET.get('cursor'), 5)
+        except InvalidCursor as e:
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+        pagination = {'has_next': next_cursor is not None, 'next_cursor': next_cursor}
+    else:
+        paginator = Paginator(teams, 5)
+        try:
+            page_obj = paginator.get_page(page)
+        except EmptyPage:
+            page_obj = paginator.page(paginator.num_pages)
+        page_items = page_obj
+        pagination = {
+            'current_page': page_obj.number,
+            'total_pages': paginator.num_pages,
+            'has_next': page_obj.has_next(),
+            'has_previous': page_obj.has_previous(),
+        }
 
     results = [
         {
@@ -59,18 +75,13 @@ def search_teams(request):
             'captain': team.captain.username if team.captain else None,
             'members_count': team.members_count,
         }
-        for team in page_obj
+        for team in page_items
     ]
 
     return JsonResponse({
         'status': 'success',
         'results': results,
-        'pagination': {
-            'current_page': page_obj.number,
-            'total_pages': paginator.num_pages,
-            'has_next': page_obj.has_next(),
-            'has_previous': page_obj.has_previous(),
-        }
+        'pagination': pagination
     })
 
 # --- ACTION API (CREATE) ---
@@ -290,20 +301,71 @@ def team_detail_json(request, team_id):
         return JsonResponse({'status': 'error', 'message': 'Tim tidak ditemukan'}, status=404)
 
 # --- API FLUTTER UTAMA ---
+TEAM_API_PAGE_SIZE = 50
+
+TEAM_API_GETTERS = {
+    'id': lambda team: team.id,
+    'name': lambda team: team.name,
+    'logo': lambda team: team.logo if team.logo else "",
+    'captain': lambda team: team.captain.username if team.captain else "Unknown",
+    'members_count': lambda team: team.members_count,
+    'members': lambda team: [member.username for member in team.members.all()],
+}
+TEAM_API_FIELDS = tuple(TEAM_API_GETTERS)
+
+
+def parse_team_fields(fields_param):
+    """?fields=id,name → tuple field yang diminta; None kalau ada field yang tidak dikenal."""
+    if not fields_param:
+        return TEAM_API_FIELDS
+    fields = tuple(dict.fromkeys(field.strip() for field in fields_param.split(',') if field.strip()))
+    if not fields or any(field not in TEAM_API_FIELDS for field in fields):
+        return None
+    return fields
+
+
+def team_api_queryset(fields):
+    """Hanya join/annotate/prefetch yang dibutuhkan field yang diminta."""
+    teams = Team.objects.all()
+    if 'captain' in fields:
+        teams = teams.select_related('captain')
+    if 'members_count' in fields:
+        teams = teams.annotate(members_count=Count('members', distinct=True))
+    if 'members' in fields:
+        teams = teams.prefetch_related(
+            Prefetch('members', queryset=User.objects.only('id', 'username').order_by('pk'))
+        )
+    return teams
+
+
+def team_api_item(team, fields):
+    return {field: TEAM_API_GETTERS[field](team) for field in fields}
+
+
 @csrf_exempt
+@conditional_page
+@cache_json_response('teams.Team')
 def team_flutter_api(request):
     if request.method == 'GET':
-        teams = Team.objects.all()
-        data = []
-        for team in teams:
-            data.append({
-                'id': team.id,
-                'name': team.name,
-                'logo': team.logo if team.logo else "",
-                'captain': team.captain.username if team.captain else "Unknown",
-                'members_count': team.members.count(),
-                'members': [member.username for member in team.members.all()]
-            })
+        fields = parse_team_fields(request.GET.get('fields', ''))
+        if fields is None:
+            return JsonResponse({
+                'status': 'error',
+                'message': f"Field tidak valid. Pilihan: {', '.join(TEAM_API_FIELDS)}"
+            }, status=400)
+
+        teams = team_api_queryset(fields)
+        if wants_cursor(request):
+            try:
+                teams, next_cursor = cursor_paginate(
+                    teams, ('name', 'pk'), request.GET.get('cursor'), TEAM_API_PAGE_SIZE
+                )
+            except InvalidCursor as e:
+                return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+            data = [team_api_item(team, fields) for team in teams]
+            return JsonResponse({'status': 'success', 'data': data, 'next_cursor': next_cursor})
+
+        data = [team_api_item(team, fields) for team in teams.order_by('pk')]
         return JsonResponse({'status': 'success', 'data': data}, safe=False)
 
     elif request.method == 'POST':
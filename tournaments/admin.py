@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Tournament, Match
+from .models import Tournament, Match, Standing, BracketNode
 
 @admin.register(Tournament)
 class TournamentAdmin(admin.ModelAdmin):
@@ -14,4 +14,17 @@ class MatchAdmin(admin.ModelAdmin):
     list_display = ('__str__', 'tournament', 'match_date', 'home_score', 'away_score')
     list_filter = ('tournament', 'match_date', 'home_team', 'away_team')
     search_fields = ('tournament__name', 'home_team__name', 'away_team__name')
-    date_hierarchy = 'match_date'
\ No newline at end of file
+    date_hierarchy = 'match_date'
+
+@admin.register(Standing)
+class StandingAdmin(admin.ModelAdmin):
+    list_display = ('team', 'tournament', 'played', 'wins', 'draws', 'losses', 'goal_difference', 'points')
+    list_filter = ('tournament',)
+    search_fields = ('tournament__name', 'team__name')
+
+@admin.register(BracketNode)
+class BracketNodeAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'home_team', 'away_team', 'winner', 'match', 'scheduled_at')
+    list_filter = ('tournament', 'round')
+    search_fields = ('tournament__name',)
+    raw_id_fields = ('match',)
@@ -0,0 +1,207 @@
+"""
+Bracket knockout: struktur, progres pemenang, dan tree untuk endpoint JSON.
+
+Setiap pertandingan bracket adalah satu BracketNode dengan indeks (round, position)
+yang dihitung saat bracket dibuat. Pemenang node (r, p) masuk ke node (r + 1, p // 2),
+slot home kalau p genap dan away kalau ganjil, jadi tidak perlu menelusuri match
+secara rekursif dan seluruh tree cukup diambil dengan satu query.
+
+Saat skor match bracket disimpan (signal post_save di tournaments.signals) pemenang
+otomatis maju dan match ronde berikutnya dibuat begitu kedua timnya diketahui.
+Hasil seri tidak memajukan siapa pun sampai organizer menetapkan pemenang
+tiebreak (adu penalti, dsb.) lewat set_winner.
+"""
+from django.db import transaction
+
+from main.cache import bump_model_version
+
+from .models import BracketNode, Match
+from .scheduler import bracket_positions
+
+
+class BracketError(ValueError):
+    pass
+
+
+ROUND_NAMES = {1: 'Final', 2: 'Semifinal', 3: 'Perempat Final'}
+
+
+def round_name(round_number, total_rounds):
+    return ROUND_NAMES.get(total_rounds - round_number + 1, f'Ronde {round_number}')
+
+
+def slot_field(node):
+    """Slot di node berikutnya yang diisi pemenang node ini."""
+    return 'home_team_id' if node.position % 2 == 0 else 'away_team_id'
+
+
+def match_winner_id(match):
+    """Id tim pemenang, atau None kalau match belum selesai atau seri."""
+    if match.home_score is None or match.away_score is None or match.home_score == match.away_score:
+        return None
+    return match.home_team_id if match.home_score > match.away_score else match.away_team_id
+
+
+def is_draw(match):
+    return match.home_score is not None and match.home_score == match.away_score
+
+
+def create_bracket(tournament, team_ids, dates):
+    """
+    Buat semua node bracket sekaligus. team_ids urut seed (terbaik dulu), dates satu
+    tanggal per ronde (scheduler.round_dates). Tim yang bye langsung maju ke ronde 2.
+    Match dibuat untuk setiap node yang kedua timnya sudah diketahui. Return list node.
+    """
+    size = 1 << (len(team_ids) - 1).bit_length()
+    positions = bracket_positions(size)
+    nodes = {
+        (round_number, position): BracketNode(
+            tournament=tournament, round=round_number, position=position,
+            scheduled_at=dates[round_number - 1],
+        )
+        for round_number in range(1, len(dates) + 1)
+        for position in range(size >> round_number)
+    }
+
+    for position in range(size // 2):
+        node = nodes[(1, position)]
+        high, low = positions[2 * position], positions[2 * position + 1]
+        node.home_team_id = team_ids[high - 1]
+        if low <= len(team_ids):
+            node.away_team_id = team_ids[low - 1]
+        else:
+            node.winner_id = node.home_team_id
+            setattr(nodes[(2, position // 2)], slot_field(node), node.winner_id)
+
+    ready = [node for node in nodes.values() if node.home_team_id and node.away_team_id]
+    matches = Match.objects.bulk_create([
+        Match(tournament=tournament, home_team_id=node.home_team_id,
+              away_team_id=node.away_team_id, match_date=node.scheduled_at)
+        for node in ready
+    ])
+    for node, match in zip(ready, matches):
+        node.match = match
+
+    created = BracketNode.objects.bulk_create(nodes.values())
+    # bulk_create tidak memicu post_save
+    bump_model_version(BracketNode._meta.label)
+    return created
+
+
+def place_match(node):
+    """
+    Samakan match node dengan timnya: buat match kalau kedua tim sudah ada, hapus match
+    yang belum dimainkan kalau timnya berubah atau salah satunya hilang.
+    """
+    match = node.match
+    teams = (node.home_team_id, node.away_team_id)
+    if match is not None and (match.home_team_id, match.away_team_id) != teams:
+        match.delete()
+        node.match = match = None
+    if match is None and all(teams):
+        node.match = Match.objects.create(
+            tournament_id=node.tournament_id, home_team_id=teams[0], away_team_id=teams[1],
+            match_date=node.scheduled_at,
+        )
+
+
+@transaction.atomic
+def set_winner(node, winner_id):
+    """
+    Tetapkan (atau hapus, winner_id=None) pemenang node lalu teruskan ke ronde berikutnya.
+    Pemenang final menjadi juara turnamen. BracketError kalau tim bukan peserta node
+    atau match ronde berikutnya sudah dimainkan.
+    """
+    if winner_id is not None and winner_id not in (node.home_team_id, node.away_team_id):
+        raise BracketError('Pemenang harus salah satu tim di pertandingan ini.')
+    if node.winner_id == winner_id:
+        return node
+
+    next_node = BracketNode.objects.select_for_update().select_related('match').filter(
+        tournament_id=node.tournament_id, round=node.round + 1, position=node.position // 2
+    ).first()
+    if next_node and next_node.match and next_node.match.home_score is not None:
+        raise BracketError('Pertandingan ronde berikutnya sudah dimainkan, hasilnya tidak bisa diubah lagi.')
+
+    previous_winner_id = node.winner_id
+    node.winner_id = winner_id
+    node.save(update_fields=['winner'])
+
+    if next_node is None:
+        tournament = node.tournament
+        if tournament.winner_id in (previous_winner_id, None):
+            tournament.winner_id = winner_id
+            tournament.save(update_fields=['winner', 'updated_at'])
+        return node
+
+    setattr(next_node, slot_field(node), winner_id)
+    place_match(next_node)
+    next_node.save(update_fields=['home_team', 'away_team', 'match'])
+    return node
+
+
+def advance_from_match(match):
+    """Dipanggil setelah skor match berubah; no-op untuk match di luar bracket."""
+    node = BracketNode.objects.select_related('tournament').filter(match_id=match.pk).first()
+    if node is not None:
+        set_winner(node, match_winner_id(match))
+
+
+def team_item(team):
+    if team is None:
+        return None
+    return {'id': team.id, 'name': team.name, 'logo': team.logo or ''}
+
+
+def node_status(node):
+    if node.winner_id:
+        return 'decided'
+    if node.match is None:
+        return 'pending'
+    return 'tiebreak' if is_draw(node.match) else 'scheduled'
+
+
+def bracket_tree(tournament_id):
+    """
+    Seluruh bracket per ronde dalam satu query. Return None kalau turnamen tidak punya bracket.
+    """
+    nodes = list(
+        BracketNode.objects.filter(tournament_id=tournament_id)
+        .select_related('home_team', 'away_team', 'winner', 'match')
+        .order_by('round', 'position')
+    )
+    if not nodes:
+        return None
+
+    total_rounds = nodes[-1].round
+    rounds = [{'round': number, 'name': round_name(number, total_rounds), 'nodes': []}
+              for number in range(1, total_rounds + 1)]
+    for node in nodes:
+        match = node.match
+        rounds[node.round - 1]['nodes'].append({
+            'id': node.id,
+            'position': node.position,
+            'home_team': team_item(node.home_team),
+            'away_team': team_item(node.away_team),
+            'winner_id': node.winner_id,
+            'status': node_status(node),
+            'scheduled_at': node.scheduled_at.isoformat() if node.scheduled_at else None,
+            'match': {
+                'id': match.id,
+                'match_date': match.match_date.isoformat(),
+                'home_score': match.home_score,
+                'away_score': match.away_score,
+            } if match else None,
+            'next': {
+                'round': node.round + 1,
+                'position': node.position // 2,
+                'slot': 'home' if node.position % 2 == 0 else 'away',
+            } if node.round < total_rounds else None,
+        })
+
+    return {
+        'tournament_id': tournament_id,
+        'total_rounds': total_rounds,
+        'champion': team_item(nodes[-1].winner),
+        'rounds': rounds,
+    }
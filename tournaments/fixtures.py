@@ -0,0 +1,155 @@
+"""
+Import jadwal pertandingan (fixture) secara massal dari CSV atau JSON.
+
+Setiap baris berisi home_team, away_team (id atau nama tim), match_date, dan
+opsional home_score/away_score. Semua baris divalidasi sekaligus terhadap
+peserta turnamen (satu query), error dilaporkan per baris, dan kalau semua
+valid match dibuat dengan satu bulk_create di dalam satu transaksi.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from main.cache import bump_model_version
+
+from .models import Match
+from .standings import rebuild_standings
+
+REQUIRED_COLUMNS = ('home_team', 'away_team', 'match_date')
+DATE_FORMATS = ('%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d')
+
+
+class FixtureFormatError(ValueError):
+    """File tidak bisa dibaca sama sekali (bukan error per baris)."""
+
+
+def parse_fixture_file(content, file_format):
+    """content (str) → list dict per baris. file_format: 'csv' atau 'json'."""
+    if file_format == 'csv':
+        reader = csv.DictReader(io.StringIO(content))
+        if not reader.fieldnames or not set(REQUIRED_COLUMNS) <= {f.strip() for f in reader.fieldnames}:
+            raise FixtureFormatError(f"Header CSV harus memuat {', '.join(REQUIRED_COLUMNS)}.")
+        return [{key.strip(): value for key, value in row.items() if key} for row in reader]
+
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError:
+        raise FixtureFormatError('JSON tidak valid.')
+    if isinstance(data, dict):
+        data = data.get('matches')
+    if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+        raise FixtureFormatError('JSON harus berupa list match atau {"matches": [...]}.')
+    return data
+
+
+def parse_match_date(value):
+    for date_format in DATE_FORMATS:
+        try:
+            parsed = datetime.strptime(str(value).strip(), date_format)
+        except ValueError:
+            continue
+        return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+    raise ValueError(value)
+
+
+def parse_score(value):
+    if value is None or str(value).strip() == '':
+        return None
+    score = int(value)
+    if score < 0:
+        raise ValueError(value)
+    return score
+
+
+class ParticipantLookup:
+    """Peserta turnamen per id dan per nama (case-insensitive), diambil dengan satu query."""
+
+    def __init__(self, tournament):
+        participants = list(tournament.participants.values_list('id', 'name'))
+        self.by_id = {team_id: name for team_id, name in participants}
+        self.by_name = {name.casefold(): team_id for team_id, name in participants}
+
+    def resolve(self, value):
+        text = str(value).strip() if value is not None else ''
+        if text.isdigit() and int(text) in self.by_id:
+            return int(text)
+        return self.by_name.get(text.casefold())
+
+
+def validate_rows(tournament, rows):
+    """
+    Return (matches, errors): matches berisi instance Match yang belum disimpan,
+    errors berisi {'row': nomor baris mulai 1, 'errors': [...]}.
+    """
+    participants = ParticipantLookup(tournament)
+    matches, errors, seen = [], [], set()
+
+    for number, row in enumerate(rows, start=1):
+        row_errors = []
+        for column in REQUIRED_COLUMNS:
+            if row.get(column) in (None, ''):
+                row_errors.append(f'{column} wajib diisi.')
+
+        team_ids = {}
+        for column in ('home_team', 'away_team'):
+            if row.get(column) not in (None, ''):
+                team_ids[column] = participants.resolve(row[column])
+                if team_ids[column] is None:
+                    row_errors.append(f'{column} "{row[column]}" tidak terdaftar di turnamen ini.')
+        if team_ids.get('home_team') and team_ids.get('home_team') == team_ids.get('away_team'):
+            row_errors.append('Tim home dan away tidak boleh sama.')
+
+        match_date = None
+        if row.get('match_date') not in (None, ''):
+            try:
+                match_date = parse_match_date(row['match_date'])
+            except ValueError:
+                row_errors.append(f'match_date "{row["match_date"]}" tidak valid (YYYY-MM-DD [HH:MM]).')
+
+        scores = {}
+        for column in ('home_score', 'away_score'):
+            try:
+                scores[column] = parse_score(row.get(column))
+            except (TypeError, ValueError):
+                row_errors.append(f'{column} harus bilangan bulat >= 0.')
+        if len(scores) == 2 and (scores['home_score'] is None) != (scores['away_score'] is None):
+            row_errors.append('home_score dan away_score harus diisi keduanya atau dikosongkan.')
+
+        key = (team_ids.get('home_team'), team_ids.get('away_team'), match_date)
+        if not row_errors and key in seen:
+            row_errors.append('Duplikat dengan baris lain di file ini.')
+        seen.add(key)
+
+        if row_errors:
+            errors.append({'row': number, 'errors': row_errors})
+            continue
+        matches.append(Match(
+            tournament=tournament,
+            home_team_id=team_ids['home_team'],
+            away_team_id=team_ids['away_team'],
+            match_date=match_date,
+            **scores,
+        ))
+    return matches, errors
+
+
+def import_fixtures(tournament, rows, dry_run=False):
+    """
+    Validasi lalu simpan semua baris sekaligus. Tidak ada yang disimpan kalau ada error
+    atau dry_run. Return (jumlah match yang dibuat, errors).
+    """
+    matches, errors = validate_rows(tournament, rows)
+    if errors or dry_run or not matches:
+        return 0, errors
+
+    with transaction.atomic():
+        Match.objects.bulk_create(matches)
+        # bulk_create tidak memicu post_save: klasemen dan cache respons diupdate manual
+        if any(match.home_score is not None for match in matches):
+            rebuild_standings([tournament.pk])
+    bump_model_version(Match._meta.label)
+    return len(matches), errors
@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from tournaments import scheduler
+from tournaments.models import Tournament
+
+
+class Command(BaseCommand):
+    help = ('Generates a round-robin or single-elimination schedule from the tournament participants '
+            "and spreads the rounds across the tournament's start and end dates.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('tournament_id', type=int)
+        parser.add_argument('--format', choices=scheduler.FORMATS, default=scheduler.ROUND_ROBIN)
+        parser.add_argument('--double', action='store_true', help='Round-robin home and away (two legs).')
+        parser.add_argument('--rest-days', type=int, default=1, help='Minimum days between a team\'s matches.')
+        parser.add_argument('--seeding', help='Comma-separated team IDs, best seed first. Others follow by name.')
+        parser.add_argument('--shuffle-seed', type=int, help='Random seeding with a reproducible seed.')
+        parser.add_argument('--replace', action='store_true', help='Delete the existing matches first.')
+        parser.add_argument('--dry-run', action='store_true', help='Only print the schedule summary.')
+
+    def handle(self, *args, **options):
+        try:
+            tournament = Tournament.objects.get(pk=options['tournament_id'])
+        except Tournament.DoesNotExist:
+            raise CommandError(f'Tournament {options["tournament_id"]} does not exist.')
+
+        try:
+            seeding = [int(team_id) for team_id in options['seeding'].split(',')] if options['seeding'] else None
+        except ValueError:
+            raise CommandError('--seeding must be a comma-separated list of team IDs.')
+
+        started = time.perf_counter()
+        try:
+            schedule = scheduler.generate_fixtures(
+                tournament,
+                replace=options['replace'],
+                dry_run=options['dry_run'],
+                fixture_format=options['format'],
+                double=options['double'],
+                rest_days=options['rest_days'],
+                seeding=seeding,
+                shuffle_seed=options['shuffle_seed'],
+            )
+        except scheduler.ScheduleError as e:
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - started
+
+        summary = f'{len(schedule.fixtures)} matches in {len(schedule.dates)} round(s)'
+        if schedule.byes:
+            summary += f', byes: {", ".join(map(str, schedule.byes))}'
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'Dry run: {summary} ({elapsed:.3f}s), nothing saved.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Generated {summary} for "{tournament.name}" in {elapsed:.3f}s.'))
@@ -0,0 +1,44 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from tournaments import fixtures
+from tournaments.models import Tournament
+
+
+class Command(BaseCommand):
+    help = ('Imports a fixture list (CSV or JSON with home_team, away_team, match_date and optional scores) '
+            'into a tournament. All rows are validated first; nothing is saved if any row is invalid.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('tournament_id', type=int)
+        parser.add_argument('path', help='CSV or JSON file. Teams may be given by ID or name.')
+        parser.add_argument('--format', choices=['csv', 'json'], help='Defaults to the file extension.')
+        parser.add_argument('--dry-run', action='store_true', help='Only validate, do not save.')
+
+    def handle(self, *args, **options):
+        try:
+            tournament = Tournament.objects.get(pk=options['tournament_id'])
+        except Tournament.DoesNotExist:
+            raise CommandError(f'Tournament {options["tournament_id"]} does not exist.')
+
+        path = Path(options['path'])
+        file_format = options['format'] or ('json' if path.suffix.lower() == '.json' else 'csv')
+        try:
+            rows = fixtures.parse_fixture_file(path.read_text(encoding='utf-8-sig'), file_format)
+        except OSError as e:
+            raise CommandError(f'Cannot read {path}: {e}')
+        except UnicodeDecodeError:
+            raise CommandError(f'{path} is not UTF-8 encoded; re-save it as UTF-8.')
+        except fixtures.FixtureFormatError as e:
+            raise CommandError(str(e))
+
+        created, errors = fixtures.import_fixtures(tournament, rows, dry_run=options['dry_run'])
+        for error in errors:
+            self.stdout.write(self.style.WARNING(f'Row {error["row"]}: {" ".join(error["errors"])}'))
+        if errors:
+            raise CommandError(f'{len(errors)} of {len(rows)} rows are invalid; nothing was imported.')
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'All {len(rows)} rows are valid (dry run, nothing saved).'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Imported {created} matches into "{tournament.name}".'))
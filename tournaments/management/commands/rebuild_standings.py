@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from tournaments.standings import rebuild_standings
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the stored standings table from scratch using the Match scores.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tournament', type=int, action='append', dest='tournaments',
+            help='Only rebuild the given tournament ID (can be repeated).'
+        )
+
+    def handle(self, *args, **options):
+        tournament_ids = options.get('tournaments')
+        rows = rebuild_standings(tournament_ids)
+        scope = f'{len(tournament_ids)} tournament(s)' if tournament_ids else 'all tournaments'
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt standings for {scope}: {rows} rows written.'))
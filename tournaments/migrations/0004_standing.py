@@ -0,0 +1,59 @@
+# Generated by Django 5.2.7 on 2026-10-17 16:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_standings(apps, schema_editor):
+    Match = apps.get_model('tournaments', 'Match')
+    Standing = apps.get_model('tournaments', 'Standing')
+
+    table = {}
+    finished = Match.objects.filter(home_score__isnull=False, away_score__isnull=False)
+    for m in finished.values('tournament_id', 'home_team_id', 'away_team_id', 'home_score', 'away_score'):
+        for team_id, gf, ga in (
+            (m['home_team_id'], m['home_score'], m['away_score']),
+            (m['away_team_id'], m['away_score'], m['home_score']),
+        ):
+            row = table.setdefault((m['tournament_id'], team_id), Standing(tournament_id=m['tournament_id'], team_id=team_id))
+            row.played += 1
+            row.wins += gf > ga
+            row.draws += gf == ga
+            row.losses += gf < ga
+            row.goals_for += gf
+            row.goals_against += ga
+            row.goal_difference += gf - ga
+            row.points += 3 if gf > ga else 1 if gf == ga else 0
+    Standing.objects.bulk_create(table.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0002_alter_team_logo'),
+        ('tournaments', '0003_tournament_registration_open_tournament_winner'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Standing',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('played', models.IntegerField(default=0)),
+                ('wins', models.IntegerField(default=0)),
+                ('draws', models.IntegerField(default=0)),
+                ('losses', models.IntegerField(default=0)),
+                ('goals_for', models.IntegerField(default=0)),
+                ('goals_against', models.IntegerField(default=0)),
+                ('goal_difference', models.IntegerField(default=0)),
+                ('points', models.IntegerField(default=0)),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='standings', to='teams.team')),
+                ('tournament', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='standings', to='tournaments.tournament')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['tournament', '-points', '-goal_difference', '-goals_for'], name='standing_table_idx')],
+                'unique_together': {('tournament', 'team')},
+            },
+        ),
+        migrations.RunPython(backfill_standings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0003_team_updated_at'),
+        ('tournaments', '0005_match_updated_at_tournament_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BracketNode',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('round', models.PositiveSmallIntegerField()),
+                ('position', models.PositiveIntegerField()),
+                ('scheduled_at', models.DateTimeField(blank=True, null=True)),
+                ('away_team', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='teams.team')),
+                ('home_team', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='teams.team')),
+                ('match', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='bracket_node', to='tournaments.match')),
+                ('tournament', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bracket_nodes', to='tournaments.tournament')),
+                ('winner', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='teams.team')),
+            ],
+            options={
+                'ordering': ('tournament', 'round', 'position'),
+                'unique_together': {('tournament', 'round', 'position')},
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-17 19:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0003_team_updated_at'),
+        ('tournaments', '0006_bracketnode'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['tournament', 'match_date'], name='match_tournament_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(condition=models.Q(('home_score__isnull', True), ('away_score__isnull', True), _connector='OR'), fields=['match_date'], name='match_unplayed_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(condition=models.Q(('away_score__isnull', False), ('home_score__isnull', False)), fields=['-match_date'], name='match_finished_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tournament',
+            index=models.Index(fields=['start_date', 'end_date'], name='tournament_dates_idx'),
+        ),
+    ]
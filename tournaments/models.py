@@ -18,6 +18,14 @@ class Tournament(models.Model):
         null=True,
         blank=True
     )
+    # Dipakai sync delta Flutter (main.sync)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # Filter ongoing/upcoming/past: start_date <= hari ini <= end_date
+            models.Index(fields=['start_date', 'end_date'], name='tournament_dates_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -29,6 +37,74 @@ class Match(models.Model):
     match_date = models.DateTimeField()
     home_score = models.IntegerField(null=True, blank=True)
     away_score = models.IntegerField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['tournament', 'match_date'], name='match_tournament_date_idx'),
+            # Partial index untuk daftar match yang belum selesai / sudah selesai
+            models.Index(
+                fields=['match_date'],
+                condition=models.Q(home_score__isnull=True) | models.Q(away_score__isnull=True),
+                name='match_unplayed_date_idx',
+            ),
+            models.Index(
+                fields=['-match_date'],
+                condition=models.Q(home_score__isnull=False, away_score__isnull=False),
+                name='match_finished_date_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.home_team} vs {self.away_team} ({self.tournament.name})"
+
+
+class Standing(models.Model):
+    tournament = models.ForeignKey(Tournament, related_name='standings', on_delete=models.CASCADE)
+    team = models.ForeignKey('teams.Team', related_name='standings', on_delete=models.CASCADE)
+    played = models.IntegerField(default=0)
+    wins = models.IntegerField(default=0)
+    draws = models.IntegerField(default=0)
+    losses = models.IntegerField(default=0)
+    goals_for = models.IntegerField(default=0)
+    goals_against = models.IntegerField(default=0)
+    goal_difference = models.IntegerField(default=0)
+    points = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('tournament', 'team')
+        indexes = [
+            models.Index(
+                fields=['tournament', '-points', '-goal_difference', '-goals_for'],
+                name='standing_table_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.team} di {self.tournament.name}: {self.points} poin"
+
+
+class BracketNode(models.Model):
+    """
+    Satu pertandingan di bracket knockout. round mulai dari 1 (ronde pertama) dan
+    position urut dari atas bracket, jadi pemenang node (round, position) masuk ke
+    node (round + 1, position // 2) sebagai home kalau position genap, away kalau ganjil.
+    """
+    tournament = models.ForeignKey(Tournament, related_name='bracket_nodes', on_delete=models.CASCADE)
+    round = models.PositiveSmallIntegerField()
+    position = models.PositiveIntegerField()
+    home_team = models.ForeignKey('teams.Team', related_name='+', on_delete=models.SET_NULL, null=True, blank=True)
+    away_team = models.ForeignKey('teams.Team', related_name='+', on_delete=models.SET_NULL, null=True, blank=True)
+    winner = models.ForeignKey('teams.Team', related_name='+', on_delete=models.SET_NULL, null=True, blank=True)
+    match = models.OneToOneField(
+        Match, related_name='bracket_node', on_delete=models.SET_NULL, null=True, blank=True
+    )
+    # Jadwal ronde ini; match dibuat dengan tanggal ini begitu kedua tim diketahui
+    scheduled_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ('tournament', 'round', 'position')
+        ordering = ('tournament', 'round', 'position')
 
     def __str__(self):
-        return f"{self.home_team} vs {self.away_team} ({self.tournament.name})"
\ No newline at end of file
+        return f"{self.tournament.name} ronde {self.round} #{self.position + 1}"
@@ -0,0 +1,218 @@
+"""
+Generator jadwal otomatis: round-robin (circle method) atau single-elimination.
+
+Pembuatan pasangan murni Python tanpa query, O(jumlah match), jadi ratusan tim
+selesai jauh di bawah satu detik. Setiap ronde mendapat satu hari yang dibagi
+rata antara start_date dan end_date turnamen. Dalam satu ronde setiap tim main
+paling banyak sekali, jadi jarak antar ronde sekaligus menjadi jeda istirahat
+minimum per tim (rest_days). Hasilnya disimpan dengan bulk_create.
+"""
+import math
+import random
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from main.cache import bump_model_version
+
+from .models import Match
+
+ROUND_ROBIN = 'round_robin'
+KNOCKOUT = 'knockout'
+FORMATS = (ROUND_ROBIN, KNOCKOUT)
+DEFAULT_KICKOFF = time(19, 0)
+BULK_BATCH_SIZE = 1000
+
+
+class ScheduleError(ValueError):
+    pass
+
+
+@dataclass
+class Fixture:
+    round: int
+    home_team_id: int
+    away_team_id: int
+    match_date: datetime = None
+
+
+@dataclass
+class Schedule:
+    fixture_format: str
+    team_ids: list
+    dates: list
+    fixtures: list
+    byes: list
+
+
+def round_robin_rounds(team_ids, double=False):
+    """
+    Circle method: tim pertama diam, sisanya berputar satu posisi per ronde.
+    Jumlah tim ganjil diberi bye (None). double=True menambah putaran kedua
+    dengan home/away ditukar. Return list ronde berisi pasangan (home, away).
+    """
+    teams = list(team_ids)
+    if len(teams) < 2:
+        raise ScheduleError('Minimal 2 tim untuk membuat jadwal.')
+    if len(teams) % 2:
+        teams.append(None)
+    n = len(teams)
+    fixed, rotating = teams[0], teams[1:]
+
+    rounds = []
+    for index in range(n - 1):
+        lineup = [fixed] + rotating
+        pairs = []
+        for i in range(n // 2):
+            home, away = lineup[i], lineup[n - 1 - i]
+            # Tukar home/away tiap ronde supaya jumlah laga kandang seimbang
+            if (i == 0 and index % 2) or (i > 0 and i % 2 == 0):
+                home, away = away, home
+            if home is not None and away is not None:
+                pairs.append((home, away))
+        rounds.append(pairs)
+        rotating = rotating[-1:] + rotating[:-1]
+
+    if double:
+        rounds += [[(away, home) for home, away in pairs] for pairs in rounds]
+    return rounds
+
+
+def bracket_positions(size):
+    """
+    Urutan seed di bracket ukuran size (pangkat dua), misalnya 8 → [1, 8, 4, 5, 2, 7, 3, 6],
+    sehingga seed 1 dan 2 baru bisa bertemu di final.
+    """
+    positions = [1]
+    while len(positions) < size:
+        total = len(positions) * 2 + 1
+        positions = [seed for position in positions for seed in (position, total - position)]
+    return positions
+
+
+def knockout_first_round(team_ids):
+    """
+    Ronde pertama bracket single-elimination dengan team_ids urut seed (terbaik dulu).
+    Bracket dibulatkan ke pangkat dua; seed teratas mendapat bye.
+    Return (pasangan (home, away), id tim yang bye, jumlah ronde).
+    """
+    teams = list(team_ids)
+    if len(teams) < 2:
+        raise ScheduleError('Minimal 2 tim untuk membuat jadwal.')
+    size = 1 << (len(teams) - 1).bit_length()
+    positions = bracket_positions(size)
+
+    pairs, byes = [], []
+    for i in range(0, size, 2):
+        high, low = positions[i], positions[i + 1]
+        if low > len(teams):
+            byes.append(teams[high - 1])
+        else:
+            pairs.append((teams[high - 1], teams[low - 1]))
+    return pairs, byes, int(math.log2(size))
+
+
+def round_dates(start_date, end_date, rounds, rest_days=1, kickoff=DEFAULT_KICKOFF):
+    """
+    Tanggal tiap ronde, dibagi rata dari start_date sampai end_date dengan jarak minimal
+    rest_days antar ronde. ScheduleError kalau rentang tanggal tidak cukup.
+    """
+    available = (end_date - start_date).days
+    if rounds > 1 and available < (rounds - 1) * rest_days:
+        needed = (rounds - 1) * rest_days + 1
+        raise ScheduleError(
+            f'{rounds} ronde dengan jeda {rest_days} hari butuh minimal {needed} hari, '
+            f'rentang turnamen hanya {available + 1} hari.'
+        )
+    step = available / (rounds - 1) if rounds > 1 else 0
+    tz = timezone.get_current_timezone()
+    first = timezone.make_aware(datetime.combine(start_date, kickoff), tz)
+    # floor(i * step) menjaga jarak antar ronde >= floor(step) >= rest_days
+    return [first + timedelta(days=math.floor(index * step)) for index in range(rounds)]
+
+
+def seeded_team_ids(tournament, seeding=None, shuffle_seed=None):
+    """
+    Urutan seed peserta: seeding (list id) kalau diberikan, acak kalau shuffle_seed diisi,
+    selain itu urut nama tim.
+    """
+    participant_ids = list(tournament.participants.order_by('name', 'pk').values_list('id', flat=True))
+    if seeding:
+        seeded = set(seeding)
+        if seeded - set(participant_ids) or len(seeded) != len(seeding):
+            raise ScheduleError('Seeding harus berisi id peserta turnamen tanpa duplikat.')
+        return list(seeding) + [team_id for team_id in participant_ids if team_id not in seeded]
+    if shuffle_seed is not None:
+        random.Random(shuffle_seed).shuffle(participant_ids)
+    return participant_ids
+
+
+def build_schedule(tournament, fixture_format=ROUND_ROBIN, seeding=None, shuffle_seed=None,
+                   double=False, rest_days=1, kickoff=DEFAULT_KICKOFF):
+    """
+    Buat Schedule (belum disimpan) untuk turnamen. Untuk knockout fixtures hanya berisi
+    ronde pertama karena peserta ronde berikutnya bergantung hasil; dates berisi tanggal
+    semua ronde.
+    """
+    if fixture_format not in FORMATS:
+        raise ScheduleError(f'Format harus salah satu dari {", ".join(FORMATS)}.')
+    team_ids = seeded_team_ids(tournament, seeding, shuffle_seed)
+
+    if fixture_format == ROUND_ROBIN:
+        rounds, byes = round_robin_rounds(team_ids, double=double), []
+        total_rounds = len(rounds)
+    else:
+        pairs, byes, total_rounds = knockout_first_round(team_ids)
+        rounds = [pairs]
+
+    dates = round_dates(tournament.start_date, tournament.end_date, total_rounds, rest_days, kickoff)
+    fixtures = [
+        Fixture(round=index + 1, home_team_id=home, away_team_id=away, match_date=dates[index])
+        for index, pairs in enumerate(rounds)
+        for home, away in pairs
+    ]
+    return Schedule(fixture_format, team_ids, dates, fixtures, byes)
+
+
+def generate_fixtures(tournament, replace=False, dry_run=False, **options):
+    """
+    Generate lalu simpan jadwal dalam satu transaksi. Round-robin disimpan dengan
+    bulk_create; knockout dibuat sebagai bracket (lihat tournaments.bracket) yang
+    membuat match ronde berikutnya begitu pemenangnya diketahui.
+    Turnamen yang sudah punya match ditolak kecuali replace=True (match dan bracket lama dihapus).
+    Return Schedule; untuk knockout fixtures berisi match yang benar-benar dibuat.
+    """
+    from .bracket import create_bracket
+
+    schedule = build_schedule(tournament, **options)
+    if dry_run:
+        return schedule
+
+    with transaction.atomic():
+        existing = Match.objects.filter(tournament=tournament)
+        if existing.exists() or tournament.bracket_nodes.exists():
+            if not replace:
+                raise ScheduleError('Turnamen sudah memiliki jadwal. Gunakan replace untuk mengganti.')
+            existing.delete()
+            tournament.bracket_nodes.all().delete()
+
+        if schedule.fixture_format == KNOCKOUT:
+            nodes = create_bracket(tournament, schedule.team_ids, schedule.dates)
+            schedule.fixtures = [
+                Fixture(node.round, node.home_team_id, node.away_team_id, node.scheduled_at)
+                for node in nodes if node.match_id
+            ]
+        else:
+            Match.objects.bulk_create([
+                Match(
+                    tournament=tournament,
+                    home_team_id=fixture.home_team_id,
+                    away_team_id=fixture.away_team_id,
+                    match_date=fixture.match_date,
+                ) for fixture in schedule.fixtures
+            ], batch_size=BULK_BATCH_SIZE)
+    # bulk_create tidak memicu post_save
+    bump_model_version(Match._meta.label)
+    return schedule
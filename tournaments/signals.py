@@ -0,0 +1,41 @@
+import logging
+
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .bracket import BracketError, advance_from_match
+from .models import Match
+from .standings import RESULT_FIELDS, match_result, apply_score_change
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(pre_save, sender=Match)
+def remember_previous_result(sender, instance, **kwargs):
+    # Simpan hasil lama supaya post_save bisa menghitung delta
+    instance._previous_result = None
+    if instance.pk:
+        previous = Match.objects.filter(pk=instance.pk).values(*RESULT_FIELDS).first()
+        if previous:
+            instance._previous_result = match_result(previous)
+
+
+@receiver(post_save, sender=Match)
+def update_standings_after_match(sender, instance, **kwargs):
+    apply_score_change(getattr(instance, '_previous_result', None), match_result(instance))
+
+
+@receiver(post_save, sender=Match)
+def advance_bracket_after_match(sender, instance, created, **kwargs):
+    # Hanya kalau hasilnya berubah; match baru belum punya skor untuk diteruskan
+    if created or getattr(instance, '_previous_result', None) == match_result(instance):
+        return
+    try:
+        advance_from_match(instance)
+    except BracketError as e:
+        # Skor tetap tersimpan, bracket dibiarkan apa adanya untuk dibereskan organizer
+        logger.warning('Bracket match %s tidak diteruskan: %s', instance.pk, e)
+
+
+@receiver(post_delete, sender=Match)
+def remove_match_from_standings(sender, instance, **kwargs):
+    apply_score_change(match_result(instance), None)
@@ -0,0 +1,129 @@
+"""
+Tabel klasemen yang disimpan (Standing) dan di-update per delta setiap kali
+skor sebuah Match diisi, diubah, atau dihapus.
+"""
+from django.db import transaction
+from django.db.models import F
+
+from .models import Match, Standing
+
+STANDING_FIELDS = (
+    'played', 'wins', 'draws', 'losses',
+    'goals_for', 'goals_against', 'goal_difference', 'points',
+)
+RESULT_FIELDS = ('tournament_id', 'home_team_id', 'away_team_id', 'home_score', 'away_score')
+
+
+def match_result(match):
+    """
+    Snapshot hasil match sebagai tuple (tournament_id, home_team_id, away_team_id,
+    home_score, away_score), atau None kalau skornya belum lengkap.
+    Bisa menerima instance Match atau dict hasil .values(*RESULT_FIELDS).
+    """
+    if isinstance(match, dict):
+        values = tuple(match[field] for field in RESULT_FIELDS)
+    else:
+        values = tuple(getattr(match, field) for field in RESULT_FIELDS)
+    if values[3] is None or values[4] is None:
+        return None
+    return values
+
+
+def side_delta(goals_for, goals_against, sign=1):
+    """Perubahan baris klasemen satu tim untuk satu match."""
+    won = goals_for > goals_against
+    drawn = goals_for == goals_against
+    return {
+        'played': sign,
+        'wins': sign if won else 0,
+        'draws': sign if drawn else 0,
+        'losses': sign if not (won or drawn) else 0,
+        'goals_for': sign * goals_for,
+        'goals_against': sign * goals_against,
+        'goal_difference': sign * (goals_for - goals_against),
+        'points': sign * (3 if won else 1 if drawn else 0),
+    }
+
+
+def apply_result(result, sign=1):
+    """Tambahkan (sign=1) atau kurangi (sign=-1) satu hasil match ke tabel klasemen."""
+    tournament_id, home_team_id, away_team_id, home_score, away_score = result
+    sides = (
+        (home_team_id, home_score, away_score),
+        (away_team_id, away_score, home_score),
+    )
+    for team_id, goals_for, goals_against in sides:
+        rows = Standing.objects.filter(tournament_id=tournament_id, team_id=team_id)
+        if sign > 0:
+            Standing.objects.get_or_create(tournament_id=tournament_id, team_id=team_id)
+        delta = side_delta(goals_for, goals_against, sign)
+        rows.update(**{field: F(field) + value for field, value in delta.items()})
+
+
+def apply_score_change(previous, current):
+    """Geser klasemen dari hasil lama ke hasil baru. Tidak melakukan apa-apa kalau sama."""
+    if previous == current:
+        return
+    with transaction.atomic():
+        if previous is not None:
+            apply_result(previous, sign=-1)
+        if current is not None:
+            apply_result(current, sign=1)
+
+
+def compute_standings(tournament_ids=None):
+    """
+    Hitung ulang klasemen dari nol dalam satu query ke Match.
+    Return dict {(tournament_id, team_id): {field: value}}.
+    """
+    matches = Match.objects.filter(home_score__isnull=False, away_score__isnull=False)
+    if tournament_ids is not None:
+        matches = matches.filter(tournament_id__in=tournament_ids)
+
+    table = {}
+    for values in matches.values(*RESULT_FIELDS).iterator():
+        tournament_id, home_team_id, away_team_id, home_score, away_score = match_result(values)
+        for team_id, goals_for, goals_against in (
+            (home_team_id, home_score, away_score),
+            (away_team_id, away_score, home_score),
+        ):
+            row = table.setdefault((tournament_id, team_id), dict.fromkeys(STANDING_FIELDS, 0))
+            for field, value in side_delta(goals_for, goals_against).items():
+                row[field] += value
+    return table
+
+
+def rebuild_standings(tournament_ids=None):
+    """Ganti isi tabel Standing dengan hasil hitung ulang. Return jumlah baris yang ditulis."""
+    table = compute_standings(tournament_ids)
+    with transaction.atomic():
+        existing = Standing.objects.all()
+        if tournament_ids is not None:
+            existing = existing.filter(tournament_id__in=tournament_ids)
+        existing.delete()
+        Standing.objects.bulk_create([
+            Standing(tournament_id=tournament_id, team_id=team_id, **row)
+            for (tournament_id, team_id), row in table.items()
+        ])
+    return len(table)
+
+
+def sort_key(row):
+    return (-row['points'], -row['goal_difference'], -row['goals_for'], row['team_name'])
+
+
+def build_leaderboard(tournament):
+    """
+    Leaderboard semua participant turnamen, diurutkan poin, selisih gol, gol, lalu nama.
+    Tim yang belum main tetap muncul dengan angka nol.
+    """
+    standings = {s.team_id: s for s in Standing.objects.filter(tournament=tournament)}
+    leaderboard = []
+    for team in tournament.participants.all():
+        standing = standings.get(team.pk)
+        row = {'team_id': team.pk, 'team_name': team.name, 'team_logo': team.logo}
+        for field in STANDING_FIELDS:
+            row[field] = getattr(standing, field) if standing else 0
+        leaderboard.append(row)
+    leaderboard.sort(key=sort_key)
+    return leaderboard
@@ -1,15 +1,22 @@
 import json
+import os
+import tempfile
+import time
 from datetime import timedelta
+from io import StringIO
 
 from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.test import Client, TestCase
 from django.urls import reverse, resolve
 from django.utils import timezone
 
 from main.models import Profile  
 from teams.models import Team
+from . import bracket, fixtures, scheduler, winners
 from .forms import TournamentForm
-from .models import Match, Tournament
+from .models import BracketNode, Match, Standing, Tournament
 from .views import (
     create_tournament, delete_tournament, deregister_team_view,
     edit_tournament, get_tournament_detail_json, get_tournaments_json,
@@ -715,3 +722,419 @@ class TournamentViewTests(BaseTournamentTestCase):
         response = self.client.post(reverse('tournaments:remove_team', args=[self.ongoing_tournament.pk, self.team3.pk]))
         self.assertEqual(response.status_code, 400)
         self.assertIn("tidak terdaftar", response.json()['message'])
+
+
+class StandingTests(BaseTournamentTestCase):
+
+    def get_standing(self, tournament, team):
+        return Standing.objects.get(tournament=tournament, team=team)
+
+    def test_standings_created_from_finished_match(self):
+        """A finished match creates standing rows for both teams."""
+        home = self.get_standing(self.ongoing_tournament, self.team2)
+        away = self.get_standing(self.ongoing_tournament, self.team1)
+        self.assertEqual((home.played, home.wins, home.points, home.goals_for, home.goal_difference), (1, 1, 3, 2, 1))
+        self.assertEqual((away.played, away.losses, away.points, away.goals_against), (1, 1, 0, 2))
+
+    def test_standings_updated_by_delta_when_score_changes(self):
+        """Changing a score moves the standings from the old result to the new one."""
+        self.match2_ongoing_finished.home_score = 1
+        self.match2_ongoing_finished.away_score = 1
+        self.match2_ongoing_finished.save()
+
+        home = self.get_standing(self.ongoing_tournament, self.team2)
+        away = self.get_standing(self.ongoing_tournament, self.team1)
+        self.assertEqual((home.played, home.wins, home.draws, home.points), (1, 0, 1, 1))
+        self.assertEqual((away.played, away.losses, away.draws, away.points), (1, 0, 1, 1))
+
+    def test_standings_reverted_when_score_cleared_or_match_deleted(self):
+        """Clearing a score or deleting the match removes its contribution."""
+        self.match1_ongoing.home_score = 3
+        self.match1_ongoing.away_score = 0
+        self.match1_ongoing.save()
+        self.assertEqual(self.get_standing(self.ongoing_tournament, self.team1).points, 3)
+
+        self.match1_ongoing.home_score = None
+        self.match1_ongoing.away_score = None
+        self.match1_ongoing.save()
+        self.assertEqual(self.get_standing(self.ongoing_tournament, self.team1).played, 1)
+
+        self.match2_ongoing_finished.delete()
+        standing = self.get_standing(self.ongoing_tournament, self.team1)
+        self.assertEqual((standing.played, standing.goals_for, standing.goals_against), (0, 0, 0))
+
+    def test_rebuild_standings_matches_incremental_table(self):
+        """rebuild_standings recomputes the same table that the signals maintain."""
+        self.match1_ongoing.home_score = 2
+        self.match1_ongoing.away_score = 2
+        self.match1_ongoing.save()
+        fields = ('tournament_id', 'team_id', 'played', 'wins', 'draws', 'losses',
+                  'goals_for', 'goals_against', 'goal_difference', 'points')
+        incremental = sorted(Standing.objects.values_list(*fields))
+
+        Standing.objects.all().update(points=99)
+        out = StringIO()
+        call_command('rebuild_standings', stdout=out)
+
+        self.assertEqual(sorted(Standing.objects.values_list(*fields)), incremental)
+        self.assertIn('Rebuilt standings', out.getvalue())
+
+    def test_detail_json_leaderboard_uses_standings(self):
+        """Leaderboard in the detail endpoint is ordered and includes teams without matches."""
+        self.ongoing_tournament.participants.add(self.team3)
+        response = self.client.get(reverse('tournaments:get_tournament_detail_json', args=[self.ongoing_tournament.pk]))
+        leaderboard = response.json()['leaderboard']
+
+        self.assertEqual([row['team_id'] for row in leaderboard], [self.team2.pk, self.team3.pk, self.team1.pk])
+        self.assertEqual(leaderboard[0]['points'], 3)
+        self.assertEqual(leaderboard[1]['played'], 0)
+
+    def test_update_tournament_winners_uses_standings(self):
+        """The winner command picks the top of the standings table."""
+        finished = Tournament.objects.create(
+            name="Finished League",
+            organizer=self.organizer_user,
+            start_date=self.past_date - timedelta(days=5),
+            end_date=self.past_date,
+        )
+        finished.participants.add(self.team1, self.team2)
+        Match.objects.create(
+            tournament=finished, home_team=self.team1, away_team=self.team2,
+            match_date=self.now - timedelta(days=11), home_score=0, away_score=1
+        )
+
+        call_command('update_tournament_winners', stdout=StringIO())
+
+        finished.refresh_from_db()
+        self.assertEqual(finished.winner, self.team2)
+        self.assertFalse(finished.registration_open)
+
+
+class FixtureImportTests(BaseTournamentTestCase):
+    """Bulk import jadwal lewat endpoint dan management command."""
+
+    def import_url(self, tournament=None):
+        return reverse('tournaments:import_fixtures', args=[(tournament or self.ongoing_tournament).pk])
+
+    def test_csv_import_creates_matches_and_updates_standings(self):
+        self.client.login(username=self.organizer_user.username, password="password")
+        body = (
+            "home_team,away_team,match_date,home_score,away_score\n"
+            f"{self.team1.pk},team beta,2030-01-01 19:00,,\n"
+            f"Team Beta,Team Alpha,2030-01-08,0,3\n"
+        )
+        before = Match.objects.filter(tournament=self.ongoing_tournament).count()
+        response = self.client.post(self.import_url(), body, content_type='text/csv')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['created'], 2)
+        self.assertEqual(Match.objects.filter(tournament=self.ongoing_tournament).count(), before + 2)
+        standing = Standing.objects.get(tournament=self.ongoing_tournament, team=self.team1)
+        self.assertEqual(standing.played, 2)
+        self.assertEqual(standing.wins, 1)
+
+    def test_invalid_rows_are_reported_and_nothing_is_saved(self):
+        self.client.login(username=self.organizer_user.username, password="password")
+        rows = [
+            {'home_team': self.team1.pk, 'away_team': self.team2.pk, 'match_date': '2030-01-01'},
+            {'home_team': self.team1.pk, 'away_team': self.team3.pk, 'match_date': '2030-01-02'},
+            {'home_team': self.team1.pk, 'away_team': self.team1.pk, 'match_date': 'besok'},
+            {'home_team': self.team2.pk, 'away_team': self.team1.pk, 'match_date': '2030-01-03', 'home_score': 1},
+        ]
+        before = Match.objects.count()
+        response = self.client.post(self.import_url(), json.dumps({'matches': rows}), content_type='application/json')
+
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()['errors']
+        self.assertEqual([error['row'] for error in errors], [2, 3, 4])
+        self.assertIn('tidak terdaftar', errors[0]['errors'][0])
+        self.assertEqual(len(errors[1]['errors']), 2)
+        self.assertEqual(Match.objects.count(), before)
+
+    def test_participants_are_loaded_in_one_query(self):
+        rows = [
+            {'home_team': self.team1.pk, 'away_team': self.team2.pk, 'match_date': f'2030-01-{day:02d}'}
+            for day in range(1, 21)
+        ]
+        with self.assertNumQueries(1):
+            matches, errors = fixtures.validate_rows(self.ongoing_tournament, rows)
+        self.assertEqual((len(matches), errors), (20, []))
+
+    def test_import_requires_organizer_or_admin(self):
+        body = json.dumps([{'home_team': self.team1.pk, 'away_team': self.team2.pk, 'match_date': '2030-01-01'}])
+        response = self.client.post(self.import_url(), body, content_type='application/json')
+        self.assertEqual(response.status_code, 401)
+
+        self.client.login(username=self.player_user.username, password="password")
+        response = self.client.post(self.import_url(), body, content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+
+        self.client.login(username=self.admin_user.username, password="password")
+        response = self.client.post(self.import_url() + '?dry_run=1', body, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['created'], 0)
+
+    def test_import_fixtures_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as handle:
+            handle.write("home_team,away_team,match_date\nTeam Alpha,Team Beta,2030-02-01 15:30\n")
+        self.addCleanup(os.remove, handle.name)
+
+        out = StringIO()
+        call_command('import_fixtures', self.ongoing_tournament.pk, handle.name, stdout=out)
+
+        self.assertIn('Imported 1 matches', out.getvalue())
+        self.assertTrue(Match.objects.filter(
+            tournament=self.ongoing_tournament, home_team=self.team1, match_date__year=2030
+        ).exists())
+
+    def test_non_utf8_file_is_rejected(self):
+        content = "home_team,away_team,match_date\nTeam Alpha,Équipe Beta,2030-02-01\n".encode('latin-1')
+        self.client.login(username=self.organizer_user.username, password="password")
+        response = self.client.post(self.import_url(), content, content_type='text/csv')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('UTF-8', response.json()['message'])
+
+        with tempfile.NamedTemporaryFile('wb', suffix='.csv', delete=False) as handle:
+            handle.write(content)
+        self.addCleanup(os.remove, handle.name)
+        with self.assertRaisesMessage(CommandError, 'not UTF-8 encoded'):
+            call_command('import_fixtures', self.ongoing_tournament.pk, handle.name, stdout=StringIO())
+
+
+class FixtureGeneratorTests(BaseTournamentTestCase):
+    """Generator jadwal round-robin dan knockout."""
+
+    def test_round_robin_every_pair_plays_exactly_once(self):
+        for count in (2, 3, 8, 15, 64):
+            rounds = scheduler.round_robin_rounds(range(count))
+            pairs = [frozenset(pair) for matches in rounds for pair in matches]
+            self.assertEqual(len(pairs), count * (count - 1) // 2)
+            self.assertEqual(len(set(pairs)), len(pairs))
+            # Setiap tim main paling banyak sekali per ronde
+            for matches in rounds:
+                teams = [team for pair in matches for team in pair]
+                self.assertEqual(len(teams), len(set(teams)))
+
+    def test_double_round_robin_swaps_home_and_away(self):
+        rounds = scheduler.round_robin_rounds(range(6), double=True)
+        fixtures = [pair for matches in rounds for pair in matches]
+        self.assertEqual(len(fixtures), 30)
+        self.assertEqual(len(set(fixtures)), 30)
+
+    def test_hundreds_of_teams_is_fast(self):
+        started = time.perf_counter()
+        rounds = scheduler.round_robin_rounds(range(400))
+        self.assertLess(time.perf_counter() - started, 1)
+        self.assertEqual(len(rounds), 399)
+
+    def test_knockout_seeding_and_byes(self):
+        self.assertEqual(scheduler.bracket_positions(8), [1, 8, 4, 5, 2, 7, 3, 6])
+        pairs, byes, rounds = scheduler.knockout_first_round([10, 20, 30, 40, 50, 60])
+        self.assertEqual(byes, [10, 20])
+        self.assertEqual(pairs, [(40, 50), (30, 60)])
+        self.assertEqual(rounds, 3)
+
+    def test_round_dates_respect_rest_days(self):
+        start = self.today
+        dates = scheduler.round_dates(start, start + timedelta(days=10), 4, rest_days=3)
+        self.assertEqual(timezone.localtime(dates[0]).date(), start)
+        self.assertEqual(timezone.localtime(dates[-1]).date(), start + timedelta(days=10))
+        gaps = [(later - earlier).days for earlier, later in zip(dates, dates[1:])]
+        self.assertTrue(all(gap >= 3 for gap in gaps))
+
+        with self.assertRaises(scheduler.ScheduleError):
+            scheduler.round_dates(start, start + timedelta(days=5), 4, rest_days=2)
+
+    def test_generate_endpoint_bulk_inserts_schedule(self):
+        tournament = Tournament.objects.create(
+            name="Generated League", organizer=self.organizer_user,
+            start_date=self.future_date, end_date=self.future_date_plus_20,
+        )
+        tournament.participants.add(self.team1, self.team2, self.team3)
+        self.client.login(username=self.organizer_user.username, password="password")
+
+        response = self.client.post(
+            reverse('tournaments:generate_fixtures', args=[tournament.pk]),
+            json.dumps({'format': 'round_robin', 'rest_days': 2}), content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['rounds'], 3)
+        matches = Match.objects.filter(tournament=tournament)
+        self.assertEqual(matches.count(), 3)
+        self.assertEqual(
+            {frozenset((m.home_team_id, m.away_team_id)) for m in matches},
+            {frozenset((self.team1.pk, self.team2.pk)), frozenset((self.team1.pk, self.team3.pk)),
+             frozenset((self.team2.pk, self.team3.pk))},
+        )
+
+        # Jadwal yang sudah ada tidak ditimpa tanpa replace
+        response = self.client.post(
+            reverse('tournaments:generate_fixtures', args=[tournament.pk]),
+            json.dumps({}), content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_generate_fixtures_rejects_invalid_shuffle_seed(self):
+        self.client.login(username=self.organizer_user.username, password="password")
+        url = reverse('tournaments:generate_fixtures', args=[self.ongoing_tournament.pk])
+        for seed in ([1, 2], {'a': 1}, 1.5, True):
+            response = self.client.post(
+                url, json.dumps({'shuffle_seed': seed, 'dry_run': True}), content_type='application/json'
+            )
+            self.assertEqual(response.status_code, 400, seed)
+
+        response = self.client.post(
+            url, json.dumps({'shuffle_seed': 'liga-2030', 'dry_run': True}), content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_generate_fixtures_command_knockout_dry_run(self):
+        out = StringIO()
+        call_command('generate_fixtures', self.ongoing_tournament.pk, '--format', 'knockout', '--dry-run', stdout=out)
+        self.assertIn('1 matches in 1 round(s)', out.getvalue())
+
+
+class BracketTests(BaseTournamentTestCase):
+    """Bracket knockout: pembuatan, progres pemenang, tiebreak, dan tree JSON."""
+
+    def setUp(self):
+        self.teams = [Team.objects.create(name=f"Bracket Team {i}") for i in range(1, 6)]
+        self.tournament = Tournament.objects.create(
+            name="Knockout Cup", organizer=self.organizer_user,
+            start_date=self.future_date, end_date=self.future_date_plus_20,
+        )
+        self.tournament.participants.add(*self.teams)
+        scheduler.generate_fixtures(
+            self.tournament, fixture_format=scheduler.KNOCKOUT, seeding=[team.pk for team in self.teams]
+        )
+
+    def node(self, round_number, position):
+        return BracketNode.objects.select_related('match').get(
+            tournament=self.tournament, round=round_number, position=position
+        )
+
+    def play(self, node, home_score, away_score):
+        match = node.match
+        match.home_score, match.away_score = home_score, away_score
+        match.save()
+
+    def test_create_bracket_with_byes(self):
+        # 5 tim → bracket 8: seed 1, 2, 3 bye; seed 2 vs 3 sudah bisa dijadwalkan di ronde 2
+        self.assertEqual(BracketNode.objects.filter(tournament=self.tournament).count(), 7)
+        first = self.node(1, 1)
+        self.assertEqual((first.home_team, first.away_team), (self.teams[3], self.teams[4]))
+        self.assertEqual(self.node(1, 0).winner, self.teams[0])
+        second = self.node(2, 1)
+        self.assertEqual((second.home_team, second.away_team), (self.teams[1], self.teams[2]))
+        self.assertIsNotNone(second.match)
+        self.assertEqual(Match.objects.filter(tournament=self.tournament).count(), 2)
+
+    def test_score_entry_advances_winner_to_champion(self):
+        self.play(self.node(1, 1), 0, 2)
+        semifinal = self.node(2, 0)
+        self.assertEqual((semifinal.home_team, semifinal.away_team), (self.teams[0], self.teams[4]))
+        self.assertEqual(timezone.localtime(semifinal.match.match_date), timezone.localtime(semifinal.scheduled_at))
+
+        self.play(semifinal, 3, 1)
+        self.play(self.node(2, 1), 1, 0)
+        final = self.node(3, 0)
+        self.play(final, 2, 0)
+
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.winner, self.teams[0])
+
+    def test_corrected_score_replaces_unplayed_next_match(self):
+        self.play(self.node(1, 1), 2, 0)
+        old_match_id = self.node(2, 0).match_id
+        self.play(self.node(1, 1), 0, 2)
+
+        semifinal = self.node(2, 0)
+        self.assertEqual(semifinal.away_team, self.teams[4])
+        self.assertNotEqual(semifinal.match_id, old_match_id)
+        self.assertFalse(Match.objects.filter(pk=old_match_id).exists())
+
+    def test_draw_needs_tiebreak_winner(self):
+        node = self.node(1, 1)
+        self.play(node, 1, 1)
+        self.assertIsNone(self.node(2, 0).away_team)
+
+        url = reverse('tournaments:set_bracket_winner', args=[self.tournament.pk, node.pk])
+        self.client.login(username=self.player_user.username, password="password")
+        self.assertEqual(self.client.post(url, json.dumps({'team_id': self.teams[3].pk}),
+                                          content_type='application/json').status_code, 403)
+
+        self.client.login(username=self.organizer_user.username, password="password")
+        response = self.client.post(url, json.dumps({'team_id': self.team1.pk}), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(url, json.dumps({'team_id': self.teams[3].pk}), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.node(2, 0).away_team, self.teams[3])
+
+    def test_bracket_tree_in_one_query(self):
+        self.play(self.node(1, 1), 0, 2)
+        with self.assertNumQueries(1):
+            tree = bracket.bracket_tree(self.tournament.pk)
+
+        self.assertEqual(tree['total_rounds'], 3)
+        self.assertEqual([r['name'] for r in tree['rounds']], ['Perempat Final', 'Semifinal', 'Final'])
+        self.assertEqual([len(r['nodes']) for r in tree['rounds']], [4, 2, 1])
+        self.assertEqual(tree['rounds'][0]['nodes'][1]['status'], 'decided')
+        self.assertEqual(tree['rounds'][0]['nodes'][1]['next'], {'round': 2, 'position': 0, 'slot': 'away'})
+
+        response = self.client.get(reverse('tournaments:get_bracket_json', args=[self.tournament.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['rounds'][1]['nodes'][0]['away_team']['id'], self.teams[4].pk)
+        response = self.client.get(reverse('tournaments:get_bracket_json', args=[self.ongoing_tournament.pk]))
+        self.assertEqual(response.status_code, 404)
+
+
+class TournamentWinnerBatchTests(BaseTournamentTestCase):
+    """Batch update_tournament_winners: satu query standings dan satu bulk update."""
+
+    def finished_league(self, name, home_score, away_score):
+        tournament = Tournament.objects.create(
+            name=name, organizer=self.organizer_user,
+            start_date=self.past_date - timedelta(days=5), end_date=self.past_date,
+        )
+        tournament.participants.add(self.team1, self.team2)
+        Match.objects.create(
+            tournament=tournament, home_team=self.team1, away_team=self.team2,
+            match_date=self.now - timedelta(days=11), home_score=home_score, away_score=away_score
+        )
+        return tournament
+
+    def test_compute_winners_in_one_query_across_chunks(self):
+        first = self.finished_league("League A", 2, 0)
+        second = self.finished_league("League B", 0, 1)
+        ids = winners.candidate_ids()
+        self.assertEqual(ids, [first.pk, second.pk])
+
+        with self.assertNumQueries(1):
+            result = winners.compute_winners(ids)
+        self.assertEqual(result, {first.pk: (self.team1.pk, self.team1.name), second.pk: (self.team2.pk, self.team2.name)})
+        self.assertEqual(winners.compute_winners_parallel(ids, chunk_size=1), result)
+
+    def test_command_dry_run_and_bulk_assign(self):
+        first = self.finished_league("League A", 2, 0)
+        empty = Tournament.objects.create(
+            name="Empty League", organizer=self.organizer_user,
+            start_date=self.past_date - timedelta(days=5), end_date=self.past_date,
+        )
+
+        out = StringIO()
+        call_command('update_tournament_winners', '--dry-run', stdout=out)
+        first.refresh_from_db()
+        self.assertIsNone(first.winner)
+        self.assertIn('1 tournament winners would be assigned', out.getvalue())
+        self.assertIn('Skipping 1 tournaments', out.getvalue())
+
+        out = StringIO()
+        call_command('update_tournament_winners', '--chunk-size', '1', stdout=out)
+        first.refresh_from_db()
+        empty.refresh_from_db()
+        self.assertEqual(first.winner, self.team1)
+        self.assertFalse(first.registration_open)
+        self.assertIsNone(empty.winner)
+        self.assertIn('Timings: select', out.getvalue())
+        self.assertIn('Updated 1 tournament winners', out.getvalue())
@@ -16,4 +16,8 @@ urlpatterns = [
     path('search_teams/', views.search_teams_json, name='search_teams_json'),
     path('<int:tournament_id>/deregister_team/', views.deregister_team_view, name='deregister_team'),
     path('<int:tournament_id>/remove_team/<int:team_id>/', views.remove_team_view, name='remove_team'),
+    path('<int:tournament_id>/fixtures/import/', views.import_fixtures_view, name='import_fixtures'),
+    path('<int:tournament_id>/fixtures/generate/', views.generate_fixtures_view, name='generate_fixtures'),
+    path('json/<int:tournament_id>/bracket/', views.get_bracket_json, name='get_bracket_json'),
+    path('<int:tournament_id>/bracket/<int:node_id>/winner/', views.set_bracket_winner_view, name='set_bracket_winner'),
 ]
\ No newline at end of file
@@ -1,19 +1,25 @@
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse, HttpResponseForbidden, Http404
+from django.http import HttpResponseForbidden, Http404
+from main.responses import JsonResponse, LocalTimeFormatter
 from django.urls import reverse
 from django.db import models
-from django.db.models import Prefetch, Q, Count, Sum, F, Case, When
-from django.db.models.functions import Coalesce
+from django.db.models import Prefetch, Q, Case, When
 from django.utils import timezone
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_POST, require_http_methods
+from django.views.decorators.csrf import csrf_exempt
 from django.http import HttpResponseRedirect
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 import traceback 
 import json
 
-from .models import Tournament, Match
+from .models import BracketNode, Tournament, Match
 from .forms import TournamentForm
+from .standings import build_leaderboard
+from . import bracket, fixtures, scheduler
+from main.cache import cache_json_response
+from main.pagination import InvalidCursor, cursor_paginate, wants_cursor
+from main.replicas import read_from_replica
 from teams.models import Team
 
 def tournament_home(request):
@@ -23,6 +29,20 @@ def tournament_home(request):
     }
     return render(request, 'tournaments/tournament_list.html', context)
 
+def tournament_list_item(t):
+    return {
+        'id': t.pk,
+        'name': t.name,
+        'description': t.description[:100] + '...' if t.description and len(t.description) > 100 else t.description,
+        'organizer': t.organizer.username,
+        'start_date': t.start_date.strftime('%d %b %Y'),
+        'end_date': t.end_date.strftime('%d %b %Y'),
+        'banner_url': t.banner,
+        'detail_page_url': reverse('tournaments:tournament_detail_page', args=[t.pk])
+    }
+
+@cache_json_response('tournaments.Tournament')
+@read_from_replica
 def get_tournaments_json(request):
     queryset = Tournament.objects.select_related('organizer').all()
     today = timezone.now().date()
@@ -41,9 +61,23 @@ def get_tournaments_json(request):
     if search_query:
         queryset = queryset.filter(Q(name__icontains=search_query))
 
+    PER_PAGE = 9 
+
+    if wants_cursor(request):
+        try:
+            page_items, next_cursor = cursor_paginate(
+                queryset, ('-start_date', 'name', 'pk'), request.GET.get('cursor'), PER_PAGE
+            )
+        except InvalidCursor as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        return JsonResponse({
+            'tournaments': [tournament_list_item(t) for t in page_items],
+            'has_next_page': next_cursor is not None,
+            'next_cursor': next_cursor,
+        })
+
     tournaments_list = queryset.order_by('-start_date', 'name')
     
-    PER_PAGE = 9 
     page_number = request.GET.get('page', 1)
     paginator = Paginator(tournaments_list, PER_PAGE)
     
@@ -54,18 +88,7 @@ def get_tournaments_json(request):
     except EmptyPage:
         page_obj = paginator.page(paginator.num_pages)
 
-    data = []
-    for t in page_obj: 
-        data.append({
-            'id': t.pk,
-            'name': t.name,
-            'description': t.description[:100] + '...' if t.description and len(t.description) > 100 else t.description,
-            'organizer': t.organizer.username,
-            'start_date': t.start_date.strftime('%d %b %Y'),
-            'end_date': t.end_date.strftime('%d %b %Y'),
-            'banner_url': t.banner,
-            'detail_page_url': reverse('tournaments:tournament_detail_page', args=[t.pk])
-        })
+    data = [tournament_list_item(t) for t in page_obj]
     
     return JsonResponse({
         'tournaments': data,
@@ -129,6 +152,8 @@ def tournament_detail_page(request, tournament_id):
     }
     return render(request, 'tournaments/tournament_detail.html', context)
 
+@cache_json_response('tournaments.Tournament', 'tournaments.Match', 'teams.Team')
+@read_from_replica
 def get_tournament_detail_json(request, tournament_id):
     try:
         tournament = get_object_or_404(
@@ -139,9 +164,10 @@ def get_tournament_detail_json(request, tournament_id):
             pk=tournament_id
         )
 
+        to_local = LocalTimeFormatter().local
         match_data = []
         for match in tournament.matches.all(): 
-            local_match_time = timezone.localtime(match.match_date)
+            local_match_time = to_local(match.match_date)
             is_finished = match.home_score is not None and match.away_score is not None
             
             match_data.append({
@@ -153,91 +179,13 @@ def get_tournament_detail_json(request, tournament_id):
                 'away_score': match.away_score,
                 'is_finished': is_finished
             })
-        home_win = Q(home_score__gt=F('away_score'))
-        home_draw = Q(home_score=F('away_score'))
-        home_loss = Q(home_score__lt=F('away_score'))
-        
-        away_win = Q(away_score__gt=F('home_score'))
-        away_draw = Q(away_score=F('home_score'))
-        away_loss = Q(away_score__lt=F('home_score'))
-
-        home_matches = Match.objects.filter(
-            home_team=models.OuterRef('pk'),
-            tournament=tournament,
-            home_score__isnull=False
-        ).values('home_team') 
-
-        home_wins_sub = home_matches.annotate(c=Count('pk', filter=home_win)).values('c')
-        home_draws_sub = home_matches.annotate(c=Count('pk', filter=home_draw)).values('c')
-        home_losses_sub = home_matches.annotate(c=Count('pk', filter=home_loss)).values('c')
-        home_gf_sub = home_matches.annotate(s=Sum('home_score')).values('s')
-        home_ga_sub = home_matches.annotate(s=Sum('away_score')).values('s')
-
-        away_matches = Match.objects.filter(
-            away_team=models.OuterRef('pk'),
-            tournament=tournament,
-            home_score__isnull=False
-        ).values('away_team') 
-
-        away_wins_sub = away_matches.annotate(c=Count('pk', filter=away_win)).values('c')
-        away_draws_sub = away_matches.annotate(c=Count('pk', filter=away_draw)).values('c')
-        away_losses_sub = away_matches.annotate(c=Count('pk', filter=away_loss)).values('c')
-        away_gf_sub = away_matches.annotate(s=Sum('away_score')).values('s')
-        away_ga_sub = away_matches.annotate(s=Sum('home_score')).values('s')
-
-        leaderboard_queryset = tournament.participants.all().annotate(
-            h_wins=Coalesce(models.Subquery(home_wins_sub, output_field=models.IntegerField()), 0),
-            h_draws=Coalesce(models.Subquery(home_draws_sub, output_field=models.IntegerField()), 0),
-            h_losses=Coalesce(models.Subquery(home_losses_sub, output_field=models.IntegerField()), 0),
-            h_gf=Coalesce(models.Subquery(home_gf_sub, output_field=models.IntegerField()), 0),
-            h_ga=Coalesce(models.Subquery(home_ga_sub, output_field=models.IntegerField()), 0),
-            
-            a_wins=Coalesce(models.Subquery(away_wins_sub, output_field=models.IntegerField()), 0),
-            a_draws=Coalesce(models.Subquery(away_draws_sub, output_field=models.IntegerField()), 0),
-            a_losses=Coalesce(models.Subquery(away_losses_sub, output_field=models.IntegerField()), 0),
-            a_gf=Coalesce(models.Subquery(away_gf_sub, output_field=models.IntegerField()), 0),
-            a_ga=Coalesce(models.Subquery(away_ga_sub, output_field=models.IntegerField()), 0),
-        
-        ).annotate(
-            wins=F('h_wins') + F('a_wins'),
-            draws=F('h_draws') + F('a_draws'),
-            losses=F('h_losses') + F('a_losses'),
-            goals_for=F('h_gf') + F('a_gf'),
-            goals_against=F('h_ga') + F('a_ga')
-        ).annotate(
-            played=F('wins') + F('draws') + F('losses'),
-            goal_difference=F('goals_for') - F('goals_against'),
-            points=(F('wins') * 3) + F('draws')
-        ).order_by(
-            '-points', 
-            '-goal_difference', 
-            '-goals_for', 
-            'name'
-        ).values(
-            team_id=F('id'), 
-            team_name=F('name'), 
-            team_logo=F('logo'),
-            played=F('played'), 
-            wins=F('wins'), 
-            draws=F('draws'), 
-            losses=F('losses'), 
-            goals_for=F('goals_for'), 
-            goals_against=F('goals_against'), 
-            goal_difference=F('goal_difference'), 
-            points=F('points')
-        )
-        
-        leaderboard_data = list(leaderboard_queryset)
+        leaderboard_data = build_leaderboard(tournament)
 
         participant_data = [
             {'id': team.pk, 'name': team.name, 'logo_url': team.logo if team.logo else None}
             for team in tournament.participants.all()
         ]
 
-        print(f"DEBUG: Participant data for tournament {tournament_id}: {participant_data}")
-        print(f"DEBUG: Leaderboard data for tournament {tournament_id}: {leaderboard_data}")
-
-
         is_organizer_or_admin = False
         if request.user.is_authenticated:
             profile = getattr(request.user, 'profile', None)
@@ -544,4 +492,160 @@ def remove_team_view(request, tournament_id, team_id):
     return JsonResponse({
         'status': 'success',
         'message': f'Tim "{team_to_remove.name}" berhasil dihapus dari turnamen.'
-    }, status=200)
\ No newline at end of file
+    }, status=200)
+
+def can_manage_fixtures(user, tournament):
+    profile = getattr(user, 'profile', None)
+    is_admin = (profile and profile.role == 'ADMIN') or user.is_superuser
+    return is_admin or user == tournament.organizer
+
+
+@csrf_exempt
+@require_POST
+def import_fixtures_view(request, tournament_id):
+    """
+    Upload jadwal massal: file CSV/JSON di field "file", atau body JSON langsung.
+    ?dry_run=1 hanya memvalidasi. Semua baris disimpan sekaligus atau tidak sama sekali.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({'status': 'error', 'message': 'Anda harus login.'}, status=401)
+
+    tournament = get_object_or_404(Tournament, pk=tournament_id)
+    if not can_manage_fixtures(request.user, tournament):
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Akses ditolak: Hanya organizer atau admin yang dapat mengimpor jadwal.'
+        }, status=403)
+
+    upload = request.FILES.get('file')
+    if upload:
+        file_format = 'json' if upload.name.lower().endswith('.json') else 'csv'
+        raw = upload.read()
+    else:
+        file_format = 'csv' if 'csv' in request.content_type else 'json'
+        raw = request.body
+
+    try:
+        content = raw.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return JsonResponse({'status': 'error', 'message': 'File jadwal harus berenkode UTF-8.'}, status=400)
+
+    try:
+        rows = fixtures.parse_fixture_file(content, file_format)
+    except fixtures.FixtureFormatError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+
+    dry_run = request.GET.get('dry_run') in ('1', 'true')
+    created, errors = fixtures.import_fixtures(tournament, rows, dry_run=dry_run)
+    if errors:
+        return JsonResponse({
+            'status': 'error',
+            'message': f'{len(errors)} dari {len(rows)} baris tidak valid, tidak ada match yang disimpan.',
+            'errors': errors,
+        }, status=400)
+    return JsonResponse({
+        'status': 'success',
+        'message': 'Validasi berhasil.' if dry_run else f'{created} pertandingan berhasil diimpor.',
+        'rows': len(rows),
+        'created': created,
+    }, status=200 if dry_run else 201)
+
+
+@csrf_exempt
+@require_POST
+def generate_fixtures_view(request, tournament_id):
+    """
+    Generate jadwal otomatis dari peserta turnamen. Body JSON (semua opsional):
+    format (round_robin/knockout), double, rest_days, seeding (list id tim), shuffle_seed,
+    replace, dry_run.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({'status': 'error', 'message': 'Anda harus login.'}, status=401)
+
+    tournament = get_object_or_404(Tournament, pk=tournament_id)
+    if not can_manage_fixtures(request.user, tournament):
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Akses ditolak: Hanya organizer atau admin yang dapat membuat jadwal.'
+        }, status=403)
+
+    try:
+        data = json.loads(request.body or b'{}')
+        options = {
+            'fixture_format': data.get('format', scheduler.ROUND_ROBIN),
+            'double': bool(data.get('double', False)),
+            'rest_days': int(data.get('rest_days', 1)),
+            'seeding': [int(team_id) for team_id in data.get('seeding') or []],
+            'shuffle_seed': data.get('shuffle_seed'),
+        }
+        if options['rest_days'] < 0:
+            raise ValueError
+        # Diteruskan ke random.Random; list/dict akan gagal di sana
+        seed = options['shuffle_seed']
+        if seed is not None and (isinstance(seed, bool) or not isinstance(seed, (int, str))):
+            raise ValueError
+    except (json.JSONDecodeError, TypeError, ValueError, AttributeError):
+        return JsonResponse({'status': 'error', 'message': 'Parameter tidak valid.'}, status=400)
+
+    dry_run = bool(data.get('dry_run', False))
+    try:
+        schedule = scheduler.generate_fixtures(
+            tournament, replace=bool(data.get('replace', False)), dry_run=dry_run, **options
+        )
+    except scheduler.ScheduleError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+
+    return JsonResponse({
+        'status': 'success',
+        'message': f'{len(schedule.fixtures)} pertandingan ' + ('akan dibuat.' if dry_run else 'berhasil dibuat.'),
+        'created': 0 if dry_run else len(schedule.fixtures),
+        'rounds': len(schedule.dates),
+        'byes': schedule.byes,
+        'fixtures': [{
+            'round': fixture.round,
+            'home_team_id': fixture.home_team_id,
+            'away_team_id': fixture.away_team_id,
+            'match_date': fixture.match_date.isoformat(),
+        } for fixture in schedule.fixtures] if dry_run else [],
+    }, status=200 if dry_run else 201)
+
+
+@cache_json_response('tournaments.BracketNode', 'tournaments.Match', 'teams.Team')
+def get_bracket_json(request, tournament_id):
+    """Tree bracket knockout lengkap (semua ronde) dari satu query."""
+    tree = bracket.bracket_tree(tournament_id)
+    if tree is None:
+        get_object_or_404(Tournament, pk=tournament_id)
+        return JsonResponse({'status': 'error', 'message': 'Turnamen ini tidak memiliki bracket.'}, status=404)
+    return JsonResponse(tree)
+
+
+@csrf_exempt
+@require_POST
+def set_bracket_winner_view(request, tournament_id, node_id):
+    """Tetapkan pemenang tiebreak untuk pertandingan bracket yang berakhir seri. Body JSON: team_id."""
+    if not request.user.is_authenticated:
+        return JsonResponse({'status': 'error', 'message': 'Anda harus login.'}, status=401)
+
+    node = get_object_or_404(
+        BracketNode.objects.select_related('tournament', 'match'), pk=node_id, tournament_id=tournament_id
+    )
+    if not can_manage_fixtures(request.user, node.tournament):
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Akses ditolak: Hanya organizer atau admin yang dapat menetapkan pemenang.'
+        }, status=403)
+    if node.match is None or not bracket.is_draw(node.match):
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Pemenang tiebreak hanya bisa ditetapkan untuk pertandingan yang berakhir seri.'
+        }, status=400)
+
+    try:
+        team_id = int(json.loads(request.body or b'{}').get('team_id'))
+        bracket.set_winner(node, team_id)
+    except (json.JSONDecodeError, TypeError, ValueError, AttributeError) as e:
+        message = str(e) if isinstance(e, bracket.BracketError) else 'team_id tidak valid.'
+        return JsonResponse({'status': 'error', 'message': message}, status=400)
+
+    return JsonResponse({'status': 'success', 'message': 'Pemenang tiebreak berhasil ditetapkan.', 'winner_id': team_id})
@@ -0,0 +1,93 @@
+"""
+Penetapan juara untuk turnamen liga yang sudah selesai (update_tournament_winners).
+
+Juara diambil dari tabel Standing dengan satu query terurut untuk seluruh
+kandidat, lalu semua turnamen diupdate dengan bulk_update. Perhitungan juara
+bisa dibagi ke beberapa proses (workers) per potongan id turnamen; penulisan
+tetap satu kali di proses utama.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from main.cache import bump_model_version
+
+from .models import Standing, Tournament
+
+WINNER_CHUNK_SIZE = 500
+
+
+def candidate_ids(today=None):
+    """Turnamen liga yang sudah berakhir dan belum punya juara (bracket punya juara dari final)."""
+    today = today or timezone.now().date()
+    return list(
+        Tournament.objects.filter(end_date__lt=today, winner__isnull=True, bracket_nodes__isnull=True)
+        .order_by('pk').values_list('pk', flat=True)
+    )
+
+
+def compute_winners(tournament_ids):
+    """
+    {tournament_id: (team_id, team_name)} dari satu query Standing. Urutan sama dengan
+    build_leaderboard (poin, selisih gol, gol, nama); hanya peserta yang sudah main yang
+    dihitung, jadi turnamen tanpa pertandingan tidak mendapat juara.
+    """
+    rows = (
+        Standing.objects.filter(tournament_id__in=tournament_ids, played__gt=0, team__tournaments=F('tournament'))
+        .order_by('tournament_id', '-points', '-goal_difference', '-goals_for', 'team__name')
+        .values_list('tournament_id', 'team_id', 'team__name')
+    )
+    winners = {}
+    for tournament_id, team_id, team_name in rows:
+        winners.setdefault(tournament_id, (team_id, team_name))
+    return winners
+
+
+def _init_worker():
+    django.setup()
+
+
+def _compute_chunk(tournament_ids):
+    try:
+        return compute_winners(tournament_ids)
+    finally:
+        connections.close_all()
+
+
+def compute_winners_parallel(tournament_ids, workers=1, chunk_size=WINNER_CHUNK_SIZE):
+    """compute_winners per potongan; workers > 1 memakai process pool dengan koneksi DB sendiri."""
+    chunks = [tournament_ids[i:i + chunk_size] for i in range(0, len(tournament_ids), chunk_size)]
+    if workers <= 1 or len(chunks) <= 1:
+        results = map(compute_winners, chunks)
+    else:
+        # Koneksi tidak boleh diwarisi proses anak
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            results = list(pool.map(_compute_chunk, chunks))
+
+    winners = {}
+    for result in results:
+        winners.update(result)
+    return winners
+
+
+def assign_winners(winners, batch_size=WINNER_CHUNK_SIZE):
+    """Simpan juara dan tutup registrasi untuk semua turnamen sekaligus. Return jumlah yang diupdate."""
+    if not winners:
+        return 0
+    now = timezone.now()
+    tournaments = [
+        # bulk_update tidak mengisi auto_now, updated_at diisi manual untuk sync delta
+        Tournament(pk=tournament_id, winner_id=team_id, registration_open=False, updated_at=now)
+        for tournament_id, (team_id, _) in winners.items()
+    ]
+    with transaction.atomic():
+        updated = Tournament.objects.bulk_update(
+            tournaments, ['winner', 'registration_open', 'updated_at'], batch_size=batch_size
+        )
+    # bulk_update tidak memicu post_save
+    bump_model_version(Tournament._meta.label)
+    return updated
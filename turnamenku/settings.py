@@ -59,6 +59,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Paling luar supaya waktu total mencakup semua middleware lain
+    'main.profiling.ProfilingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -66,6 +68,8 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # Butuh request.user; tidak aktif kalau alias 'replica' tidak dikonfigurasi
+    'main.replicas.ReplicaPinningMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -103,6 +107,14 @@ WSGI_APPLICATION = 'turnamenku.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Koneksi ke DB production (remote):
+# - DB_CONN_MAX_AGE: umur koneksi persistent dalam detik (0 = buka-tutup tiap request)
+# - DB_CONN_HEALTH_CHECKS: cek koneksi persistent sebelum dipakai ulang di request baru
+# - DB_POOL: pakai pool bawaan Django (butuh psycopg 3: pip install "psycopg[binary,pool]"),
+#   ukurannya dari DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE / DB_POOL_TIMEOUT. Pool tidak bisa
+#   digabung dengan koneksi persistent, jadi CONN_MAX_AGE dipaksa 0.
+DB_POOL = os.getenv('DB_POOL', 'False').lower() == 'true'
+
 if PRODUCTION:
     DATABASES = {
         'default': {
@@ -112,11 +124,21 @@ if PRODUCTION:
             'PASSWORD': os.getenv('DB_PASSWORD'),
             'HOST': os.getenv('DB_HOST'),
             'PORT': os.getenv('DB_PORT'),
+            'CONN_MAX_AGE': 0 if DB_POOL else int(os.getenv('DB_CONN_MAX_AGE', '60')),
+            'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True').lower() == 'true',
             'OPTIONS': {
                 'options': f"-c search_path={os.getenv('SCHEMA', 'public')}"
             }
         }
     }
+    if DB_POOL:
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+        }
+    # Lookup trigram (pg_trgm) untuk main.autocomplete
+    INSTALLED_APPS.append('django.contrib.postgres')
 else:
     DATABASES = {
         'default': {
@@ -125,6 +147,75 @@ else:
         }
     }
 
+# Read replica opsional untuk endpoint JSON GET (main/replicas.py). Production:
+# DB_REPLICA_HOST (+ DB_REPLICA_PORT/USER/PASSWORD, default sama dengan primary).
+# Lokal: DB_REPLICA_NAME = path file SQLite salinan db.sqlite3. Saat test, replica
+# diarahkan ke database test default (MIRROR).
+if PRODUCTION and os.getenv('DB_REPLICA_HOST'):
+    DATABASES['replica'] = dict(
+        DATABASES['default'],
+        HOST=os.getenv('DB_REPLICA_HOST'),
+        PORT=os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        USER=os.getenv('DB_REPLICA_USER', DATABASES['default']['USER']),
+        PASSWORD=os.getenv('DB_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+        OPTIONS=dict(DATABASES['default']['OPTIONS']),
+        TEST={'MIRROR': 'default'},
+    )
+elif not PRODUCTION and os.getenv('DB_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('DB_REPLICA_NAME'),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['main.replicas.ReplicaRouter']
+
+# Lama session di-pin ke primary setelah user melakukan write (read-your-writes)
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', '5'))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# CACHE_BACKEND: 'locmem' (default), 'file', atau 'redis' (butuh package redis)
+
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem').lower()
+
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('CACHE_LOCATION', 'redis://127.0.0.1:6379/0'),
+        }
+    }
+elif CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_LOCATION', str(BASE_DIR / '.cache')),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'turnamenku',
+        }
+    }
+
+# Lama (detik) respons JSON publik disimpan di cache, 0 untuk mematikan
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', '60'))
+
+# Profiling per request (Server-Timing + laporan per URL name), lihat main/profiling.py
+PROFILING_ENABLED = os.getenv('PROFILING', 'False').lower() == 'true'
+# Jumlah sampel terakhir yang disimpan per URL name
+PROFILING_WINDOW = int(os.getenv('PROFILING_WINDOW', '500'))
+
+# Sync delta Flutter (main/sync.py): jendela tumpang tindih token dan masa simpan tombstone
+SYNC_OVERLAP_SECONDS = int(os.getenv('SYNC_OVERLAP_SECONDS', '5'))
+SYNC_TOMBSTONE_DAYS = int(os.getenv('SYNC_TOMBSTONE_DAYS', '30'))
+
+# Snapshot halaman home (main/home.py): umur maksimum snapshot dalam detik
+HOME_SNAPSHOT_TIMEOUT = int(os.getenv('HOME_SNAPSHOT_TIMEOUT', '300'))
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators